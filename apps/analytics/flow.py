@@ -0,0 +1,248 @@
+"""
+Flow metrics computed from the task transition history.
+
+Both metrics read ``task_transitions`` through covering indexes with one
+SQL statement that aggregates in the database; Python only walks the
+per-day, per-status results. Neither scans the history before its range:
+cumulative flow starts from a nightly ``DailyStatusCount`` snapshot and
+time in status only reads each task's last earlier transition. Days are
+UTC days.
+"""
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.db.models import Max
+
+from apps.projects.models import Board
+from apps.tasks.models import Task
+from .models import DailyStatusCount, TaskTransition
+
+DEFAULT_PERCENTILES = (50, 85, 95)
+
+
+def day_bounds(date_from, date_to):
+    """Return the UTC datetimes bounding the days ``date_from``..``date_to``."""
+    return (
+        datetime.combine(date_from, time.min, tzinfo=dt_timezone.utc),
+        datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=dt_timezone.utc),
+    )
+
+
+def _board_filter(board_ids):
+    return f"board_id IN ({', '.join(['%s'] * len(board_ids))})"
+
+
+def _date_of(column):
+    if connection.vendor == 'sqlite':
+        return f'date({column})'
+    return f'CAST({column} AS DATE)'
+
+
+def _movements(board_ids, since, until, daily_from):
+    """
+    Return ``(board_id, day, status, moved)`` for transitions in ``since`` ..
+    ``until``: entries (``to_status``, +1) and exits (``from_status``, -1)
+    summed per board, day and status, with every day before ``daily_from``
+    collapsed into ``day=None``. ``since`` and ``board_ids`` may be ``None``
+    for no bound.
+    """
+    table = connection.ops.quote_name(TaskTransition._meta.db_table)
+    adapt = connection.ops.adapt_datetimefield_value
+    conditions, bounds = ['at < %s'], [adapt(until)]
+    if since is not None:
+        conditions.append('at >= %s')
+        bounds.append(adapt(since))
+    if board_ids is not None:
+        conditions.append(_board_filter(board_ids))
+        bounds.extend(board_ids)
+
+    day = f"CASE WHEN at < %s THEN NULL ELSE {_date_of('at')} END"
+    movements = f"""
+        SELECT board_id, {day} AS day, {{column}} AS status, {{sign}} AS moved
+        FROM {table}
+        WHERE {' AND '.join(conditions)} AND {{column}} <> ''
+    """
+    sql = f"""
+        SELECT board_id, day, status, SUM(moved)
+        FROM ({movements.format(column='to_status', sign=1)}
+              UNION ALL
+              {movements.format(column='from_status', sign=-1)}) movements
+        GROUP BY board_id, day, status
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [adapt(daily_from), *bounds] * 2)
+        return [
+            (board_id, moved_day if moved_day is None or isinstance(moved_day, date)
+             else date.fromisoformat(moved_day), status, int(moved))
+            for board_id, moved_day, status, moved in cursor.fetchall()
+        ]
+
+
+def snapshot_status_counts(day):
+    """
+    Record every board's task count per status at the end of ``day`` (UTC).
+
+    Counts start from the latest earlier snapshot and add the transitions
+    made since, so a nightly run reads about one day of history; the first
+    run, or the first after the snapshots were cleared, reads all of it.
+    Returns the number of boards snapshotted.
+    """
+    previous = DailyStatusCount.objects.filter(date__lt=day).aggregate(Max('date'))['date__max']
+    counts = defaultdict(int)
+    since = None
+    if previous is not None:
+        since = day_bounds(previous, previous)[1]
+        for board_id, status, count in DailyStatusCount.objects.filter(date=previous).values_list(
+            'board_id', 'status', 'count'
+        ):
+            counts[board_id, status] += count
+    end = day_bounds(day, day)[1]
+    for board_id, _, status, moved in _movements(None, since, end, end):
+        counts[board_id, status] += moved
+
+    # History outlives deleted boards; their counts have nowhere to go
+    board_ids = set(Board.objects.filter(
+        id__in={board_id for board_id, _ in counts}
+    ).values_list('id', flat=True))
+    with transaction.atomic():
+        DailyStatusCount.objects.filter(date=day).delete()
+        DailyStatusCount.objects.bulk_create([
+            DailyStatusCount(date=day, board_id=board_id, status=status, count=counts[board_id, status])
+            for board_id in sorted(board_ids)
+            for status in Task.Status.values
+        ], batch_size=1000)
+    return len(board_ids)
+
+
+def cumulative_flow(board_ids, date_from, date_to):
+    """
+    Number of tasks in each status at the end of every day of the range.
+
+    The opening balance is the latest daily snapshot before the range plus
+    the transitions between it and ``date_from``; entries (``to_status``,
+    +1) and exits (``from_status``, -1) are then summed per day and status.
+    Only transitions between the snapshot and the end of the range are read.
+    """
+    if not board_ids:
+        return []
+    start, end = day_bounds(date_from, date_to)
+    snapshot = DailyStatusCount.objects.filter(board_id__in=board_ids, date__lt=date_from)
+    snapshot_day = snapshot.aggregate(Max('date'))['date__max']
+
+    opening, daily = defaultdict(int), {}
+    since = None
+    if snapshot_day is not None:
+        since = day_bounds(snapshot_day, snapshot_day)[1]
+        for status, count in snapshot.filter(date=snapshot_day).values_list('status', 'count'):
+            opening[status] += count
+    for _, moved_day, status, moved in _movements(board_ids, since, end, start):
+        if moved_day is None:
+            opening[status] += moved
+        else:
+            moved_on = daily.setdefault(moved_day, {})
+            moved_on[status] = moved_on.get(status, 0) + moved
+
+    statuses = Task.Status.values
+    counts = {status: opening.get(status, 0) for status in statuses}
+    days = []
+    current = date_from
+    while current <= date_to:
+        moved = daily.get(current, {})
+        for status in statuses:
+            counts[status] += moved.get(status, 0)
+        days.append({'date': current, **counts})
+        current += timedelta(days=1)
+    return days
+
+
+def _seconds_between(start, end):
+    if connection.vendor == 'mysql':
+        return f'TIMESTAMPDIFF(MICROSECOND, {start}, {end}) / 1000000'
+    if connection.vendor == 'postgresql':
+        return f'EXTRACT(EPOCH FROM {end} - {start})'
+    return f'(julianday({end}) - julianday({start})) * 86400'
+
+
+def time_in_status(board_ids, date_from, date_to, percentiles=DEFAULT_PERCENTILES):
+    """
+    Nearest-rank percentiles of time spent per status, in hours.
+
+    A stay starts with the transition into a status and ends with the task's
+    next transition; stays that ended within the range are counted. Only
+    the range's transitions are read, plus each task's last transition
+    before it (a loose index scan of ``(board_id, task_id, at)``), which
+    starts the stays still open when the range begins. Stays are paired
+    with ``LEAD()`` and ranked per status with ``ROW_NUMBER()``. A task's
+    transitions on one board never share a timestamp, so ``at`` alone
+    orders them.
+    """
+    if not board_ids:
+        return []
+    start, end = day_bounds(date_from, date_to)
+    qn = connection.ops.quote_name
+    table = qn(TaskTransition._meta.db_table)
+    percentile_columns = ', '.join(
+        f'MIN(CASE WHEN stay_rank * 100 >= {int(p)} * stay_count THEN seconds END)'
+        for p in percentiles
+    )
+
+    sql = f"""
+        WITH recent AS (
+            SELECT task_id, to_status, at
+            FROM {table}
+            WHERE {_board_filter(board_ids)} AND at >= %s AND at < %s
+            UNION ALL
+            SELECT transitions.task_id, transitions.to_status, transitions.at
+            FROM {table} transitions
+            JOIN (
+                SELECT board_id, task_id, MAX(at) AS at
+                FROM {table}
+                WHERE {_board_filter(board_ids)} AND at < %s
+                GROUP BY board_id, task_id
+            ) previous ON transitions.board_id = previous.board_id
+                AND transitions.task_id = previous.task_id AND transitions.at = previous.at
+        ),
+        stays AS (
+            SELECT to_status AS status, at AS entered_at,
+                   LEAD(at) OVER (PARTITION BY task_id ORDER BY at) AS left_at
+            FROM recent
+        ),
+        durations AS (
+            SELECT status, {_seconds_between('entered_at', 'left_at')} AS seconds
+            FROM stays
+            WHERE status <> '' AND left_at >= %s AND left_at < %s
+        ),
+        ranked AS (
+            SELECT status, seconds,
+                   ROW_NUMBER() OVER (PARTITION BY status ORDER BY seconds) AS stay_rank,
+                   COUNT(*) OVER (PARTITION BY status) AS stay_count
+            FROM durations
+        )
+        SELECT status, stay_count, AVG(seconds), {percentile_columns}
+        FROM ranked
+        GROUP BY status, stay_count
+    """
+    adapt = connection.ops.adapt_datetimefield_value
+    params = [
+        *board_ids, adapt(start), adapt(end),
+        *board_ids, adapt(start),
+        adapt(start), adapt(end),
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = {row[0]: row[1:] for row in cursor.fetchall()}
+
+    def hours(seconds):
+        return round(float(seconds) / 3600, 2)
+
+    return [
+        {
+            'status': status,
+            'count': rows[status][0],
+            'avg_hours': hours(rows[status][1]),
+            **{f'p{p}_hours': hours(value) for p, value in zip(percentiles, rows[status][2:])},
+        }
+        for status in Task.Status.values
+        if status in rows
+    ]
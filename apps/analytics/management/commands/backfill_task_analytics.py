@@ -0,0 +1,43 @@
+"""Rebuild the analytics rollups from the tasks table."""
+from django.core.management.base import BaseCommand
+
+from apps.analytics.rollups import rebuild, seed_transitions
+from apps.projects.models import Board
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the daily task counters and status counts from tasks. '
+        'Run it once after installing the rollups, or to repair drift; task '
+        'writes made while it runs may be counted twice or missed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            type=int,
+            action='append',
+            dest='projects',
+            help='Only rebuild the boards of this project (repeatable).',
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument(
+            '--seed-transitions',
+            action='store_true',
+            help='Also give tasks without transition history an entry into their current status.',
+        )
+
+    def handle(self, *args, **options):
+        board_ids = None
+        if options['projects']:
+            board_ids = list(
+                Board.objects.filter(project_id__in=options['projects']).values_list('id', flat=True)
+            )
+
+        total = rebuild(board_ids, chunk_size=options['chunk_size'])
+        scope = 'all boards' if board_ids is None else f'{len(board_ids)} boards'
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt analytics rollups of {scope} from {total} tasks'))
+
+        if options['seed_transitions']:
+            seeded = seed_transitions(board_ids, chunk_size=options['chunk_size'])
+            self.stdout.write(self.style.SUCCESS(f'Seeded transition history of {seeded} tasks'))
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.7 on 2026-10-17 03:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('projects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStatusCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('assignee_id', models.PositiveIntegerField(default=0)),
+                ('status', models.CharField(choices=[('BACKLOG', 'Backlog'), ('TODO', 'To Do'), ('IN_PROGRESS', 'In Progress'), ('REVIEW', 'In Review'), ('DONE', 'Done')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.board')),
+            ],
+            options={
+                'db_table': 'analytics_task_status_counts',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyTaskStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('assignee_id', models.PositiveIntegerField(default=0)),
+                ('created', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('reopened', models.PositiveIntegerField(default=0)),
+                ('cycle_time_seconds', models.PositiveBigIntegerField(default=0)),
+                ('completed_breached', models.PositiveIntegerField(default=0)),
+                ('breached', models.PositiveIntegerField(default=0)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.board')),
+            ],
+            options={
+                'db_table': 'analytics_daily_task_stats',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='taskstatuscount',
+            constraint=models.UniqueConstraint(fields=('board', 'assignee_id', 'status'), name='analytics_task_status_counts_key'),
+        ),
+        migrations.AddIndex(
+            model_name='dailytaskstats',
+            index=models.Index(fields=['board', 'date'], name='analytics_d_board_i_e70a05_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailytaskstats',
+            constraint=models.UniqueConstraint(fields=('board', 'assignee_id', 'date'), name='analytics_daily_task_stats_key'),
+        ),
+    ]
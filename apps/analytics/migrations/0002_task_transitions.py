@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-17 03:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.PositiveBigIntegerField()),
+                ('board_id', models.PositiveBigIntegerField()),
+                ('from_status', models.CharField(blank=True, choices=[('BACKLOG', 'Backlog'), ('TODO', 'To Do'), ('IN_PROGRESS', 'In Progress'), ('REVIEW', 'In Review'), ('DONE', 'Done')], max_length=20)),
+                ('to_status', models.CharField(blank=True, choices=[('BACKLOG', 'Backlog'), ('TODO', 'To Do'), ('IN_PROGRESS', 'In Progress'), ('REVIEW', 'In Review'), ('DONE', 'Done')], max_length=20)),
+                ('at', models.DateTimeField()),
+                ('actor_id', models.PositiveBigIntegerField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'task_transitions',
+                'indexes': [models.Index(fields=['board_id', 'at', 'from_status', 'to_status'], name='task_transi_board_i_ef5e95_idx'), models.Index(fields=['board_id', 'task_id', 'at', 'to_status'], name='task_transi_board_i_094a8e_idx'), models.Index(fields=['task_id', 'at'], name='task_transi_task_id_f4d7c4_idx')],
+            },
+        ),
+    ]
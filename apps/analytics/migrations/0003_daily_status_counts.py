@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+        ('analytics', '0002_task_transitions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStatusCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('BACKLOG', 'Backlog'), ('TODO', 'To Do'), ('IN_PROGRESS', 'In Progress'), ('REVIEW', 'In Review'), ('DONE', 'Done')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.board')),
+            ],
+            options={
+                'db_table': 'analytics_daily_status_counts',
+                'indexes': [models.Index(fields=['date'], name='analytics_d_date_7f9ce3_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailystatuscount',
+            constraint=models.UniqueConstraint(fields=('board', 'date', 'status'), name='analytics_daily_status_counts_key'),
+        ),
+    ]
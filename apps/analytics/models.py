@@ -0,0 +1,138 @@
+"""Rollup tables behind project analytics."""
+from django.db import models
+
+from apps.projects.models import Board
+from apps.tasks.models import Task
+
+# assignee_id of rollup rows counting unassigned tasks
+UNASSIGNED = 0
+
+
+class DailyTaskStats(models.Model):
+    """
+    Task activity counters per board, assignee and day.
+
+    ``assignee_id`` is a plain user id (``UNASSIGNED`` for no assignee)
+    rather than a foreign key, so the row key stays unique for unassigned
+    tasks and history outlives deleted users.
+    """
+
+    date = models.DateField()
+    board = models.ForeignKey(
+        Board,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    assignee_id = models.PositiveIntegerField(default=UNASSIGNED)
+    created = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    reopened = models.PositiveIntegerField(default=0)
+    # Sum of created_at -> completed_at over the tasks completed that day
+    cycle_time_seconds = models.PositiveBigIntegerField(default=0)
+    # Completed tasks that had breached their SLA
+    completed_breached = models.PositiveIntegerField(default=0)
+    # Tasks flagged as SLA breached that day
+    breached = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'analytics_daily_task_stats'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['board', 'assignee_id', 'date'], name='analytics_daily_task_stats_key'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['board', 'date']),
+        ]
+
+    def __str__(self):
+        return f"Board {self.board_id} / assignee {self.assignee_id} on {self.date}"
+
+
+class TaskStatusCount(models.Model):
+    """Current number of tasks per board, assignee and status."""
+
+    board = models.ForeignKey(
+        Board,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    assignee_id = models.PositiveIntegerField(default=UNASSIGNED)
+    status = models.CharField(max_length=20, choices=Task.Status.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'analytics_task_status_counts'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['board', 'assignee_id', 'status'], name='analytics_task_status_counts_key'
+            ),
+        ]
+
+    def __str__(self):
+        return f"Board {self.board_id} / assignee {self.assignee_id}: {self.count} {self.status}"
+
+
+class DailyStatusCount(models.Model):
+    """
+    Number of tasks per board and status at the end of a UTC day.
+
+    Written nightly from the previous snapshot and that day's transitions,
+    so cumulative flow starts from the latest snapshot before its range
+    instead of summing the whole history. Every status of a snapshotted
+    board has a row, zero counts included.
+    """
+
+    date = models.DateField()
+    board = models.ForeignKey(
+        Board,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    status = models.CharField(max_length=20, choices=Task.Status.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'analytics_daily_status_counts'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['board', 'date', 'status'], name='analytics_daily_status_counts_key'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['date']),
+        ]
+
+    def __str__(self):
+        return f"Board {self.board_id} on {self.date}: {self.count} {self.status}"
+
+
+class TaskTransition(models.Model):
+    """
+    Append-only history of task status changes.
+
+    ``from_status`` is empty when a task enters a board (creation or a move
+    from another board) and ``to_status`` is empty when it leaves one
+    (deletion or a move away). Ids are plain columns rather than foreign
+    keys so history survives deleted tasks, boards and users.
+    """
+
+    task_id = models.PositiveBigIntegerField()
+    board_id = models.PositiveBigIntegerField()
+    from_status = models.CharField(max_length=20, choices=Task.Status.choices, blank=True)
+    to_status = models.CharField(max_length=20, choices=Task.Status.choices, blank=True)
+    at = models.DateTimeField()
+    actor_id = models.PositiveBigIntegerField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'task_transitions'
+        # The first two cover the flow queries in apps.analytics.flow, so
+        # per-board scans never read table rows
+        indexes = [
+            models.Index(fields=['board_id', 'at', 'from_status', 'to_status']),
+            models.Index(fields=['board_id', 'task_id', 'at', 'to_status']),
+            models.Index(fields=['task_id', 'at']),
+        ]
+
+    def __str__(self):
+        return f"Task {self.task_id}: {self.from_status or '-'} -> {self.to_status or '-'} at {self.at}"
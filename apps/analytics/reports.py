@@ -0,0 +1,92 @@
+"""Project analytics read from the rollup tables."""
+from django.contrib.auth import get_user_model
+from django.db.models import Sum
+
+from apps.projects.models import Board
+from .models import DailyTaskStats, TaskStatusCount, UNASSIGNED
+
+User = get_user_model()
+
+COUNTERS = (
+    'created', 'completed', 'reopened', 'cycle_time_seconds', 'completed_breached', 'breached',
+)
+
+
+def summarize(counts):
+    """Turn summed counters into the reported metrics."""
+    counts = {name: counts.get(name) or 0 for name in COUNTERS}
+    completed = counts['completed']
+    return {
+        'created': counts['created'],
+        'completed': completed,
+        'reopened': counts['reopened'],
+        'sla_breaches': counts['breached'],
+        'avg_cycle_time_hours': (
+            round(counts['cycle_time_seconds'] / completed / 3600, 2) if completed else None
+        ),
+        'sla_breach_rate': (
+            round(counts['completed_breached'] / completed, 4) if completed else None
+        ),
+    }
+
+
+def project_analytics(project, date_from, date_to):
+    """
+    Throughput, cycle time and SLA metrics of a project over a date range,
+    plus its current work in progress per status.
+
+    Every query reads rollup rows (at most boards x assignees x days), so the
+    cost does not depend on how many tasks the project holds.
+    """
+    sums = {name: Sum(name) for name in COUNTERS}
+    rows = DailyTaskStats.objects.filter(
+        board__project=project, date__gte=date_from, date__lte=date_to
+    ).order_by()
+
+    boards = dict(Board.objects.filter(project=project).values_list('id', 'name'))
+    wip_rows = list(
+        TaskStatusCount.objects.filter(board__project=project, count__gt=0)
+        .values_list('board_id', 'assignee_id', 'status', 'count')
+    )
+    by_board = {row['board_id']: row for row in rows.values('board_id').annotate(**sums)}
+    by_assignee = {row['assignee_id']: row for row in rows.values('assignee_id').annotate(**sums)}
+
+    wip, board_wip, assignee_wip = {}, {}, {}
+    for board_id, assignee_id, status, count in wip_rows:
+        wip[status] = wip.get(status, 0) + count
+        board_status = board_wip.setdefault(board_id, {})
+        board_status[status] = board_status.get(status, 0) + count
+        assignee_status = assignee_wip.setdefault(assignee_id, {})
+        assignee_status[status] = assignee_status.get(status, 0) + count
+
+    assignee_ids = (set(by_assignee) | set(assignee_wip)) - {UNASSIGNED}
+    usernames = dict(User.objects.filter(id__in=assignee_ids).values_list('id', 'username'))
+
+    return {
+        'project': project.id,
+        'date_from': date_from,
+        'date_to': date_to,
+        'totals': {**summarize(rows.aggregate(**sums)), 'wip': wip},
+        'daily': [
+            {'date': row['date'], **summarize(row)}
+            for row in rows.values('date').annotate(**sums).order_by('date')
+        ],
+        'boards': [
+            {
+                'board': board_id,
+                'name': name,
+                **summarize(by_board.get(board_id, {})),
+                'wip': board_wip.get(board_id, {}),
+            }
+            for board_id, name in sorted(boards.items())
+        ],
+        'assignees': [
+            {
+                'assignee': assignee_id or None,
+                'username': usernames.get(assignee_id),
+                **summarize(by_assignee.get(assignee_id, {})),
+                'wip': assignee_wip.get(assignee_id, {}),
+            }
+            for assignee_id in sorted(set(by_assignee) | set(assignee_wip))
+        ],
+    }
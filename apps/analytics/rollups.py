@@ -0,0 +1,337 @@
+"""
+Incremental maintenance of the analytics rollups and transition history.
+
+Task instances remember the rollup-relevant values they were loaded with
+(``post_init``), and each save turns the difference into counter deltas:
+creations, completions with their cycle time, reopenings and SLA breaches
+by day, plus the current task count per status. Status and board changes
+are also appended to ``TaskTransition``. Deltas are applied inside the
+saving transaction with one upsert per table (``INSERT ... ON DUPLICATE KEY
+UPDATE n = n + delta``) and one bulk insert of transitions, so they commit
+or roll back together with the task. Bulk writes collect the deltas of all
+their tasks in ``batch()``.
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from apps.tasks.models import Task
+from apps.utils.export import export_rows
+from apps.utils.pagination import keyset_chunks
+from .models import DailyStatusCount, DailyTaskStats, TaskStatusCount, TaskTransition, UNASSIGNED
+
+DONE = Task.Status.DONE
+
+# Task fields the rollups depend on, as (name, attname)
+TRACKED_FIELDS = (
+    ('board', 'board_id'),
+    ('assignee', 'assignee_id'),
+    ('status', 'status'),
+    ('sla_breached', 'sla_breached'),
+)
+
+UPSERT_BATCH_SIZE = 500
+
+_state = threading.local()
+
+BACKFILL_COLUMNS = [
+    'id', 'board_id', 'assignee_id', 'status', 'sla_breached',
+    'created_at', 'completed_at', 'due_date',
+]
+
+
+def take_state(task):
+    """Return the tracked values of a task, or None if any was deferred."""
+    values = task.__dict__
+    if any(attname not in values for _, attname in TRACKED_FIELDS):
+        return None
+    return tuple(values[attname] for _, attname in TRACKED_FIELDS)
+
+
+def saved_state(task, previous, update_fields):
+    """Return the tracked values a save wrote; fields it skipped keep their old value."""
+    current = take_state(task)
+    if update_fields is None or previous is None or current is None:
+        return current
+    return tuple(
+        new if name in update_fields else old
+        for (name, _), old, new in zip(TRACKED_FIELDS, previous, current)
+    )
+
+
+class RollupDelta:
+    """Counter changes and transitions collected from one or more task changes."""
+
+    def __init__(self):
+        self.daily = defaultdict(lambda: defaultdict(int))
+        self.statuses = defaultdict(int)
+        # Status counts of deleted tasks, only ever decremented
+        self.removed = defaultdict(int)
+        self.transitions = []
+
+    def count(self, day, board_id, assignee_id, **counts):
+        row = self.daily[(day, board_id, assignee_id or UNASSIGNED)]
+        for name, amount in counts.items():
+            row[name] += amount
+
+    def move(self, old, new):
+        """Move a task between (board, assignee, status) buckets; either may be None."""
+        if old is not None:
+            self.statuses[(old[0], old[1] or UNASSIGNED, old[2])] -= 1
+        if new is not None:
+            self.statuses[(new[0], new[1] or UNASSIGNED, new[2])] += 1
+
+    def remove(self, state):
+        self.removed[(state[0], state[1] or UNASSIGNED, state[2])] += 1
+
+    def transition(self, task, board_id, from_status, to_status, at, actor_id):
+        self.transitions.append(TaskTransition(
+            task_id=task.pk, board_id=board_id, from_status=from_status or '',
+            to_status=to_status or '', at=at, actor_id=actor_id,
+        ))
+
+    def complete(self, task, board_id, assignee_id):
+        completed_at = task.completed_at or timezone.now()
+        cycle_time = int((completed_at - task.created_at).total_seconds()) if task.created_at else 0
+        self.count(
+            timezone.localdate(completed_at), board_id, assignee_id,
+            completed=1,
+            cycle_time_seconds=max(cycle_time, 0),
+            completed_breached=int(bool(task.sla_breached)),
+        )
+
+    def merge(self, other):
+        for key, counts in other.daily.items():
+            row = self.daily[key]
+            for name, amount in counts.items():
+                row[name] += amount
+        for key, amount in other.statuses.items():
+            self.statuses[key] += amount
+        for key, amount in other.removed.items():
+            self.removed[key] += amount
+        self.transitions.extend(other.transitions)
+
+    def apply(self):
+        # Sorted so concurrent transactions lock rollup rows in the same order
+        _upsert(DailyTaskStats, ('date', 'board_id', 'assignee_id'), sorted(
+            (key, counts) for key, counts in self.daily.items() if any(counts.values())
+        ))
+        _upsert(TaskStatusCount, ('board_id', 'assignee_id', 'status'), sorted(
+            (key, {'count': amount}) for key, amount in self.statuses.items() if amount
+        ))
+
+        # Deletions only touch existing rows: an upsert would insert one for
+        # a board deleted in the same cascade.
+        for (board_id, assignee_id, status), amount in sorted(self.removed.items()):
+            TaskStatusCount.objects.filter(
+                board_id=board_id, assignee_id=assignee_id, status=status
+            ).update(count=F('count') - amount)
+
+        if self.transitions:
+            TaskTransition.objects.bulk_create(self.transitions, batch_size=UPSERT_BATCH_SIZE)
+
+
+def _upsert(model, key_fields, rows):
+    """Insert counter rows, adding to the counters of rows whose key exists."""
+    if not rows:
+        return
+    qn = connection.ops.quote_name
+    table = qn(model._meta.db_table)
+    # Every counter column is written: raw inserts do not get model defaults
+    counters = [
+        field.attname for field in model._meta.concrete_fields
+        if not field.primary_key and field.attname not in key_fields
+    ]
+    fields = [model._meta.get_field(name) for name in (*key_fields, *counters)]
+    columns = ', '.join(qn(field.column) for field in fields)
+    placeholder = '(' + ', '.join(['%s'] * len(fields)) + ')'
+
+    if connection.vendor == 'mysql':
+        conflict = 'ON DUPLICATE KEY UPDATE ' + ', '.join(
+            f'{qn(name)} = {qn(name)} + VALUES({qn(name)})' for name in counters
+        )
+    else:
+        keys = ', '.join(qn(model._meta.get_field(name).column) for name in key_fields)
+        conflict = f'ON CONFLICT ({keys}) DO UPDATE SET ' + ', '.join(
+            f'{qn(name)} = {table}.{qn(name)} + excluded.{qn(name)}' for name in counters
+        )
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch = rows[start:start + UPSERT_BATCH_SIZE]
+            params = []
+            for key, counts in batch:
+                values = (*key, *(counts.get(name, 0) for name in counters))
+                params.extend(
+                    field.get_db_prep_save(value, connection) for field, value in zip(fields, values)
+                )
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}) VALUES '
+                f'{", ".join([placeholder] * len(batch))} {conflict}',
+                params,
+            )
+
+
+@contextmanager
+def batch():
+    """Apply the rollup changes of every task saved in the block at once on exit."""
+    if getattr(_state, 'pending', None) is not None:
+        yield
+        return
+    _state.pending = RollupDelta()
+    try:
+        yield
+        pending = _state.pending
+    finally:
+        _state.pending = None
+    pending.apply()
+
+
+def _apply(delta):
+    pending = getattr(_state, 'pending', None)
+    if pending is not None:
+        pending.merge(delta)
+    else:
+        delta.apply()
+
+
+def task_saved(task, created, previous, current, actor_id=None):
+    """Apply the rollup changes and record the transitions of a task save."""
+    if current is None:
+        return
+    board_id, assignee_id, status, breached = current
+    at = task.updated_at or timezone.now()
+    delta = RollupDelta()
+
+    if created:
+        delta.count(timezone.localdate(task.created_at or timezone.now()), board_id, assignee_id, created=1)
+        delta.move(None, current)
+        delta.transition(task, board_id, None, status, task.created_at or at, actor_id)
+        if status == DONE:
+            delta.complete(task, board_id, assignee_id)
+        if breached:
+            delta.count(timezone.localdate(), board_id, assignee_id, breached=1)
+    else:
+        if previous is None or previous == current:
+            return
+        old_board_id, old_status, old_breached = previous[0], previous[2], previous[3]
+        if previous[:3] != current[:3]:
+            delta.move(previous, current)
+        if board_id != old_board_id:
+            delta.transition(task, old_board_id, old_status, None, at, actor_id)
+            delta.transition(task, board_id, None, status, at, actor_id)
+        elif status != old_status:
+            delta.transition(task, board_id, old_status, status, at, actor_id)
+        if status == DONE and old_status != DONE:
+            delta.complete(task, board_id, assignee_id)
+        elif old_status == DONE and status != DONE:
+            delta.count(timezone.localdate(), board_id, assignee_id, reopened=1)
+        if breached and not old_breached:
+            delta.count(timezone.localdate(), board_id, assignee_id, breached=1)
+
+    _apply(delta)
+
+
+def task_deleted(task, state, actor_id=None):
+    """Drop a deleted task from the status counts; daily history is kept."""
+    if state is None:
+        return
+    delta = RollupDelta()
+    delta.remove(state)
+    delta.transition(task, state[0], state[2], None, timezone.now(), actor_id)
+    _apply(delta)
+
+
+def tasks_breached(task_ids):
+    """Count tasks flagged as SLA breached by a queryset update."""
+    delta = RollupDelta()
+    today = timezone.localdate()
+    groups = (
+        Task.objects.filter(id__in=task_ids)
+        .order_by()
+        .values('board_id', 'assignee_id')
+        .annotate(total=Count('id'))
+    )
+    for group in groups:
+        delta.count(today, group['board_id'], group['assignee_id'], breached=group['total'])
+    with transaction.atomic():
+        delta.apply()
+
+
+def rebuild(board_ids=None, chunk_size=2000):
+    """
+    Recompute the rollups of the given boards (all boards by default) from tasks.
+
+    Reopenings and the day a breach was flagged are not recorded on tasks:
+    reopened counts restart at zero and breaches are dated by due date.
+    Returns the number of tasks read.
+    """
+    tasks = Task.objects.all()
+    if board_ids is not None:
+        tasks = tasks.filter(board_id__in=board_ids)
+
+    delta = RollupDelta()
+    total = 0
+    for chunk in keyset_chunks(*export_rows(tasks, BACKFILL_COLUMNS), chunk_size):
+        total += len(chunk)
+        for _, board_id, assignee_id, status, breached, created_at, completed_at, due_date in chunk:
+            delta.count(timezone.localdate(created_at), board_id, assignee_id, created=1)
+            delta.move(None, (board_id, assignee_id, status))
+            if status == DONE and completed_at is not None:
+                delta.count(
+                    timezone.localdate(completed_at), board_id, assignee_id,
+                    completed=1,
+                    cycle_time_seconds=max(int((completed_at - created_at).total_seconds()), 0),
+                    completed_breached=int(breached),
+                )
+            if breached:
+                delta.count(timezone.localdate(due_date or created_at), board_id, assignee_id, breached=1)
+
+    with transaction.atomic():
+        for model in (DailyTaskStats, TaskStatusCount):
+            existing = model.objects.all()
+            if board_ids is not None:
+                existing = existing.filter(board_id__in=board_ids)
+            existing.delete()
+
+        DailyTaskStats.objects.bulk_create([
+            DailyTaskStats(date=day, board_id=board_id, assignee_id=assignee_id, **counts)
+            for (day, board_id, assignee_id), counts in delta.daily.items()
+        ], batch_size=1000)
+        TaskStatusCount.objects.bulk_create([
+            TaskStatusCount(board_id=board_id, assignee_id=assignee_id, status=status, count=count)
+            for (board_id, assignee_id, status), count in delta.statuses.items()
+            if count
+        ], batch_size=1000)
+    return total
+
+
+def seed_transitions(board_ids=None, chunk_size=2000):
+    """
+    Record an entry into the current status for tasks without any history.
+
+    Earlier status changes are unknown, so seeded tasks count as being in
+    their current status since creation. Returns the number of rows written.
+    """
+    tasks = Task.objects.exclude(
+        id__in=TaskTransition.objects.order_by().values('task_id')
+    )
+    if board_ids is not None:
+        tasks = tasks.filter(board_id__in=board_ids)
+
+    total = 0
+    for chunk in keyset_chunks(*export_rows(tasks, ['id', 'board_id', 'status', 'created_at']), chunk_size):
+        TaskTransition.objects.bulk_create([
+            TaskTransition(task_id=task_id, board_id=board_id, to_status=status, at=created_at)
+            for task_id, board_id, status, created_at in chunk
+        ])
+        total += len(chunk)
+    if total:
+        # Seeded entries predate the snapshots, which all continue from the
+        # latest one; the next nightly run rebuilds them from the full history.
+        DailyStatusCount.objects.all().delete()
+    return total
@@ -0,0 +1,23 @@
+"""Serializers for the analytics API."""
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+
+
+class AnalyticsQuerySerializer(serializers.Serializer):
+    """Validates the date range of an analytics query."""
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        max_days = settings.ANALYTICS_MAX_DAYS
+        date_to = attrs.get('date_to') or timezone.localdate()
+        date_from = attrs.get('date_from') or date_to - timedelta(days=29)
+
+        if date_from > date_to:
+            raise serializers.ValidationError({'date_from': 'Must not be after date_to.'})
+        if (date_to - date_from).days >= max_days:
+            raise serializers.ValidationError({'date_from': f'Ranges are limited to {max_days} days.'})
+        return {'date_from': date_from, 'date_to': date_to}
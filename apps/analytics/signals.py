@@ -0,0 +1,43 @@
+"""Signal handlers keeping the analytics rollups up to date."""
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from apps.audit.signals import get_audit_context
+from apps.tasks.models import Task
+from apps.tasks.signals import task_sla_breached
+from . import rollups
+
+
+def actor_id(instance):
+    """Return the id of the user making the current change, if known."""
+    user = get_audit_context(instance)[0]
+    return user.pk if user is not None else None
+
+
+@receiver(post_init, sender=Task)
+def snapshot_task_state(sender, instance, **kwargs):
+    """Remember the loaded values so saves can be turned into deltas."""
+    instance._analytics_state = rollups.take_state(instance)
+
+
+@receiver(post_save, sender=Task)
+def update_rollups(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Apply the save's changes to the rollups and transition history."""
+    if raw:
+        return
+    previous = getattr(instance, '_analytics_state', None)
+    current = rollups.saved_state(instance, previous, update_fields)
+    rollups.task_saved(instance, created, previous, current, actor_id(instance))
+    instance._analytics_state = current
+
+
+@receiver(post_delete, sender=Task)
+def remove_from_rollups(sender, instance, **kwargs):
+    """Uncount a deleted task and record that it left its board."""
+    rollups.task_deleted(instance, getattr(instance, '_analytics_state', None), actor_id(instance))
+
+
+@receiver(task_sla_breached)
+def count_sla_breaches(sender, task_ids, **kwargs):
+    """Count tasks the SLA checker flagged with a queryset update."""
+    rollups.tasks_breached(task_ids)
@@ -0,0 +1,20 @@
+"""Celery tasks for the analytics rollups."""
+from datetime import timedelta, timezone as dt_timezone
+
+from celery import shared_task
+from django.utils import timezone
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def snapshot_daily_status_counts():
+    """Snapshot every board's status counts at the end of the previous UTC day."""
+    from .flow import snapshot_status_counts
+
+    day = timezone.now().astimezone(dt_timezone.utc).date() - timedelta(days=1)
+    boards = snapshot_status_counts(day)
+    logger.info(f"Snapshotted status counts of {boards} boards for {day}")
+
+    return boards
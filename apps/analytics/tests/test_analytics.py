@@ -0,0 +1,343 @@
+"""Tests for project analytics rollups."""
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from apps.analytics.models import DailyTaskStats, TaskStatusCount, TaskTransition, UNASSIGNED
+from apps.projects.models import Project, Board
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cached responses must not leak between tests reusing user ids."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(
+        username='testuser',
+        email='test@example.com',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def assignee(db):
+    return User.objects.create_user(
+        username='assignee',
+        email='assignee@example.com',
+        password='assigneepass123'
+    )
+
+
+@pytest.fixture
+def project(user):
+    return Project.objects.create(name='Test Project', owner=user)
+
+
+@pytest.fixture
+def board(project):
+    return Board.objects.create(name='Test Board', project=project)
+
+
+def daily(board, assignee_id=UNASSIGNED):
+    return DailyTaskStats.objects.filter(
+        board=board, assignee_id=assignee_id, date=timezone.localdate()
+    ).first()
+
+
+def status_counts(board):
+    return {
+        (assignee_id, task_status): count
+        for assignee_id, task_status, count in TaskStatusCount.objects.filter(board=board)
+        .exclude(count=0).values_list('assignee_id', 'status', 'count')
+    }
+
+
+@pytest.mark.django_db
+class TestRollups:
+    """Test rollups follow task saves."""
+
+    def test_lifecycle_updates_counters(self, board, user, assignee):
+        """Test creation, assignment, completion, reopening and deletion."""
+        task = Task.objects.create(title='Task', board=board, reporter=user)
+        assert daily(board).created == 1
+        assert status_counts(board) == {(UNASSIGNED, Task.Status.BACKLOG): 1}
+
+        task.assignee = assignee
+        task.status = Task.Status.DONE
+        task.sla_breached = True
+        task.save()
+        stats = daily(board, assignee.id)
+        assert stats.completed == 1
+        assert stats.completed_breached == 1
+        assert stats.breached == 1
+        assert status_counts(board) == {(assignee.id, Task.Status.DONE): 1}
+
+        task = Task.objects.get(pk=task.pk)
+        task.status = Task.Status.IN_PROGRESS
+        task.save()
+        assert daily(board, assignee.id).reopened == 1
+        assert daily(board, assignee.id).completed == 1
+        assert status_counts(board) == {(assignee.id, Task.Status.IN_PROGRESS): 1}
+
+        task.delete()
+        assert status_counts(board) == {}
+        assert daily(board).created == 1
+
+    def test_unpersisted_fields_are_ignored(self, board, user):
+        """Test a save limited by update_fields only counts what it wrote."""
+        task = Task.objects.create(title='Task', board=board, reporter=user)
+        task.status = Task.Status.DONE
+        task.title = 'Renamed'
+        task.save(update_fields=['title'])
+
+        assert daily(board).completed == 0
+        assert status_counts(board) == {(UNASSIGNED, Task.Status.BACKLOG): 1}
+
+    def test_bulk_operations_are_counted(self, api_client, user, board):
+        """Test bulk writes update the rollups like single saves."""
+        task = Task.objects.create(title='Task', board=board, reporter=user)
+        api_client.force_authenticate(user=user)
+        operations = [
+            {'op': 'create', 'data': {'title': f'Imported {i}', 'board': board.id}}
+            for i in range(3)
+        ] + [{'op': 'move', 'id': task.id, 'status': Task.Status.DONE}]
+
+        response = api_client.post(reverse('task-bulk'), {'operations': operations}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert daily(board).created == 4
+        assert daily(board).completed == 1
+        assert status_counts(board) == {
+            (UNASSIGNED, Task.Status.BACKLOG): 3,
+            (UNASSIGNED, Task.Status.DONE): 1,
+        }
+
+    def test_sla_breaches_are_counted(self, board, user, django_capture_on_commit_callbacks):
+        """Test breaches flagged by the SLA checker are counted."""
+        from apps.tasks import sla
+
+        task = Task.objects.create(
+            title='Late', board=board, reporter=user, status=Task.Status.TODO,
+            due_date=timezone.now() - timedelta(hours=1),
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            sla.mark_breached([task.id])
+
+        assert daily(board).breached == 1
+
+    def test_backfill_rebuilds_from_tasks(self, board, user, assignee):
+        """Test the backfill command recomputes drifted rollups."""
+        Task.objects.create(title='Open', board=board, reporter=user, assignee=assignee)
+        Task.objects.create(title='Done', board=board, reporter=user, status=Task.Status.DONE)
+        DailyTaskStats.objects.all().delete()
+        TaskStatusCount.objects.update(count=42)
+
+        call_command('backfill_task_analytics', project=[board.project_id], stdout=None)
+
+        assert daily(board, assignee.id).created == 1
+        assert daily(board).completed == 1
+        assert status_counts(board) == {
+            (assignee.id, Task.Status.BACKLOG): 1,
+            (UNASSIGNED, Task.Status.DONE): 1,
+        }
+
+
+@pytest.mark.django_db
+class TestProjectAnalyticsAPI:
+    """Test the project analytics endpoint."""
+
+    def test_analytics_summary(self, api_client, user, assignee, project, board, django_assert_max_num_queries):
+        """Test metrics are read from rollups with a fixed number of queries."""
+        for i in range(4):
+            Task.objects.create(
+                title=f'Task {i}', board=board, reporter=user, assignee=assignee,
+                status=Task.Status.DONE if i < 2 else Task.Status.IN_PROGRESS,
+            )
+        api_client.force_authenticate(user=user)
+
+        with django_assert_max_num_queries(12):
+            response = api_client.get(reverse('project-analytics', args=[project.id]))
+
+        assert response.status_code == status.HTTP_200_OK
+        totals = response.data['totals']
+        assert totals['created'] == 4
+        assert totals['completed'] == 2
+        assert totals['sla_breach_rate'] == 0
+        assert totals['wip'] == {Task.Status.DONE: 2, Task.Status.IN_PROGRESS: 2}
+        assert response.data['boards'][0]['name'] == 'Test Board'
+        assert response.data['assignees'][0]['username'] == 'assignee'
+        assert response.data['daily'][0]['created'] == 4
+
+    def test_date_range(self, api_client, user, project, board):
+        """Test days outside the range are left out and bad ranges rejected."""
+        Task.objects.create(title='Task', board=board, reporter=user)
+        api_client.force_authenticate(user=user)
+        url = reverse('project-analytics', args=[project.id])
+        tomorrow = timezone.localdate() + timedelta(days=1)
+
+        response = api_client.get(url, {'date_from': tomorrow.isoformat()})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = api_client.get(url, {'date_from': tomorrow.isoformat(), 'date_to': tomorrow.isoformat()})
+        assert response.data['totals']['created'] == 0
+        assert response.data['totals']['avg_cycle_time_hours'] is None
+
+    def test_requires_membership(self, api_client, project):
+        """Test non-members cannot read a project's analytics."""
+        outsider = User.objects.create_user(username='outsider', email='outsider@example.com', password='x')
+        api_client.force_authenticate(user=outsider)
+
+        response = api_client.get(reverse('project-analytics', args=[project.id]))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def transitions(task_id):
+    return list(
+        TaskTransition.objects.filter(task_id=task_id).order_by('id')
+        .values_list('board_id', 'from_status', 'to_status', 'actor_id')
+    )
+
+
+@pytest.mark.django_db
+class TestTaskTransitions:
+    """Test the transition history follows status and board changes."""
+
+    def test_move_records_actor(self, api_client, user, board):
+        """Test creation and the move action append transitions with the acting user."""
+        api_client.force_authenticate(user=user)
+        task_id = api_client.post(reverse('task-list'), {'title': 'Task', 'board': board.id}).data['id']
+        api_client.post(reverse('task-move', args=[task_id]), {'status': Task.Status.IN_PROGRESS})
+        api_client.patch(reverse('task-detail', args=[task_id]), {'title': 'Renamed'})
+
+        assert transitions(task_id) == [
+            (board.id, '', Task.Status.BACKLOG, user.id),
+            (board.id, Task.Status.BACKLOG, Task.Status.IN_PROGRESS, user.id),
+        ]
+
+    def test_board_move_and_delete(self, project, board, user):
+        """Test moving boards records a leave and an entry; deletion a leave."""
+        other = Board.objects.create(name='Other', project=project)
+        task = Task.objects.create(title='Task', board=board, reporter=user, status=Task.Status.TODO)
+        task.board = other
+        task.save()
+        task_id = task.id
+        task.delete()
+
+        assert transitions(task_id) == [
+            (board.id, '', Task.Status.TODO, None),
+            (board.id, Task.Status.TODO, '', None),
+            (other.id, '', Task.Status.TODO, None),
+            (other.id, Task.Status.TODO, '', None),
+        ]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_failed_save_writes_no_transition(self, board, user, monkeypatch):
+        """Test the history is written in the same transaction as the task."""
+        from apps.analytics import rollups
+
+        task = Task.objects.create(title='Task', board=board, reporter=user)
+
+        def fail(*args, **kwargs):
+            raise RuntimeError('rollup failure')
+
+        monkeypatch.setattr(rollups, '_upsert', fail)
+        task.status = Task.Status.DONE
+        with pytest.raises(RuntimeError):
+            task.save()
+
+        assert Task.objects.get(pk=task.pk).status == Task.Status.BACKLOG
+        assert len(transitions(task.id)) == 1
+
+    def test_bulk_moves_are_recorded(self, api_client, user, board):
+        """Test bulk operations append transitions in one insert."""
+        task = Task.objects.create(title='Task', board=board, reporter=user)
+        api_client.force_authenticate(user=user)
+        api_client.post(reverse('task-bulk'), {'operations': [
+            {'op': 'move', 'id': task.id, 'status': Task.Status.REVIEW},
+        ]}, format='json')
+
+        assert transitions(task.id)[-1] == (board.id, Task.Status.BACKLOG, Task.Status.REVIEW, user.id)
+
+
+@pytest.mark.django_db
+class TestBoardFlowAPI:
+    """Test cumulative flow and time-in-status queries."""
+
+    def test_flow_metrics(self, api_client, user, board):
+        """Test flow counts per day and nearest-rank percentiles per status."""
+        today = timezone.localdate()
+        start = timezone.make_aware(timezone.datetime.combine(today - timedelta(days=2), timezone.datetime.min.time()))
+        rows = []
+        for task_id, hours in ((1, 1), (2, 2), (3, 10)):
+            rows.append(TaskTransition(task_id=task_id, board_id=board.id, to_status='TODO', at=start))
+            rows.append(TaskTransition(
+                task_id=task_id, board_id=board.id, from_status='TODO', to_status='DONE',
+                at=start + timedelta(days=1, hours=hours),
+            ))
+        # Entered before the range and never moved
+        rows.append(TaskTransition(
+            task_id=4, board_id=board.id, to_status='TODO', at=start - timedelta(days=10),
+        ))
+        TaskTransition.objects.bulk_create(rows)
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(reverse('board-flow', args=[board.id]), {
+            'date_from': (today - timedelta(days=2)).isoformat(),
+            'date_to': today.isoformat(),
+        })
+
+        assert response.status_code == status.HTTP_200_OK
+        flow = response.data['cumulative_flow']
+        assert [(day['TODO'], day['DONE']) for day in flow] == [(4, 0), (1, 3), (1, 3)]
+        todo = response.data['time_in_status'][0]
+        assert todo['status'] == 'TODO'
+        assert todo['count'] == 3
+        assert todo['p50_hours'] == 26.0
+        assert todo['p95_hours'] == 34.0
+
+    def test_flow_starts_from_the_latest_snapshot(self, user, board):
+        """Test history before the latest snapshot is not read and stays opened before the range count."""
+        from datetime import date, datetime, timezone as dt_timezone
+        from apps.analytics import flow
+        from apps.analytics.models import DailyStatusCount
+
+        day = lambda d, hour=0: datetime(2024, 12, d, hour, tzinfo=dt_timezone.utc)
+        TaskTransition.objects.bulk_create([
+            TaskTransition(task_id=1, board_id=board.id, to_status='TODO', at=day(1)),
+            TaskTransition(task_id=2, board_id=board.id, to_status='TODO', at=day(2)),
+            TaskTransition(task_id=2, board_id=board.id, from_status='TODO', to_status='DONE', at=day(5)),
+            TaskTransition(task_id=1, board_id=board.id, from_status='TODO', to_status='DONE', at=day(11, 6)),
+        ])
+        assert flow.snapshot_status_counts(date(2024, 12, 2)) == 1
+        assert flow.snapshot_status_counts(date(2024, 12, 5)) == 1
+        assert dict(DailyStatusCount.objects.filter(date=date(2024, 12, 5)).values_list('status', 'count')) == {
+            **{status: 0 for status in Task.Status.values}, 'TODO': 1, 'DONE': 1,
+        }
+
+        # Older history the snapshot already accounts for
+        TaskTransition.objects.create(task_id=9, board_id=board.id, to_status='REVIEW', at=day(3))
+        cumulative = flow.cumulative_flow([board.id], date(2024, 12, 10), date(2024, 12, 11))
+        assert [(d['TODO'], d['DONE'], d['REVIEW']) for d in cumulative] == [(1, 1, 0), (0, 2, 0)]
+
+        todo = flow.time_in_status([board.id], date(2024, 12, 11), date(2024, 12, 11))
+        assert [(row['status'], row['count'], row['avg_hours']) for row in todo] == [('TODO', 1, 246.0)]
@@ -0,0 +1,143 @@
+"""Buffered audit log writing."""
+import logging
+import uuid
+from pathlib import Path
+
+import orjson
+from asgiref.local import Local
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.utils.response_cache import bump_generations
+from apps.utils.transactions import CommitBuffers
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+# Context-local, so sync_to_async threads of async views share the buffer
+_request_state = Local()
+
+BULK_BATCH_SIZE = 500
+
+# Response cache generation of the audit log endpoints
+AUDIT_GENERATION = 'audit'
+
+
+class AuditBuffer:
+    """A batch of pending audit entries flushed with a single bulk insert."""
+
+    def __init__(self):
+        self.entries = []
+
+    def add(self, entry):
+        self.entries.append(entry)
+
+    def flush(self):
+        entries, self.entries = self.entries, []
+        if entries:
+            dispatch(entries)
+
+
+# Entries recorded inside a transaction, per savepoint
+_commit_buffers = CommitBuffers(AuditBuffer)
+
+
+def record(entry):
+    """
+    Queue an audit entry.
+
+    Entries produced inside a transaction are written when it commits and
+    dropped if it, or the savepoint they were recorded in, rolls back. Autocommit writes made while serving a request
+    are collected and written once the response is ready; anything else is
+    written immediately.
+    """
+    if transaction.get_connection().in_atomic_block:
+        _commit_buffers.get().add(entry)
+        return
+
+    request_buffer = getattr(_request_state, 'buffer', None)
+    if request_buffer is not None:
+        request_buffer.add(entry)
+    else:
+        dispatch([entry])
+
+
+def begin_request():
+    """Start collecting autocommit audit entries for the current request."""
+    _request_state.buffer = AuditBuffer()
+
+
+def end_request():
+    """Flush the entries collected during the current request."""
+    buffer = getattr(_request_state, 'buffer', None)
+    _request_state.buffer = None
+    if buffer is not None:
+        buffer.flush()
+
+
+async def aend_request():
+    """Async ``end_request``, entering a thread only when entries are pending."""
+    buffer = getattr(_request_state, 'buffer', None)
+    _request_state.buffer = None
+    if buffer is not None and buffer.entries:
+        await sync_to_async(buffer.flush)()
+
+
+def dispatch(entries):
+    """
+    Write a batch of entries, handing large batches to the Celery consumer
+    when ``AUDIT_LOG_ASYNC`` is enabled. If the broker is unreachable the
+    batch is written synchronously so nothing is lost.
+    """
+    threshold = getattr(settings, 'AUDIT_LOG_ASYNC_THRESHOLD', 50)
+    if getattr(settings, 'AUDIT_LOG_ASYNC', False) and len(entries) >= threshold:
+        from .tasks import write_audit_entries
+
+        try:
+            write_audit_entries.delay([serialize_entry(entry) for entry in entries])
+            return
+        except Exception as e:
+            logger.error(f"Failed to enqueue {len(entries)} audit entries, writing inline: {str(e)}")
+
+    write_entries(entries)
+
+
+def write_entries(entries):
+    """Insert entries with one bulk_create per ``BULK_BATCH_SIZE`` rows."""
+    AuditLog.objects.bulk_create(
+        [AuditLog(**entry) for entry in entries],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    transaction.on_commit(lambda: bump_generations(AUDIT_GENERATION))
+
+
+def dead_letter(entries):
+    """Save serialized entries that could not be written; return the file path."""
+    directory = Path(settings.AUDIT_LOG_DEAD_LETTER_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f'{timezone.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex}.jsonl'
+    path.write_bytes(b''.join(orjson.dumps(entry) + b'\n' for entry in entries))
+    return path
+
+
+def replay_dead_letters():
+    """Write the entries of every dead-letter file and remove it; return the entry count."""
+    count = 0
+    for path in sorted(Path(settings.AUDIT_LOG_DEAD_LETTER_DIR).glob('*.jsonl')):
+        entries = [deserialize_entry(orjson.loads(line)) for line in path.read_bytes().splitlines() if line]
+        with transaction.atomic():
+            write_entries(entries)
+        path.unlink()
+        count += len(entries)
+    return count
+
+
+def serialize_entry(entry):
+    return {**entry, 'timestamp': entry['timestamp'].isoformat()}
+
+
+def deserialize_entry(entry):
+    return {**entry, 'timestamp': parse_datetime(entry['timestamp'])}
@@ -0,0 +1,45 @@
+"""Maintain audit_logs partitions and apply the retention policy."""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.audit import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        'Create upcoming monthly audit_logs partitions, then archive months '
+        'older than the retention window to compressed JSONL and drop them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=3)
+        parser.add_argument(
+            '--retention-months',
+            type=int,
+            default=settings.AUDIT_LOG_RETENTION_MONTHS,
+        )
+        parser.add_argument('--archive-dir', default=settings.AUDIT_LOG_ARCHIVE_DIR)
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List the months that would be archived without touching data.',
+        )
+
+    def handle(self, *args, **options):
+        if not options['dry_run']:
+            created = partitions.ensure_future_partitions(options['months_ahead'])
+            for name in created:
+                self.stdout.write(f'Created partition {name}')
+
+        archived = partitions.apply_retention(
+            retention_months=options['retention_months'],
+            archive_dir=options['archive_dir'],
+            dry_run=options['dry_run'],
+        )
+        for month, path, count in archived:
+            if count is None:
+                self.stdout.write(f'Would archive {month:%Y-%m} to {path}')
+            else:
+                self.stdout.write(f'Archived {count} rows for {month:%Y-%m} to {path}')
+
+        self.stdout.write(self.style.SUCCESS(f'{len(archived)} month(s) past retention'))
@@ -0,0 +1,18 @@
+"""Write audit entries saved to dead-letter files by failed async batches."""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.audit.buffer import replay_dead_letters
+
+
+class Command(BaseCommand):
+    help = (
+        'Insert the audit entries of every file in AUDIT_LOG_DEAD_LETTER_DIR '
+        'and remove each file once its entries are written.'
+    )
+
+    def handle(self, *args, **options):
+        count = replay_dead_letters()
+        self.stdout.write(self.style.SUCCESS(
+            f'Replayed {count} audit entries from {settings.AUDIT_LOG_DEAD_LETTER_DIR}'
+        ))
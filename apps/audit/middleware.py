@@ -1,23 +1,58 @@
 """Middleware for audit logging."""
-from .models import AuditLog
+from asgiref.local import Local
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from . import buffer
+
+# Context-local, so sync_to_async threads of async views see their request
+_local = Local()
+
+
+def get_current_request():
+    """Return the request being served, if any."""
+    return getattr(_local, 'request', None)
 
 
 class AuditMiddleware:
     """Middleware to capture audit information."""
+    sync_capable = True
+    async_capable = True
 
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        # Store request info for signal handlers
-        if hasattr(request, 'user') and request.user.is_authenticated:
-            request._audit_user = request.user
-            request._audit_ip = self.get_client_ip(request)
-            request._audit_user_agent = request.META.get('HTTP_USER_AGENT', '')
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
 
-        response = self.get_response(request)
+        self.begin(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _local.request = None
+            buffer.end_request()
         return response
 
+    async def __acall__(self, request):
+        self.begin(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _local.request = None
+            await buffer.aend_request()
+        return response
+
+    def begin(self, request):
+        # Store request info for signal handlers. The user is resolved lazily
+        # because DRF authenticates (e.g. JWT) inside the view.
+        request._audit_ip = self.get_client_ip(request)
+        request._audit_user_agent = request.META.get('HTTP_USER_AGENT', '')[:500]
+
+        _local.request = request
+        buffer.begin_request()
+
     @staticmethod
     def get_client_ip(request):
         """Extract client IP from request."""
@@ -26,4 +61,4 @@ class AuditMiddleware:
             ip = x_forwarded_for.split(',')[0]
         else:
             ip = request.META.get('REMOTE_ADDR')
-        return ip
\ No newline at end of file
+        return ip
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:59
+
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Months of empty partitions created ahead of the current one
+MONTHS_AHEAD = 3
+
+
+def _add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_audit_logs(apps, schema_editor):
+    """RANGE partition audit_logs by month on MySQL; other backends are left as is."""
+    if schema_editor.connection.vendor != 'mysql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT MIN(timestamp) FROM audit_logs")
+        oldest = cursor.fetchone()[0] or datetime.now(timezone.utc)
+
+    now = datetime.now(timezone.utc)
+    month = _add_months(oldest, 0)
+    last = _add_months(now, MONTHS_AHEAD)
+    clauses = []
+    while month <= last:
+        upper = _add_months(month, 1)
+        clauses.append(
+            f"PARTITION p{month:%Y%m} VALUES LESS THAN (TO_DAYS('{upper:%Y-%m-%d}'))"
+        )
+        month = upper
+    clauses.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+
+    # Every unique key of a partitioned table must contain the partition column
+    schema_editor.execute(
+        "ALTER TABLE audit_logs DROP PRIMARY KEY, ADD PRIMARY KEY (id, timestamp)"
+    )
+    schema_editor.execute(
+        "ALTER TABLE audit_logs PARTITION BY RANGE (TO_DAYS(timestamp)) "
+        f"({', '.join(clauses)})"
+    )
+
+
+def unpartition_audit_logs(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+
+    schema_editor.execute("ALTER TABLE audit_logs REMOVE PARTITIONING")
+    schema_editor.execute(
+        "ALTER TABLE audit_logs DROP PRIMARY KEY, ADD PRIMARY KEY (id)"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('audit', '0002_auditlog_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='user',
+            field=models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='audit_logs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(partition_audit_logs, unpartition_audit_logs),
+    ]
@@ -1,6 +1,7 @@
 """Audit log models for tracking changes."""
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class AuditLog(models.Model):
@@ -11,11 +12,13 @@ class AuditLog(models.Model):
         UPDATE = 'UPDATE', 'Update'
         DELETE = 'DELETE', 'Delete'
 
+    # MySQL partitioned tables cannot carry foreign key constraints
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
         null=True,
-        related_name='audit_logs'
+        related_name='audit_logs',
+        db_constraint=False
     )
     action = models.CharField(max_length=10, choices=Action.choices)
     model_name = models.CharField(max_length=100)
@@ -23,7 +26,8 @@ class AuditLog(models.Model):
     changes = models.JSONField(default=dict)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.CharField(max_length=500, blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the change happens, not when a buffered batch is written
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         db_table = 'audit_logs'
@@ -0,0 +1,219 @@
+"""Monthly partition management and archival for the audit_logs table.
+
+On MySQL 8 ``audit_logs`` is RANGE partitioned by month on ``timestamp``
+(see migration 0003), so ``date_from``/``date_to`` filters only touch the
+partitions they overlap and expired months are removed with a metadata-only
+``DROP PARTITION``. Other backends fall back to exporting and deleting
+expired rows in batches, which keeps the retention behaviour identical.
+"""
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from apps.utils.response_cache import bump_generations
+from .buffer import AUDIT_GENERATION
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+TABLE = AuditLog._meta.db_table
+CATCH_ALL = 'pmax'
+EXPORT_COLUMNS = [
+    'id', 'user_id', 'action', 'model_name', 'object_id',
+    'changes', 'ip_address', 'user_agent', 'timestamp',
+]
+FETCH_SIZE = 5000
+
+
+def month_start(value):
+    """Return midnight UTC on the first day of ``value``'s month."""
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(month):
+    return f'p{month:%Y%m}'
+
+
+def partition_month(name):
+    return datetime.strptime(name[1:], '%Y%m').replace(tzinfo=dt_timezone.utc)
+
+
+def partition_clause(month):
+    upper = add_months(month, 1)
+    return (
+        f"PARTITION {partition_name(month)} "
+        f"VALUES LESS THAN (TO_DAYS('{upper:%Y-%m-%d}'))"
+    )
+
+
+def is_partitioned():
+    return connection.vendor == 'mysql' and bool(list_partitions())
+
+
+def list_partitions():
+    """Return the monthly partition names of audit_logs, oldest first."""
+    if connection.vendor != 'mysql':
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT PARTITION_NAME FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+              AND PARTITION_NAME IS NOT NULL
+            ORDER BY PARTITION_ORDINAL_POSITION
+            """,
+            [TABLE],
+        )
+        return [row[0] for row in cursor.fetchall() if row[0] != CATCH_ALL]
+
+
+def ensure_future_partitions(months_ahead=3, now=None):
+    """Split the catch-all partition so the next months have their own."""
+    existing = set(list_partitions())
+    if not existing:
+        return []
+
+    current = month_start(now or datetime.now(dt_timezone.utc))
+    newest = max(partition_month(name) for name in existing)
+    wanted = [
+        add_months(current, offset) for offset in range(months_ahead + 1)
+        if add_months(current, offset) > newest
+    ]
+    if not wanted:
+        return []
+
+    clauses = ', '.join(partition_clause(month) for month in wanted)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"ALTER TABLE {TABLE} REORGANIZE PARTITION {CATCH_ALL} INTO "
+            f"({clauses}, PARTITION {CATCH_ALL} VALUES LESS THAN MAXVALUE)"
+        )
+    created = [partition_name(month) for month in wanted]
+    logger.info(f"Created audit log partitions: {', '.join(created)}")
+    return created
+
+
+def expired_months(retention_months, now=None):
+    """Return the month starts older than the retention window."""
+    cutoff = add_months(month_start(now or datetime.now(dt_timezone.utc)), -retention_months)
+    if is_partitioned():
+        return [
+            partition_month(name) for name in list_partitions()
+            if partition_month(name) < cutoff
+        ]
+
+    oldest = AuditLog.objects.filter(timestamp__lt=cutoff).order_by('timestamp').values_list(
+        'timestamp', flat=True
+    ).first()
+    if oldest is None:
+        return []
+    months = []
+    month = month_start(oldest)
+    while month < cutoff:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def archive_path(archive_dir, month):
+    return Path(archive_dir) / f'{TABLE}_{month:%Y%m}.jsonl.gz'
+
+
+def export_month(month, archive_dir):
+    """
+    Stream one month of audit rows into a gzip-compressed JSONL file.
+
+    The file is written under a temporary name, fsynced and then renamed, so
+    a crash never leaves a truncated archive that looks complete.
+    """
+    path = archive_path(archive_dir, month)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+
+    start, end = month, add_months(month, 1)
+    if is_partitioned():
+        source = f'{TABLE} PARTITION ({partition_name(month)})'
+        conditions, params = [], []
+    else:
+        source = TABLE
+        conditions, params = ['timestamp >= %s', 'timestamp < %s'], [start, end]
+
+    # mysqlclient buffers a whole result set client-side, so read the month
+    # in keyset chunks on id rather than fetchmany() over one query
+    count = 0
+    last_id = 0
+    with connection.cursor() as cursor, gzip.open(tmp_path, 'wt', encoding='utf-8') as archive:
+        while True:
+            where = ' AND '.join(conditions + ['id > %s'])
+            cursor.execute(
+                f"SELECT {', '.join(EXPORT_COLUMNS)} FROM {source} WHERE {where} ORDER BY id LIMIT %s",
+                params + [last_id, FETCH_SIZE]
+            )
+            rows = cursor.fetchall()
+            for row in rows:
+                record = dict(zip(EXPORT_COLUMNS, row))
+                if isinstance(record['changes'], str):
+                    record['changes'] = json.loads(record['changes'])
+                archive.write(json.dumps(record, cls=DjangoJSONEncoder))
+                archive.write('\n')
+            count += len(rows)
+            if len(rows) < FETCH_SIZE:
+                break
+            last_id = rows[-1][EXPORT_COLUMNS.index('id')]
+
+    with open(tmp_path, 'rb') as archive:
+        os.fsync(archive.fileno())
+    os.replace(tmp_path, path)
+    return path, count
+
+
+def drop_month(month, batch_size=10000):
+    """Remove one month of audit rows once it has been archived."""
+    if is_partitioned():
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {TABLE} DROP PARTITION {partition_name(month)}")
+        return
+
+    start, end = month, add_months(month, 1)
+    while True:
+        with transaction.atomic():
+            ids = list(
+                AuditLog.objects.filter(timestamp__gte=start, timestamp__lt=end)
+                .order_by()
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            AuditLog.objects.filter(id__in=ids).delete()
+
+
+def apply_retention(retention_months=None, archive_dir=None, dry_run=False, now=None):
+    """Archive and drop every month older than the retention window."""
+    if retention_months is None:
+        retention_months = settings.AUDIT_LOG_RETENTION_MONTHS
+    if archive_dir is None:
+        archive_dir = settings.AUDIT_LOG_ARCHIVE_DIR
+
+    archived = []
+    for month in expired_months(retention_months, now=now):
+        if dry_run:
+            archived.append((month, archive_path(archive_dir, month), None))
+            continue
+        path, count = export_month(month, archive_dir)
+        drop_month(month)
+        bump_generations(AUDIT_GENERATION)
+        logger.info(f"Archived {count} audit logs for {month:%Y-%m} to {path}")
+        archived.append((month, path, count))
+    return archived
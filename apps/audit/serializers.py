@@ -2,9 +2,10 @@
 from rest_framework import serializers
 from .models import AuditLog
 from apps.users.serializers import UserSerializer
+from apps.utils.fieldsets import FlexFieldsMixin
 
 
-class AuditLogSerializer(serializers.ModelSerializer):
+class AuditLogSerializer(FlexFieldsMixin, serializers.ModelSerializer):
     """Serializer for audit logs."""
     user_detail = UserSerializer(source='user', read_only=True)
 
@@ -14,4 +15,5 @@ class AuditLogSerializer(serializers.ModelSerializer):
             'id', 'user', 'user_detail', 'action', 'model_name',
             'object_id', 'changes', 'ip_address', 'user_agent', 'timestamp'
         ]
-        read_only_fields = fields
\ No newline at end of file
+        read_only_fields = fields
+        expandable_fields = {'user_detail': None}
\ No newline at end of file
@@ -1,81 +1,162 @@
 """Signal handlers for audit logging."""
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
 from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
 import json
 
+from . import buffer
+from .middleware import get_current_request
 from .models import AuditLog
 from apps.tasks.models import Task, Comment
 from apps.projects.models import Project, Board, ProjectMember
 
+# Each handler is connected per model, so loading or saving other models
+# (audit rows included) never reaches them
 AUDITED_MODELS = [Task, Comment, Project, Board, ProjectMember]
 
+EXCLUDED_FIELDS = {'password'}
+
+# Marks a field that was deferred when the instance was loaded
+_DEFERRED = object()
+
+
+def _tracked_fields(model):
+    """Concrete fields worth diffing: auto_now timestamps change on every save."""
+    tracked = getattr(model, '_audit_tracked_fields', None)
+    if tracked is None:
+        tracked = tuple(
+            field for field in model._meta.concrete_fields
+            if field.name not in EXCLUDED_FIELDS and not getattr(field, 'auto_now', False)
+        )
+        model._audit_tracked_fields = tracked
+    return tracked
+
+
+def take_snapshot(instance):
+    """
+    Capture the loaded field values as a tuple in field order.
+
+    Values are read from ``__dict__`` by attname, so foreign keys are stored
+    as ids and deferred fields are never fetched.
+    """
+    values = instance.__dict__
+    return tuple(
+        values.get(field.attname, _DEFERRED) for field in _tracked_fields(type(instance))
+    )
+
 
 def get_model_changes(instance, created=False):
-    """Extract changes from model instance."""
+    """
+    Extract changes from model instance.
+
+    Creates record every loaded field; updates record ``[old, new]`` pairs
+    for fields that differ from the snapshot taken when the instance was
+    loaded or last saved.
+    """
+    fields = _tracked_fields(type(instance))
+    current = take_snapshot(instance)
+
     if created:
         return {
-            field.name: str(getattr(instance, field.name))
-            for field in instance._meta.fields
-            if field.name not in ['password']
+            field.attname: value
+            for field, value in zip(fields, current)
+            if value is not _DEFERRED
         }
-    else:
-        return {'updated': True}
 
-
-@receiver(post_save)
+    previous = getattr(instance, '_audit_snapshot', None)
+    if previous is None:
+        return {}
+    return {
+        field.attname: [old, new]
+        for field, old, new in zip(fields, previous, current)
+        if old is not _DEFERRED and new is not _DEFERRED and old != new
+    }
+
+
+def get_audit_context(instance):
+    """Return the acting user, IP address and user agent for a change."""
+    request = getattr(instance, '_request', None) or get_current_request()
+    if request is None:
+        return None, None, ''
+
+    user = getattr(request, '_audit_user', None)
+    if user is None:
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            user = None
+
+    ip_address = getattr(request, '_audit_ip', None)
+    user_agent = getattr(request, '_audit_user_agent', '')
+    return user, ip_address, user_agent
+
+
+@receiver(post_init, sender=Task)
+@receiver(post_init, sender=Comment)
+@receiver(post_init, sender=Project)
+@receiver(post_init, sender=Board)
+@receiver(post_init, sender=ProjectMember)
+def snapshot_loaded_values(sender, instance, **kwargs):
+    """Remember loaded values so updates can be diffed without a query."""
+    instance._audit_snapshot = take_snapshot(instance)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Board)
+@receiver(post_save, sender=ProjectMember)
 def log_create_update(sender, instance, created, **kwargs):
     """Log create and update actions."""
-    if sender not in AUDITED_MODELS:
-        return
-
-    request = getattr(instance, '_request', None)
-    user = getattr(request, '_audit_user', None) if request else None
-    ip_address = getattr(request, '_audit_ip', None) if request else None
-    user_agent = getattr(request, '_audit_user_agent', '') if request else ''
+    user, ip_address, user_agent = get_audit_context(instance)
 
     if not user:
+        instance._audit_snapshot = take_snapshot(instance)
         return
 
     action = AuditLog.Action.CREATE if created else AuditLog.Action.UPDATE
     changes = get_model_changes(instance, created)
+    instance._audit_snapshot = take_snapshot(instance)
+
+    if not changes:
+        return
 
     try:
         json_changes = json.loads(json.dumps(changes, cls=DjangoJSONEncoder))
     except (TypeError, ValueError):
         json_changes = {'error': 'Unable to serialize changes'}
 
-    AuditLog.objects.create(
-        user=user,
-        action=action,
-        model_name=sender.__name__,
-        object_id=instance.pk,
-        changes=json_changes,
-        ip_address=ip_address,
-        user_agent=user_agent
-    )
-
-
-@receiver(post_delete)
+    buffer.record({
+        'user_id': user.pk,
+        'action': action,
+        'model_name': sender.__name__,
+        'object_id': instance.pk,
+        'changes': json_changes,
+        'ip_address': ip_address,
+        'user_agent': user_agent,
+        'timestamp': timezone.now(),
+    })
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Board)
+@receiver(post_delete, sender=ProjectMember)
 def log_delete(sender, instance, **kwargs):
     """Log delete actions."""
-    if sender not in AUDITED_MODELS:
-        return
-
-    request = getattr(instance, '_request', None)
-    user = getattr(request, '_audit_user', None) if request else None
-    ip_address = getattr(request, '_audit_ip', None) if request else None
-    user_agent = getattr(request, '_audit_user_agent', '') if request else ''
+    user, ip_address, user_agent = get_audit_context(instance)
 
     if not user:
         return
 
-    AuditLog.objects.create(
-        user=user,
-        action=AuditLog.Action.DELETE,
-        model_name=sender.__name__,
-        object_id=instance.pk,
-        changes={'deleted': True},
-        ip_address=ip_address,
-        user_agent=user_agent
-    )
\ No newline at end of file
+    buffer.record({
+        'user_id': user.pk,
+        'action': AuditLog.Action.DELETE,
+        'model_name': sender.__name__,
+        'object_id': instance.pk,
+        'changes': {'deleted': True},
+        'ip_address': ip_address,
+        'user_agent': user_agent,
+        'timestamp': timezone.now(),
+    })
@@ -0,0 +1,53 @@
+"""Celery tasks for audit logging."""
+from celery import shared_task
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    max_retries=settings.AUDIT_LOG_WRITE_MAX_RETRIES,
+)
+def write_audit_entries(self, entries):
+    """Write a batch of buffered audit entries.
+
+    The message is only acknowledged after the insert, so a batch survives a
+    worker restart and is redelivered. Failed inserts are retried with
+    exponential backoff; once the retries run out the batch is saved to a
+    dead-letter file instead of being retried forever.
+    """
+    from .buffer import dead_letter, deserialize_entry, write_entries
+
+    try:
+        write_entries([deserialize_entry(entry) for entry in entries])
+    except Exception as e:
+        if self.request.retries >= self.max_retries:
+            path = dead_letter(entries)
+            logger.error(
+                f"Dead-lettered {len(entries)} audit entries to {path} "
+                f"after {self.request.retries} retries: {str(e)}"
+            )
+            return 0
+        raise self.retry(exc=e, countdown=get_exponential_backoff_interval(
+            factor=1, retries=self.request.retries, maximum=600, full_jitter=True
+        ))
+    logger.info(f"Wrote {len(entries)} audit entries")
+
+    return len(entries)
+
+
+@shared_task
+def maintain_audit_partitions():
+    """Create upcoming audit partitions and archive expired months."""
+    from . import partitions
+
+    partitions.ensure_future_partitions()
+    archived = partitions.apply_retention()
+    logger.info(f"Archived {len(archived)} expired audit log months")
+
+    return len(archived)
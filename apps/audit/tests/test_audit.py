@@ -0,0 +1,249 @@
+"""Tests for audit logging."""
+import io
+
+import pytest
+from django.db import transaction
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from apps.audit import buffer
+from apps.audit.models import AuditLog
+from apps.projects.models import Project, Board
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cached responses must not leak between tests reusing user ids."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(
+        username='testuser',
+        email='test@example.com',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def board(user):
+    project = Project.objects.create(name='Test Project', owner=user)
+    return Board.objects.create(name='Test Board', project=project)
+
+
+@pytest.fixture
+def entry(user):
+    def make(object_id):
+        from django.utils import timezone
+        return {
+            'user_id': user.pk,
+            'action': AuditLog.Action.UPDATE,
+            'model_name': 'Task',
+            'object_id': object_id,
+            'changes': {},
+            'ip_address': None,
+            'user_agent': '',
+            'timestamp': timezone.now(),
+        }
+    return make
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAuditBuffer:
+    """Test buffered audit writing."""
+
+    def test_api_write_is_audited(self, api_client, user, board):
+        """Test a task created over the API produces an audit entry."""
+        api_client.force_authenticate(user=user)
+        response = api_client.post(reverse('task-list'), {
+            'title': 'Audited',
+            'board': board.id,
+        }, HTTP_USER_AGENT='pytest')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        log = AuditLog.objects.get(model_name='Task', object_id=response.data['id'])
+        assert log.action == AuditLog.Action.CREATE
+        assert log.user == user
+        assert log.user_agent == 'pytest'
+
+    def test_transaction_flushes_once_on_commit(self, entry):
+        """Test entries recorded in a transaction are bulk inserted on commit."""
+        with transaction.atomic():
+            for object_id in range(1, 4):
+                buffer.record(entry(object_id))
+            assert AuditLog.objects.count() == 0
+
+        assert AuditLog.objects.count() == 3
+
+    def test_rollback_discards_entries(self, entry):
+        """Test entries from a rolled back transaction are not written."""
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                buffer.record(entry(1))
+                raise RuntimeError
+
+        with transaction.atomic():
+            buffer.record(entry(2))
+
+        assert list(AuditLog.objects.values_list('object_id', flat=True)) == [2]
+
+    def test_savepoint_rollback_discards_its_entries(self, entry):
+        """Test entries of a rolled back savepoint are dropped and the rest committed."""
+        with transaction.atomic():
+            buffer.record(entry(1))
+            with pytest.raises(RuntimeError):
+                with transaction.atomic():
+                    buffer.record(entry(2))
+                    raise RuntimeError
+            with transaction.atomic():
+                buffer.record(entry(3))
+            buffer.record(entry(4))
+
+        assert sorted(AuditLog.objects.values_list('object_id', flat=True)) == [1, 3, 4]
+
+    def test_request_scope_batches_autocommit_writes(self, entry, django_assert_max_num_queries):
+        """Test autocommit entries in a request are written in one insert."""
+        buffer.begin_request()
+        for object_id in range(1, 4):
+            buffer.record(entry(object_id))
+
+        with django_assert_max_num_queries(3) as captured:
+            buffer.end_request()
+
+        inserts = [q for q in captured.captured_queries if q['sql'].startswith('INSERT')]
+        assert len(inserts) == 1
+        assert AuditLog.objects.count() == 3
+
+    def test_failing_batch_is_dead_lettered_and_replayed(self, entry, settings, tmp_path, monkeypatch):
+        """Test a batch is retried a bounded number of times, then saved for replay."""
+        from django.core.management import call_command
+        from django.db import DatabaseError
+        from apps.audit.tasks import write_audit_entries
+
+        settings.AUDIT_LOG_DEAD_LETTER_DIR = str(tmp_path)
+        attempts = []
+
+        def fail(entries):
+            attempts.append(len(entries))
+            raise DatabaseError('gone away')
+
+        monkeypatch.setattr(buffer, 'write_entries', fail)
+        batch = [buffer.serialize_entry(entry(object_id)) for object_id in (1, 2)]
+        assert write_audit_entries.apply(args=[batch]).get() == 0
+
+        assert len(attempts) == write_audit_entries.max_retries + 1
+        assert len(list(tmp_path.glob('*.jsonl'))) == 1
+
+        monkeypatch.undo()
+        call_command('replay_audit_dead_letters', stdout=io.StringIO())
+        assert sorted(AuditLog.objects.values_list('object_id', flat=True)) == [1, 2]
+        assert list(tmp_path.glob('*.jsonl')) == []
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAuditChanges:
+    """Test field-level change capture."""
+
+    @pytest.fixture
+    def task(self, board, user):
+        return Task.objects.create(title='Tracked', board=board, reporter=user)
+
+    @pytest.fixture
+    def admin_user(self, db):
+        return User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123',
+            role=User.Role.ADMIN
+        )
+
+    def test_update_records_only_changed_fields(self, api_client, admin_user, task):
+        """Test an update stores old/new pairs for changed fields only."""
+        api_client.force_authenticate(user=admin_user)
+        api_client.post(reverse('task-move', kwargs={'pk': task.id}), {'status': Task.Status.TODO})
+
+        log = AuditLog.objects.get(action=AuditLog.Action.UPDATE, object_id=task.id)
+        assert log.changes == {'status': [Task.Status.BACKLOG, Task.Status.TODO]}
+
+    def test_foreign_keys_use_ids_without_queries(self, task, user, django_assert_num_queries):
+        """Test diffing a foreign key change does not load related objects."""
+        from apps.audit.signals import get_model_changes
+
+        task = Task.objects.get(pk=task.pk)
+        task.assignee_id = user.id
+        with django_assert_num_queries(0):
+            changes = get_model_changes(task)
+
+        assert changes == {'assignee_id': [None, user.id]}
+
+    def test_unchanged_save_is_not_logged(self, api_client, admin_user, task):
+        """Test a save without changes writes no audit entry."""
+        api_client.force_authenticate(user=admin_user)
+        api_client.post(reverse('task-move', kwargs={'pk': task.id}), {'status': task.status})
+
+        assert not AuditLog.objects.filter(action=AuditLog.Action.UPDATE).exists()
+
+    def test_only_audited_models_are_snapshotted(self, task, user):
+        """Test loading models outside the audit list takes no snapshot."""
+        assert hasattr(Task.objects.get(pk=task.pk), '_audit_snapshot')
+        assert not hasattr(User.objects.get(pk=user.pk), '_audit_snapshot')
+
+
+@pytest.mark.django_db
+class TestAuditRetention:
+    """Test audit log retention and archival."""
+
+    def test_expired_months_are_archived_and_removed(self, entry, tmp_path):
+        """Test rows past retention are exported to gzip JSONL then dropped."""
+        import gzip
+        import json
+        from datetime import datetime, timezone
+        from apps.audit import partitions
+
+        old = AuditLog.objects.create(**{**entry(1), 'timestamp': datetime(2025, 1, 15, tzinfo=timezone.utc)})
+        recent = AuditLog.objects.create(**{**entry(2), 'timestamp': datetime(2025, 6, 1, tzinfo=timezone.utc)})
+
+        archived = partitions.apply_retention(
+            retention_months=3,
+            archive_dir=tmp_path,
+            now=datetime(2025, 6, 10, tzinfo=timezone.utc),
+        )
+
+        assert [month.month for month, _, _ in archived] == [1, 2]
+        with gzip.open(tmp_path / 'audit_logs_202501.jsonl.gz', 'rt') as archive:
+            rows = [json.loads(line) for line in archive]
+        assert [row['id'] for row in rows] == [old.id]
+        assert list(AuditLog.objects.values_list('id', flat=True)) == [recent.id]
+
+    def test_export_reads_in_keyset_chunks(self, entry, tmp_path, monkeypatch):
+        """Test a month larger than the fetch size is exported chunk by chunk."""
+        import gzip
+        import json
+        from datetime import datetime, timezone
+        from apps.audit import partitions
+
+        monkeypatch.setattr(partitions, 'FETCH_SIZE', 2)
+        logs = [
+            AuditLog.objects.create(**{**entry(i), 'timestamp': datetime(2025, 1, 15, tzinfo=timezone.utc)})
+            for i in range(5)
+        ]
+
+        path, count = partitions.export_month(datetime(2025, 1, 1, tzinfo=timezone.utc), tmp_path)
+
+        with gzip.open(path, 'rt') as archive:
+            rows = [json.loads(line) for line in archive]
+        assert count == 5
+        assert [row['id'] for row in rows] == [log.id for log in logs]
@@ -3,6 +3,14 @@ from rest_framework import viewsets, permissions
 from django_filters import rest_framework as filters
 from .models import AuditLog
 from .serializers import AuditLogSerializer
+from apps.utils.export import ExportMixin
+from apps.utils.fast_serializers import FastListMixin
+from apps.utils.fieldsets import expands_field
+from apps.utils.pagination import HybridPagination
+from apps.utils.streaming import StreamingListMixin
+from apps.utils.response_cache import ResponseCacheMixin
+from .buffer import AUDIT_GENERATION
+from .partitions import EXPORT_COLUMNS
 
 
 class AuditLogFilter(filters.FilterSet):
@@ -18,13 +26,21 @@ class AuditLogFilter(filters.FilterSet):
         fields = ['model_name', 'action', 'user', 'object_id']
 
 
-class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
+class AuditLogViewSet(
+    ResponseCacheMixin, ExportMixin, StreamingListMixin, FastListMixin, viewsets.ReadOnlyModelViewSet
+):
     """Read-only viewset for audit logs."""
     queryset = AuditLog.objects.all()
     serializer_class = AuditLogSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = HybridPagination
     filterset_class = AuditLogFilter
     ordering_fields = ['timestamp']
+    export_name = 'audit_logs'
+    export_columns = EXPORT_COLUMNS
+
+    def get_cache_generations(self):
+        return [AUDIT_GENERATION]
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -33,4 +49,6 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
         if not self.request.user.is_admin:
             queryset = queryset.filter(user=self.request.user)
 
-        return queryset.select_related('user')
\ No newline at end of file
+        if expands_field(self.request, AuditLogSerializer, 'user_detail'):
+            queryset = queryset.select_related('user')
+        return queryset
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""
+Publishing of change events to the per-project feeds.
+
+Each committed change becomes a compact event: the object's type and id,
+the board it lives on, the fields that changed with their new values and a
+version (the time of the change). Events of one transaction are coalesced
+per object and sent when it commits, with a single Redis round trip: a Lua
+script appends each event to the project's bounded stream, which provides
+the ids used for ``Last-Event-ID`` replay, and publishes it on the
+project's channel for live subscribers. Other apps receive the same
+committed events through the ``events_committed`` signal.
+"""
+import logging
+
+import orjson
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import Signal
+from django_redis import get_redis_connection
+
+from apps.utils.transactions import CommitBuffers
+
+logger = logging.getLogger(__name__)
+
+CREATED = 'created'
+UPDATED = 'updated'
+DELETED = 'deleted'
+
+# KEYS[1]: stream; ARGV: channel, max length, ttl (ms), then pairs of board id and event
+PUBLISH_SCRIPT = """
+local ids = {}
+for i = 4, #ARGV, 2 do
+    local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[2], '*', 'board', ARGV[i], 'event', ARGV[i + 1])
+    redis.call('PUBLISH', ARGV[1], id .. ' ' .. ARGV[i] .. ' ' .. ARGV[i + 1])
+    ids[#ids + 1] = id
+end
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return ids
+"""
+
+_script = None
+
+# Sent with the ``(project_id, event)`` pairs of every commit, also when the
+# feed itself is disabled
+events_committed = Signal()
+
+
+def stream_key(project_id):
+    # The hash tag keeps a project's stream on one cluster slot
+    return f'feed:{{{project_id}}}:events'
+
+
+def channel_name(project_id):
+    return f'feed:{{{project_id}}}'
+
+
+def get_redis():
+    return get_redis_connection('default')
+
+
+def make_event(kind, action, object_id, board_id, fields, version):
+    return {
+        'type': f'{kind}.{action}',
+        'id': object_id,
+        'board': board_id,
+        'fields': fields,
+        'version': version,
+    }
+
+
+class EventBuffer:
+    """Events of one transaction, coalesced per object and published together."""
+
+    def __init__(self):
+        self.events = {}
+
+    def add(self, project_id, event):
+        key = (project_id, event['type'].split('.')[0], event['id'])
+        previous = self.events.get(key)
+        if previous is not None and not event['type'].endswith(DELETED):
+            # A creation followed by updates still reads as a creation
+            action = previous['type'].rsplit('.', 1)[1]
+            if action != DELETED:
+                event = {
+                    **event,
+                    'type': previous['type'] if action == CREATED else event['type'],
+                    'fields': {**previous['fields'], **event['fields']},
+                }
+        self.events[key] = event
+
+    def flush(self):
+        events, self.events = self.events, {}
+        if events:
+            dispatch([(project_id, event) for (project_id, _, _), event in events.items()])
+
+
+# Events recorded inside a transaction, per savepoint
+_commit_buffers = CommitBuffers(EventBuffer)
+
+
+def record(project_id, event):
+    """
+    Queue an event for a project's feed.
+
+    Events produced inside a transaction are published when it commits and
+    dropped if it, or the savepoint they were recorded in, rolls back; anything else is published immediately.
+    """
+    if project_id is None:
+        return
+    if transaction.get_connection().in_atomic_block:
+        _commit_buffers.get().add(project_id, event)
+    else:
+        dispatch([(project_id, event)])
+
+
+def dispatch(events):
+    """Publish committed events to the feed and hand them to other consumers."""
+    if settings.FEED_ENABLED:
+        publish(events)
+    events_committed.send(sender=EventBuffer, events=events)
+
+
+def publish(events):
+    """
+    Append ``(project_id, event)`` pairs to their project streams and channels.
+
+    Publishing is best effort: clients that miss events after a Redis
+    failure resynchronize when the stream tells them to reset.
+    """
+    global _script
+    by_project = {}
+    for project_id, event in events:
+        by_project.setdefault(project_id, []).extend(
+            (event['board'] or 0, orjson.dumps(event))
+        )
+
+    try:
+        redis = get_redis()
+        if _script is None:
+            _script = redis.register_script(PUBLISH_SCRIPT)
+        pipeline = redis.pipeline(transaction=False)
+        for project_id, args in by_project.items():
+            _script(
+                keys=[stream_key(project_id)],
+                args=[
+                    channel_name(project_id),
+                    settings.FEED_STREAM_MAXLEN,
+                    settings.FEED_STREAM_TTL * 1000,
+                    *args,
+                ],
+                client=pipeline,
+            )
+        pipeline.execute()
+    except Exception as e:
+        logger.error(f"Failed to publish {len(events)} feed events: {str(e)}")
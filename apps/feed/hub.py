@@ -0,0 +1,172 @@
+"""
+Process-wide fan-out of project channels to SSE subscribers.
+
+Each server process holds one Redis pub/sub connection per event loop and
+subscribes it to a project's channel while at least one client follows
+that project. Messages are pushed into small per-client buffers, so an
+idle viewer costs a buffer and a suspended coroutine: no Redis connection
+and no database query.
+"""
+import asyncio
+import logging
+import weakref
+from collections import deque
+
+from django.conf import settings
+
+from apps.utils.async_cache import get_async_redis
+from .events import channel_name, stream_key
+
+logger = logging.getLogger(__name__)
+
+# Seconds the reader waits for a message before checking its subscriptions
+READ_TIMEOUT = 1.0
+# Seconds to wait before reading again after a Redis error
+RETRY_DELAY = 1.0
+
+_hubs = weakref.WeakKeyDictionary()
+
+
+def parse_event_id(event_id):
+    """Return a stream id as a comparable tuple, or None if it is malformed."""
+    if isinstance(event_id, bytes):
+        event_id = event_id.decode()
+    milliseconds, _, sequence = (event_id or '').partition('-')
+    if not (milliseconds.isdigit() and sequence.isdigit()):
+        return None
+    return int(milliseconds), int(sequence)
+
+
+class Subscription:
+    """Events of one project channel waiting to be sent to one client."""
+
+    def __init__(self, channel, board_id=None, limit=None):
+        self.channel = channel
+        self.board = str(board_id).encode() if board_id is not None else None
+        self.limit = limit or settings.FEED_SUBSCRIBER_BUFFER
+        self.pending = deque()
+        self.ready = asyncio.Event()
+        self.closed = False
+
+    def push(self, event_id, data):
+        # A client that falls this far behind reconnects and replays instead
+        if len(self.pending) >= self.limit:
+            self.close()
+            return
+        self.pending.append((event_id, data))
+        self.ready.set()
+
+    def close(self):
+        self.closed = True
+        self.ready.set()
+
+    async def get(self, timeout):
+        """
+        Return the next ``(event_id, data)`` pair, or None once closed.
+
+        Raises ``asyncio.TimeoutError`` if nothing arrives within ``timeout``.
+        """
+        if not self.pending and not self.closed:
+            self.ready.clear()
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        if self.pending:
+            return self.pending.popleft()
+        return None
+
+
+class FeedHub:
+    """Shares one pub/sub connection between every subscriber of a process."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.pubsub = redis.pubsub()
+        self.channels = {}
+        self.lock = asyncio.Lock()
+        self.reader = None
+
+    async def subscribe(self, project_id, board_id=None):
+        """Start receiving a project's events, optionally only those of one board."""
+        subscription = Subscription(channel_name(project_id).encode(), board_id)
+        async with self.lock:
+            subscribers = self.channels.get(subscription.channel)
+            if subscribers is None:
+                await self.pubsub.subscribe(subscription.channel)
+                subscribers = self.channels[subscription.channel] = set()
+            subscribers.add(subscription)
+            if self.reader is None or self.reader.done():
+                self.reader = asyncio.create_task(self.read())
+        return subscription
+
+    async def unsubscribe(self, subscription):
+        subscription.close()
+        async with self.lock:
+            subscribers = self.channels.get(subscription.channel)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self.channels[subscription.channel]
+                try:
+                    await self.pubsub.unsubscribe(subscription.channel)
+                except Exception as e:
+                    logger.error(f"Failed to unsubscribe from {subscription.channel}: {str(e)}")
+
+    async def read(self):
+        """Dispatch channel messages until no subscriptions are left."""
+        while self.channels:
+            try:
+                message = await self.pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=READ_TIMEOUT
+                )
+            except Exception as e:
+                # Messages may have been lost: end every stream so clients
+                # reconnect and replay what they missed from the streams.
+                logger.error(f"Feed subscription failed: {str(e)}")
+                self.close_all()
+                await asyncio.sleep(RETRY_DELAY)
+                continue
+            if message is not None and message['type'] == 'message':
+                self.dispatch(message['channel'], message['data'])
+
+    def dispatch(self, channel, message):
+        """Hand a published ``<id> <board> <event>`` message to the channel's subscribers."""
+        event_id, board, data = message.split(b' ', 2)
+        for subscription in tuple(self.channels.get(channel, ())):
+            if subscription.board is None or subscription.board == board:
+                subscription.push(event_id.decode(), data)
+
+    def close_all(self):
+        for subscribers in self.channels.values():
+            for subscription in subscribers:
+                subscription.close()
+
+    async def replay(self, project_id, last_event_id, board_id=None):
+        """
+        Return the events after ``last_event_id`` still held in the project's
+        stream, and whether they are complete.
+
+        The replay is incomplete when the stream has been trimmed or has
+        expired past the client's position.
+        """
+        key = stream_key(project_id)
+        async with self.redis.pipeline(transaction=False) as pipeline:
+            pipeline.xrange(key, min='-', max='+', count=1)
+            pipeline.xrange(key, min=f'({last_event_id}', max='+', count=settings.FEED_STREAM_MAXLEN)
+            first, entries = await pipeline.execute()
+
+        complete = bool(first) and parse_event_id(first[0][0]) <= parse_event_id(last_event_id)
+        board = str(board_id).encode() if board_id is not None else None
+        return [
+            (event_id.decode(), fields[b'event'])
+            for event_id, fields in entries
+            if board is None or fields[b'board'] == board
+        ], complete
+
+
+def get_hub():
+    """Return the hub of the running event loop."""
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = FeedHub(get_async_redis(settings.FEED_REDIS_URL))
+    return hub
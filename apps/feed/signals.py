@@ -0,0 +1,151 @@
+"""Signal handlers turning task, comment and board changes into feed events."""
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.projects.models import Board
+from apps.tasks.models import Task, Comment
+from apps.tasks.signals import parent_deleted, task_project_id, task_sla_breached
+from . import events
+
+# Fields sent in events per model, as (name, attname); names match the API
+FEED_FIELDS = {
+    Task: (
+        ('title', 'title'),
+        ('status', 'status'),
+        ('priority', 'priority'),
+        ('board', 'board_id'),
+        ('assignee', 'assignee_id'),
+        ('due_date', 'due_date'),
+        ('sla_breached', 'sla_breached'),
+        ('completed_at', 'completed_at'),
+    ),
+    Comment: (
+        ('task', 'task_id'),
+        ('author', 'author_id'),
+        ('content', 'content'),
+    ),
+    Board: (
+        ('name', 'name'),
+        ('position', 'position'),
+    ),
+}
+
+TASK_FIELD_NAMES = tuple(name for name, _ in FEED_FIELDS[Task])
+
+# Marks a field that was deferred when the instance was loaded
+_DEFERRED = object()
+
+
+def take_snapshot(instance):
+    values = instance.__dict__
+    return tuple(values.get(attname, _DEFERRED) for _, attname in FEED_FIELDS[type(instance)])
+
+
+def changed_fields(instance, created, update_fields=None):
+    """Return the fields a save wrote that differ from the loaded values."""
+    current = take_snapshot(instance)
+    previous = None if created else getattr(instance, '_feed_snapshot', None)
+    changes = {}
+    for index, (name, _) in enumerate(FEED_FIELDS[type(instance)]):
+        value = current[index]
+        if value is _DEFERRED or (update_fields is not None and name not in update_fields):
+            continue
+        if previous is None or previous[index] != value:
+            changes[name] = value
+    return changes
+
+
+def location(instance):
+    """Return the ``(board_id, project_id)`` an instance's events belong to."""
+    if isinstance(instance, Board):
+        return instance.pk, instance.project_id
+    if isinstance(instance, Task):
+        return instance.board_id, task_project_id(instance)
+    task = instance._state.fields_cache.get('task')
+    if task is not None:
+        return task.board_id, task_project_id(task)
+    return Task.objects.filter(pk=instance.task_id).values_list(
+        'board_id', 'board__project_id'
+    ).first() or (None, None)
+
+
+def kind_of(sender):
+    return sender.__name__.lower()
+
+
+@receiver(post_init, sender=Task)
+@receiver(post_init, sender=Comment)
+@receiver(post_init, sender=Board)
+def snapshot_feed_fields(sender, instance, **kwargs):
+    """Remember the loaded values so saves publish only what changed."""
+    instance._feed_snapshot = take_snapshot(instance)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Board)
+def publish_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Publish the changed fields of a saved object to its project feed."""
+    if raw:
+        return
+    previous = getattr(instance, '_feed_snapshot', None)
+    changes = changed_fields(instance, created, update_fields)
+    instance._feed_snapshot = take_snapshot(instance)
+    if not changes:
+        return
+
+    board_id, project_id = location(instance)
+    kind = kind_of(sender)
+    version = instance.updated_at or timezone.now()
+    action = events.CREATED if created else events.UPDATED
+
+    if sender is Task and not created and 'board' in changes and previous is not None:
+        # Moving a task to another project's board removes it from the old feed
+        old_board_id = previous[TASK_FIELD_NAMES.index('board')]
+        old_project_id = Board.objects.filter(pk=old_board_id).values_list(
+            'project_id', flat=True
+        ).first()
+        if old_project_id != project_id:
+            events.record(old_project_id, events.make_event(
+                kind, events.DELETED, instance.pk, old_board_id, {}, version
+            ))
+            action = events.CREATED
+            changes = {
+                name: value for name, value in zip(TASK_FIELD_NAMES, instance._feed_snapshot)
+                if value is not _DEFERRED
+            }
+
+    events.record(project_id, events.make_event(kind, action, instance.pk, board_id, changes, version))
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Board)
+def publish_delete(sender, instance, **kwargs):
+    """
+    Publish the deletion of an object to its project feed.
+
+    Comments of a deleted task and tasks of a deleted board publish nothing
+    of their own: the parent's deletion event covers them.
+    """
+    if parent_deleted(instance):
+        return
+    board_id, project_id = location(instance)
+    events.record(project_id, events.make_event(
+        kind_of(sender), events.DELETED, instance.pk, board_id, {}, timezone.now()
+    ))
+
+
+@receiver(task_sla_breached)
+def publish_sla_breaches(sender, task_ids, **kwargs):
+    """Publish tasks the SLA checker flagged with a queryset update."""
+    now = timezone.now()
+    rows = Task.objects.filter(id__in=task_ids).values_list('id', 'board_id', 'board__project_id')
+    # One transaction so the events go out in a single round trip
+    with transaction.atomic():
+        for task_id, board_id, project_id in rows:
+            events.record(project_id, events.make_event(
+                'task', events.UPDATED, task_id, board_id, {'sla_breached': True}, now
+            ))
@@ -0,0 +1,247 @@
+"""Tests for the project change feed."""
+import asyncio
+
+import orjson
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import transaction
+from django.test import AsyncClient
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.feed import events, views
+from apps.feed.hub import FeedHub, Subscription
+from apps.projects.models import Project, Board
+from apps.tasks.models import Task, Comment
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cached access checks must not leak between tests reusing user ids."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(
+        username='testuser',
+        email='test@example.com',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def project(user):
+    return Project.objects.create(name='Test Project', owner=user)
+
+
+@pytest.fixture
+def board(project):
+    return Board.objects.create(name='Test Board', project=project)
+
+
+@pytest.fixture
+def published(monkeypatch):
+    """Collect published events instead of sending them to Redis."""
+    sent = []
+    monkeypatch.setattr(events, 'publish', sent.extend)
+    return sent
+
+
+@pytest.mark.django_db(transaction=True)
+class TestEventPublishing:
+    """Test saves and deletions publish compact events once committed."""
+
+    def test_task_lifecycle(self, board, user, published):
+        """Test creation, an update and deletion of a task."""
+        published.clear()
+        task = Task.objects.create(title='Task', board=board, reporter=user)
+        task.status = Task.Status.IN_PROGRESS
+        task.save()
+        task.delete()
+
+        (project_id, created), (_, updated), (_, deleted) = published
+        assert project_id == board.project_id
+        assert created['type'] == 'task.created'
+        assert created['board'] == board.id
+        assert created['fields']['title'] == 'Task'
+        assert updated['type'] == 'task.updated'
+        assert updated['fields'] == {'status': Task.Status.IN_PROGRESS}
+        assert updated['version'] == task.updated_at
+        assert deleted['type'] == 'task.deleted'
+
+    def test_transaction_is_coalesced(self, board, user, published):
+        """Test changes to one object within a transaction become one event."""
+        published.clear()
+        with transaction.atomic():
+            task = Task.objects.create(title='Task', board=board, reporter=user)
+            task.title = 'Renamed'
+            task.save()
+            Comment.objects.create(task=task, author=user, content='Hello')
+
+        assert [event['type'] for _, event in published] == ['task.created', 'comment.created']
+        assert published[0][1]['fields']['title'] == 'Renamed'
+        assert published[1][1]['board'] == board.id
+
+    def test_unchanged_save_and_rollback_publish_nothing(self, board, user, published):
+        """Test saves without feed changes and rolled back saves are not published."""
+        task = Task.objects.create(title='Task', board=board, reporter=user)
+        published.clear()
+
+        task.description = 'Not part of the feed'
+        task.save()
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Board.objects.create(name='Rolled back', project=board.project)
+                raise RuntimeError
+
+        assert published == []
+
+    def test_rolled_back_savepoint_publishes_nothing(self, board, user, published):
+        """Test events of a rolled back savepoint are dropped while the transaction commits."""
+        published.clear()
+        with transaction.atomic():
+            Task.objects.create(title='Kept', board=board, reporter=user)
+            with pytest.raises(RuntimeError):
+                with transaction.atomic():
+                    Task.objects.create(title='Rolled back', board=board, reporter=user)
+                    raise RuntimeError
+
+        assert [event['fields']['title'] for _, event in published] == ['Kept']
+
+    def test_cascade_publishes_only_the_parent(self, board, user, published, django_assert_max_num_queries):
+        """Test deleting a task does not publish or look up each of its comments."""
+        task = Task.objects.create(title='Task', board=board, reporter=user)
+        for i in range(5):
+            Comment.objects.create(task=task, author=user, content=f'Comment {i}')
+        published.clear()
+
+        with django_assert_max_num_queries(8):
+            task.delete()
+
+        assert [event['type'] for _, event in published] == ['task.deleted']
+
+    def test_board_move_between_projects(self, board, user, published):
+        """Test a task moved to another project leaves the old feed and enters the new one."""
+        other = Board.objects.create(name='Elsewhere', project=Project.objects.create(name='Other', owner=user))
+        task = Task.objects.create(title='Task', board=board, reporter=user)
+        published.clear()
+
+        task.board = other
+        task.save()
+
+        assert [(project_id, event['type']) for project_id, event in published] == [
+            (board.project_id, 'task.deleted'),
+            (other.project_id, 'task.created'),
+        ]
+
+
+class TestHub:
+    """Test fan-out of channel messages to subscriptions."""
+
+    def test_dispatch_filters_by_board_and_drops_slow_clients(self, settings):
+        settings.FEED_SUBSCRIBER_BUFFER = 2
+
+        async def scenario():
+            hub = FeedHub.__new__(FeedHub)
+            everything = Subscription(b'feed:{1}')
+            one_board = Subscription(b'feed:{1}', board_id=7)
+            hub.channels = {b'feed:{1}': {everything, one_board}}
+
+            hub.dispatch(b'feed:{1}', b'1-0 7 {"id":1}')
+            hub.dispatch(b'feed:{1}', b'2-0 8 {"id":2}')
+            hub.dispatch(b'feed:{1}', b'3-0 8 {"id":3}')
+            received = await one_board.get(timeout=1)
+            with pytest.raises(asyncio.TimeoutError):
+                await one_board.get(timeout=0.01)
+            return received, everything.closed, list(everything.pending)
+
+        received, closed, pending = asyncio.run(scenario())
+        assert received == ('1-0', b'{"id":1}')
+        assert closed
+        assert [event_id for event_id, _ in pending] == ['1-0', '2-0']
+
+
+class FakeHub:
+    """Replays a fixed stream and delivers queued live events, then closes."""
+
+    def __init__(self, stored, live, complete=True):
+        self.stored = stored
+        self.live = live
+        self.complete = complete
+        self.unsubscribed = False
+
+    async def subscribe(self, project_id, board_id=None):
+        subscription = Subscription(b'channel', board_id)
+        for event_id, data in self.live:
+            subscription.push(event_id, data)
+        subscription.close()
+        return subscription
+
+    async def unsubscribe(self, subscription):
+        self.unsubscribed = True
+
+    async def replay(self, project_id, last_event_id, board_id=None):
+        return [
+            (event_id, data) for event_id, data in self.stored if event_id > last_event_id
+        ], self.complete
+
+
+def read_stream(url, headers=None):
+    async def request():
+        response = await AsyncClient().get(url, headers=headers or {})
+        if not response.streaming:
+            return response, b''
+        return response, b''.join([chunk async for chunk in response.streaming_content])
+
+    return async_to_sync(request)()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestEventStream:
+    """Test the SSE endpoint."""
+
+    def auth(self, user):
+        return {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+
+    def test_replays_missed_events_then_streams(self, user, project, monkeypatch):
+        """Test Last-Event-ID replay followed by live events without duplicates."""
+        event = orjson.dumps({'type': 'task.updated', 'id': 1})
+        hub = FakeHub(stored=[('1-0', event), ('2-0', event)], live=[('2-0', event), ('3-0', event)])
+        monkeypatch.setattr(views, 'get_hub', lambda: hub)
+
+        response, body = read_stream(
+            reverse('project-events', args=[project.id]), {'Last-Event-ID': '1-0', **self.auth(user)}
+        )
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'text/event-stream'
+        assert body.count(b'\nid: ') + body.startswith(b'id: ') == 2
+        assert b'id: 2-0\ndata: ' + event in body
+        assert b'id: 3-0\ndata: ' + event in body
+        assert b'event: reset' not in body
+        assert hub.unsubscribed
+
+    def test_trimmed_stream_asks_for_reset(self, user, project, monkeypatch):
+        """Test clients are told to reload when their position was trimmed away."""
+        monkeypatch.setattr(views, 'get_hub', lambda: FakeHub(stored=[], live=[], complete=False))
+
+        _, body = read_stream(
+            reverse('project-events', args=[project.id]), {'Last-Event-ID': '1-0', **self.auth(user)}
+        )
+
+        assert b'event: reset\n' in body
+
+    def test_requires_authenticated_member(self, user, project, monkeypatch):
+        """Test anonymous users and non-members are rejected before subscribing."""
+        monkeypatch.setattr(views, 'get_hub', lambda: pytest.fail('subscribed'))
+        outsider = User.objects.create_user(username='outsider', email='outsider@example.com', password='x')
+        url = reverse('project-events', args=[project.id])
+
+        assert read_stream(url)[0].status_code == 401
+        assert read_stream(url, self.auth(outsider))[0].status_code == 404
@@ -0,0 +1,7 @@
+"""URL configuration for the change feed."""
+from django.urls import path
+from .views import project_events
+
+urlpatterns = [
+    path('projects/<int:project_id>/events/', project_events, name='project-events'),
+]
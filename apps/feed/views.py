@@ -0,0 +1,101 @@
+"""Server-Sent Events endpoint streaming a project's change feed."""
+import asyncio
+
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+
+from apps.projects.access import aget_project_role
+from apps.utils.async_views import aauthenticate
+from .hub import get_hub, parse_event_id
+
+
+def error_response(message, status_code):
+    return JsonResponse(
+        {'error': True, 'status_code': status_code, 'message': message}, status=status_code
+    )
+
+
+def format_event(event_id, data):
+    return b'id: ' + event_id.encode() + b'\ndata: ' + data + b'\n\n'
+
+
+RESET_EVENT = b'event: reset\ndata: {}\n\n'
+KEEPALIVE = b': keepalive\n\n'
+
+
+async def event_stream(project_id, board_id, last_event_id):
+    """
+    Yield the project's events as SSE messages.
+
+    Clients that send ``Last-Event-ID`` first get what they missed from the
+    project's stream, or a ``reset`` event asking them to reload when it no
+    longer holds their position. The stream ends after
+    ``FEED_MAX_CONNECTION_SECONDS``; browsers reconnect on their own and
+    resume from the last id they received.
+    """
+    hub = get_hub()
+    # Subscribing before the replay leaves no gap; duplicates are skipped by id
+    subscription = await hub.subscribe(project_id, board_id)
+    try:
+        yield f'retry: {settings.FEED_RETRY_MS}\n\n'.encode()
+
+        last = parse_event_id(last_event_id)
+        if last is not None:
+            replayed, complete = await hub.replay(project_id, last_event_id, board_id)
+            if not complete:
+                yield RESET_EVENT
+            for event_id, data in replayed:
+                last = parse_event_id(event_id)
+                yield format_event(event_id, data)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.FEED_MAX_CONNECTION_SECONDS
+        while True:
+            timeout = min(settings.FEED_HEARTBEAT_SECONDS, deadline - loop.time())
+            if timeout <= 0:
+                break
+            try:
+                message = await subscription.get(timeout)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing the connection while idle
+                yield KEEPALIVE
+                continue
+            if message is None:
+                break
+            event_id, data = message
+            if last is not None and parse_event_id(event_id) <= last:
+                continue
+            yield format_event(event_id, data)
+    finally:
+        await hub.unsubscribe(subscription)
+
+
+async def project_events(request, project_id):
+    """
+    Stream change events of a project to members.
+
+    ``?board=<id>`` limits the feed to one board. Needs an ASGI server:
+    under WSGI the response would be buffered forever.
+    """
+    if request.method != 'GET':
+        return error_response('Method not allowed.', 405)
+
+    board_id = request.GET.get('board')
+    if board_id is not None and not board_id.isdigit():
+        return error_response('board must be an integer.', 400)
+
+    user = await aauthenticate(request)
+    if user is None:
+        return error_response('Authentication credentials were not provided or are invalid.', 401)
+    if await aget_project_role(user, project_id) is None:
+        return error_response('Not found.', 404)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    response = StreamingHttpResponse(
+        event_stream(project_id, int(board_id) if board_id else None, last_event_id),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Stops nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1 @@
+default_app_config = 'apps.metrics.apps.MetricsConfig'
\ No newline at end of file
@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class MetricsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.metrics'
+    verbose_name = 'Metrics'
+
+    def ready(self):
+        from django.conf import settings
+        from .registry import instrument_queries, instrument_serializers
+
+        if getattr(settings, 'METRICS_ENABLED', True):
+            instrument_queries()
+            instrument_serializers()
@@ -0,0 +1,125 @@
+"""Middleware recording per-request query counts and latencies."""
+import heapq
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import registry as metrics
+
+logger = logging.getLogger(__name__)
+
+# Statements kept per request for the slow request log
+TOP_QUERIES = 5
+
+
+class RequestMetrics:
+    """Per-request counters filled in by the query wrapper and serializers."""
+
+    __slots__ = (
+        'query_count', 'db_time', 'serializer_time', 'in_serializer',
+        'cache_hits', 'cache_misses', 'slowest',
+    )
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.in_serializer = False
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.query_count += 1
+            self.db_time += duration
+            entry = (duration, self.query_count, sql)
+            if len(self.slowest) < TOP_QUERIES:
+                heapq.heappush(self.slowest, entry)
+            elif duration > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+
+class MetricsMiddleware:
+    """
+    Records latency, DB query count and time, serializer time and cache
+    hits per view into the process metric registry, and logs requests
+    slower than ``METRICS_SLOW_REQUEST_MS`` with their slowest statements.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'METRICS_ENABLED', True)
+        self.slow_threshold = getattr(settings, 'METRICS_SLOW_REQUEST_MS', 500) / 1000
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        request_metrics = RequestMetrics()
+        metrics.set_request_metrics(request_metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.set_request_metrics(None)
+        duration = time.perf_counter() - start
+
+        self.record(request, response, request_metrics, duration)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        request_metrics = RequestMetrics()
+        metrics.set_request_metrics(request_metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.set_request_metrics(None)
+        duration = time.perf_counter() - start
+
+        self.record(request, response, request_metrics, duration)
+        return response
+
+    def record(self, request, response, request_metrics, duration):
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name or match.route) if match else 'unmatched'
+        labels = (view, request.method)
+
+        with metrics.registry.lock:
+            metrics.REQUESTS.inc(labels + (str(response.status_code),))
+            metrics.REQUEST_DURATION.observe(labels, duration)
+            metrics.REQUEST_QUERIES.observe(labels, request_metrics.query_count)
+            metrics.REQUEST_DB_DURATION.observe(labels, request_metrics.db_time)
+            metrics.REQUEST_SERIALIZER_DURATION.observe(labels, request_metrics.serializer_time)
+        metrics.registry.maybe_flush()
+
+        if duration >= self.slow_threshold:
+            statements = '\n'.join(
+                f"  {seconds * 1000:.1f}ms {sql[:300]}"
+                for seconds, _, sql in sorted(request_metrics.slowest, reverse=True)
+            )
+            logger.warning(
+                f"Slow request {request.method} {request.path} ({view}): "
+                f"{duration * 1000:.0f}ms total, {request_metrics.query_count} queries "
+                f"in {request_metrics.db_time * 1000:.0f}ms, serializers "
+                f"{request_metrics.serializer_time * 1000:.0f}ms, cache "
+                f"{request_metrics.cache_hits} hits/{request_metrics.cache_misses} misses\n"
+                f"{statements}"
+            )
@@ -0,0 +1,336 @@
+"""In-process metric registry with Prometheus text export.
+
+Each worker process keeps plain counters and fixed-bucket histograms in
+memory. When ``METRICS_DIR`` is set, processes periodically write a snapshot
+to ``metrics_<pid>_<start>.json`` in that directory and a scrape merges every
+file, so totals cover all gunicorn workers. The start time keeps a worker
+that reuses the pid of an exited one from overwriting its file. Files of
+exited workers are kept so counters stay monotonic, the same trade-off
+prometheus_client makes in its multiprocess mode.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+
+from asgiref.local import Local
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Seconds between snapshot writes of a worker process
+FLUSH_INTERVAL = 5.0
+
+
+class Counter:
+    """Monotonic counter keyed by a tuple of label values."""
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def inc(self, labels, amount=1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dump(self):
+        return [[list(labels), value] for labels, value in self.values.items()]
+
+    def merge(self, values, dumped):
+        for labels, value in dumped:
+            labels = tuple(labels)
+            values[labels] = values.get(labels, 0) + value
+
+    def render(self, values):
+        lines = []
+        for labels, value in sorted(values.items()):
+            lines.append(f'{self.name}{_labels(self.labelnames, labels)} {_number(value)}')
+        return lines
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram keyed by a tuple of label values.
+
+    Buckets are stored non-cumulatively as ``[b0, ..., bN, +Inf, sum, count]``
+    so an observation is one bisect and three additions.
+    """
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.values = {}
+
+    def observe(self, labels, value):
+        row = self.values.get(labels)
+        if row is None:
+            row = self.values[labels] = [0] * (len(self.buckets) + 3)
+        row[bisect_left(self.buckets, value)] += 1
+        row[-2] += value
+        row[-1] += 1
+
+    def dump(self):
+        return [[list(labels), row] for labels, row in self.values.items()]
+
+    def merge(self, values, dumped):
+        for labels, row in dumped:
+            labels = tuple(labels)
+            current = values.get(labels)
+            if current is None:
+                values[labels] = list(row)
+            else:
+                values[labels] = [a + b for a, b in zip(current, row)]
+
+    def render(self, values):
+        lines = []
+        for labels, row in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), row):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else _number(bound)
+                lines.append(
+                    f'{self.name}_bucket'
+                    f'{_labels(self.labelnames + ("le",), labels + (le,))} {_number(cumulative)}'
+                )
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, labels)} {_number(row[-2])}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, labels)} {_number(row[-1])}')
+        return lines
+
+
+class Registry:
+    """The metrics of this process plus snapshot merging across processes."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+        self._last_flush = 0.0
+        self._pid = None
+        self._file_key = None
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self):
+        with self.lock:
+            return {name: metric.dump() for name, metric in self.metrics.items()}
+
+    def directory(self):
+        path = getattr(settings, 'METRICS_DIR', '')
+        return Path(path) if path else None
+
+    def maybe_flush(self):
+        """Write this process's snapshot if the flush interval has passed."""
+        now = time.monotonic()
+        if now - self._last_flush >= FLUSH_INTERVAL:
+            self._last_flush = now
+            self.flush()
+
+    def flush(self):
+        directory = self.directory()
+        if directory is None:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        key = self.file_key()
+        path = directory / f'metrics_{key}.json'
+        tmp_path = directory / f'.metrics_{key}.json.tmp'
+        tmp_path.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp_path, path)
+
+    def file_key(self):
+        """Return ``<pid>_<start>``, taken afresh in every forked process."""
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid = pid
+            self._file_key = f'{pid}_{time.time_ns()}'
+        return self._file_key
+
+    def collect(self):
+        """Merge the snapshots of every worker process."""
+        directory = self.directory()
+        if directory is None:
+            snapshots = [self.snapshot()]
+        else:
+            self.flush()
+            snapshots = []
+            for path in directory.glob('metrics_*.json'):
+                try:
+                    snapshots.append(json.loads(path.read_text()))
+                except (OSError, ValueError):
+                    continue
+
+        merged = {name: {} for name in self.metrics}
+        for snapshot in snapshots:
+            for name, dumped in snapshot.items():
+                if name in self.metrics:
+                    self.metrics[name].merge(merged[name], dumped)
+        return merged
+
+    def render(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, values in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            lines.extend(metric.render(values))
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _number(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+registry = Registry()
+
+REQUESTS = registry.register(Counter(
+    'taskapi_requests_total',
+    'HTTP requests by view, method and status code.',
+    ['view', 'method', 'status'],
+))
+REQUEST_DURATION = registry.register(Histogram(
+    'taskapi_request_duration_seconds',
+    'Request latency by view.',
+    ['view', 'method'],
+    LATENCY_BUCKETS,
+))
+REQUEST_QUERIES = registry.register(Histogram(
+    'taskapi_request_db_queries',
+    'Database queries executed per request.',
+    ['view', 'method'],
+    QUERY_COUNT_BUCKETS,
+))
+REQUEST_DB_DURATION = registry.register(Histogram(
+    'taskapi_request_db_duration_seconds',
+    'Time spent in database queries per request.',
+    ['view', 'method'],
+    LATENCY_BUCKETS,
+))
+REQUEST_SERIALIZER_DURATION = registry.register(Histogram(
+    'taskapi_request_serializer_duration_seconds',
+    'Time spent building serializer output per request.',
+    ['view', 'method'],
+    LATENCY_BUCKETS,
+))
+CACHE_REQUESTS = registry.register(Counter(
+    'taskapi_cache_requests_total',
+    'Application cache lookups by cache and result.',
+    ['cache', 'result'],
+))
+
+
+# Context-local, so sync_to_async threads of async views see their request
+_local = Local()
+
+
+def current_request_metrics():
+    """Return the metrics collector of the request being served."""
+    return getattr(_local, 'request_metrics', None)
+
+
+def set_request_metrics(request_metrics):
+    _local.request_metrics = request_metrics
+
+
+def record_cache(cache_name, hit):
+    """Count a cache hit or miss, globally and for the current request."""
+    with registry.lock:
+        CACHE_REQUESTS.inc((cache_name, 'hit' if hit else 'miss'))
+    request_metrics = current_request_metrics()
+    if request_metrics is not None:
+        if hit:
+            request_metrics.cache_hits += 1
+        else:
+            request_metrics.cache_misses += 1
+
+
+def _count_query(execute, sql, params, many, context):
+    request_metrics = current_request_metrics()
+    if request_metrics is None:
+        return execute(sql, params, many, context)
+    return request_metrics(execute, sql, params, many, context)
+
+
+def _install_query_counter(sender, connection, **kwargs):
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+def instrument_queries():
+    """
+    Count and time queries against the metrics of the current request.
+
+    The wrapper is installed on every connection as it is opened instead of
+    around each request, because async views run their queries on
+    connections of other threads.
+    """
+    connection_created.connect(_install_query_counter, dispatch_uid='metrics_query_counter')
+
+
+def instrument_serializers():
+    """
+    Time top-level ``Serializer.data``/``ListSerializer.data`` evaluation.
+
+    Nested serializers go through ``to_representation`` rather than
+    ``.data``, so only the outermost serialization of a response is timed.
+    """
+    from rest_framework import serializers
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        prop = cls.__dict__['data']
+        if getattr(prop.fget, '_metrics_timed', False):
+            continue
+        cls.data = property(_timed(prop.fget))
+
+
+@contextmanager
+def timed_serialization():
+    """
+    Count the enclosed block as serializer time of the current request.
+
+    Used by the instrumented ``.data`` properties and by compiled list
+    serialization (``apps.utils.fast_serializers``), which bypasses them.
+    """
+    request_metrics = current_request_metrics()
+    if request_metrics is None or request_metrics.in_serializer:
+        yield
+        return
+    request_metrics.in_serializer = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        request_metrics.serializer_time += time.perf_counter() - start
+        request_metrics.in_serializer = False
+
+
+def _timed(fget):
+    def data(self):
+        with timed_serialization():
+            return fget(self)
+
+    data._metrics_timed = True
+    return data
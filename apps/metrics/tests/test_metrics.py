@@ -0,0 +1,104 @@
+"""Tests for request metrics."""
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from apps.metrics.registry import Histogram
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cached responses must not leak between tests reusing user ids."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(
+        username='testuser',
+        email='test@example.com',
+        password='testpass123'
+    )
+
+
+class TestHistogram:
+    """Test histogram rendering."""
+
+    def test_buckets_are_cumulative(self):
+        """Test rendered buckets accumulate lower buckets."""
+        histogram = Histogram('latency', 'Latency.', ['view'], (0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 5.0):
+            histogram.observe(('task-list',), value)
+
+        lines = histogram.render(histogram.values)
+
+        assert 'latency_bucket{view="task-list",le="0.1"} 1' in lines
+        assert 'latency_bucket{view="task-list",le="1"} 3' in lines
+        assert 'latency_bucket{view="task-list",le="+Inf"} 4' in lines
+        assert 'latency_count{view="task-list"} 4' in lines
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    """Test the Prometheus endpoint."""
+
+    def test_requests_are_recorded_per_view(self, api_client, user, settings, tmp_path):
+        """Test query counts and cache lookups show up in the export."""
+        settings.METRICS_TOKEN = 'secret'
+        settings.METRICS_DIR = str(tmp_path)
+        api_client.force_authenticate(user=user)
+        api_client.get(reverse('task-list'))
+
+        response = api_client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+
+        body = response.content.decode()
+        assert response.status_code == 200
+        assert 'taskapi_request_db_queries_count{view="task-list",method="GET"}' in body
+        assert 'taskapi_cache_requests_total{cache="project_access"' in body
+        assert list(tmp_path.glob('metrics_*.json'))
+
+    def test_token_is_required(self, api_client, settings):
+        """Test scrapes without the configured token are refused."""
+        settings.METRICS_TOKEN = 'secret'
+
+        response = api_client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong')
+
+        assert response.status_code == 403
+
+    def test_compiled_lists_count_serializer_time(self, user):
+        """Test lists served by compiled plans report their serialization time."""
+        from apps.metrics import registry
+        from apps.metrics.middleware import RequestMetrics
+        from apps.tasks.serializers import TaskSerializer
+        from apps.tasks.models import Task
+        from apps.utils.fast_serializers import compile_serializer
+
+        plan = compile_serializer(TaskSerializer())
+        request_metrics = RequestMetrics()
+        registry.set_request_metrics(request_metrics)
+        try:
+            plan.serialize(list(Task.objects.values(*plan.attnames)), {})
+        finally:
+            registry.set_request_metrics(None)
+
+        assert request_metrics.serializer_time > 0
+
+    def test_workers_reusing_a_pid_keep_separate_files(self, settings, tmp_path):
+        """Test a new process with a recycled pid does not overwrite the old snapshot."""
+        from apps.metrics.registry import Registry
+
+        settings.METRICS_DIR = str(tmp_path)
+        Registry().flush()
+        Registry().flush()
+
+        assert len(list(tmp_path.glob('metrics_*.json'))) == 2
@@ -0,0 +1,139 @@
+"""Rendering and sending of notification digests."""
+import logging
+
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage, get_connection
+
+from apps.tasks.models import Task
+from . import outbox
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+def render_assignment_email(task, user):
+    """Return the subject and body of a task assignment email."""
+    subject = f'New Task Assigned: {task.title}'
+    message = f"""
+        Hello {user.get_full_name() or user.username},
+
+        You have been assigned a new task:
+
+        Task: {task.title}
+        Project: {task.board.project.name}
+        Board: {task.board.name}
+        Priority: {task.get_priority_display()}
+        Reporter: {task.reporter.get_full_name() or task.reporter.username}
+
+        {'Due Date: ' + task.due_date.strftime('%Y-%m-%d %H:%M') if task.due_date else ''}
+
+        Description:
+        {task.description}
+
+        Please check the task management system for more details.
+        """
+    return subject, message
+
+
+def render_assignment_digest(tasks, user):
+    """Return the subject and body of an email listing several assigned tasks."""
+    limit = settings.NOTIFICATION_DIGEST_LIMIT
+    lines = [
+        f"- {task.title} ({task.board.project.name} / {task.board.name}, "
+        f"{task.get_priority_display()}"
+        f"{', due ' + task.due_date.strftime('%Y-%m-%d') if task.due_date else ''})"
+        for task in tasks[:limit]
+    ]
+    if len(tasks) > limit:
+        lines.append(f"- ...and {len(tasks) - limit} more")
+
+    subject = f'You were assigned {len(tasks)} tasks'
+    message = f"""
+        Hello {user.get_full_name() or user.username},
+
+        You have been assigned {len(tasks)} tasks:
+
+        {chr(10).join(lines)}
+
+        Please check the task management system for more details.
+        """
+    return subject, message
+
+
+def message_id(digest_key):
+    """
+    A Message-ID derived from the digest key, identical on every retry.
+
+    It lets receivers recognise a resent digest but does not prevent one.
+    """
+    domain = settings.EMAIL_HOST_USER.rpartition('@')[2] or 'localhost'
+    return f'<notification-{digest_key}@{domain}>'
+
+
+def build_message(digest_key, user, tasks):
+    if len(tasks) == 1:
+        subject, body = render_assignment_email(tasks[0], user)
+    else:
+        subject, body = render_assignment_digest(tasks, user)
+    return EmailMessage(
+        subject, body, settings.EMAIL_HOST_USER, [user.email],
+        headers={'Message-ID': message_id(digest_key)},
+    )
+
+
+def send_digests(digests):
+    """
+    Send claimed digests over one mail connection.
+
+    A digest lists the tasks still assigned to its recipient, each once;
+    notifications for tasks reassigned since are skipped. Each digest is
+    marked as sending before it is handed over, so delivery is at-least-once
+    (see ``apps.notifications.outbox``). Returns the number of emails sent.
+    """
+    notifications = [n for group in digests.values() for n in group]
+    tasks = Task.objects.select_related('board__project', 'reporter').in_bulk(
+        {n.task_id for n in notifications}
+    )
+    users = User.objects.filter(
+        id__in={n.recipient_id for n in notifications}, is_active=True
+    ).only('id', 'email', 'username', 'first_name', 'last_name').in_bulk()
+
+    sent = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+        for digest_key, group in digests.items():
+            user = users.get(group[0].recipient_id)
+            if user is None or not user.email:
+                outbox.skip(digest_key)
+                continue
+
+            assigned, skipped_ids = {}, []
+            for notification in group:
+                task = tasks.get(notification.task_id)
+                if task is None or task.assignee_id != user.id or task.id in assigned:
+                    skipped_ids.append(notification.id)
+                else:
+                    assigned[task.id] = task
+            if not assigned:
+                outbox.skip(digest_key)
+                continue
+
+            outbox.start(digest_key, skipped_ids)
+            try:
+                connection.send_messages([build_message(digest_key, user, list(assigned.values()))])
+            except SoftTimeLimitExceeded:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to send notification digest to {user.email}: {str(e)}")
+                outbox.release(digest_key)
+                continue
+            outbox.complete(digest_key)
+            sent += 1
+    finally:
+        connection.close()
+
+    return sent
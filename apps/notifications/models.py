@@ -0,0 +1,60 @@
+"""Outbox of user notifications waiting to be sent."""
+from django.db import models
+from django.conf import settings
+
+
+class Notification(models.Model):
+    """
+    A notification written in the transaction of the change it reports.
+
+    The dispatcher claims pending notifications per recipient under a
+    ``digest_key`` and sends each claimed group as one email, so a retried
+    digest reuses its key instead of forming a new one.
+    """
+
+    class Kind(models.TextChoices):
+        TASK_ASSIGNED = 'TASK_ASSIGNED', 'Task assigned'
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        # Handed to the mail server; may have been delivered if never completed
+        SENDING = 'SENDING', 'Sending'
+        SENT = 'SENT', 'Sent'
+        # Outdated by the time it was dispatched, e.g. the task was reassigned
+        SKIPPED = 'SKIPPED', 'Skipped'
+        FAILED = 'FAILED', 'Failed'
+
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='notifications'
+    )
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    task = models.ForeignKey(
+        'tasks.Task',
+        on_delete=models.CASCADE,
+        related_name='notifications'
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+    # Key of the digest this notification was claimed for, kept across retries
+    digest_key = models.CharField(max_length=32, blank=True, default='')
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'notification_outbox'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'recipient']),
+            models.Index(fields=['digest_key']),
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} for {self.recipient_id} ({self.status})"
@@ -0,0 +1,124 @@
+"""
+Transactional outbox of notifications.
+
+Changes that notify someone write a ``Notification`` row in their own
+transaction, so a notification exists exactly when its change committed and
+the request never talks to the broker. ``dispatch_notifications`` then
+claims pending rows per recipient and sends each group as one digest.
+
+Delivery is at-least-once. A digest is marked ``SENDING`` before it is handed
+to the mail server and ``SENT`` afterwards; if the worker dies in between,
+the digest is claimed again once its claim expires and resent under the same
+key. The repeated Message-ID lets mail servers and clients drop the copy,
+but nothing guarantees they do.
+"""
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Notification
+
+UNFINISHED = [Notification.Status.PENDING, Notification.Status.SENDING]
+
+
+def record_assignments(assignments):
+    """
+    Queue assignment notifications for ``(task_id, user_id)`` pairs.
+
+    Call inside the transaction that assigns the tasks.
+    """
+    Notification.objects.bulk_create([
+        Notification(kind=Notification.Kind.TASK_ASSIGNED, task_id=task_id, recipient_id=user_id)
+        for task_id, user_id in assignments
+    ])
+
+
+def claimable():
+    expired = timezone.now() - timedelta(seconds=settings.NOTIFICATION_CLAIM_TIMEOUT)
+    return Notification.objects.filter(
+        Q(status=Notification.Status.PENDING, claimed_at__isnull=True)
+        | Q(status__in=UNFINISHED, claimed_at__lt=expired)
+    )
+
+
+def claim(limit):
+    """
+    Claim the pending notifications of up to ``limit`` recipients.
+
+    Returns ``{digest_key: [notification, ...]}`` with one new digest per
+    recipient. Notifications whose claim expired keep their digest key, so a
+    digest that may have reached the mail server before its worker died is
+    resent under the same key, and with it the same Message-ID. Such an
+    interrupted send counts as an attempt.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        recipient_ids = list(
+            claimable().order_by('recipient_id')
+            .values_list('recipient_id', flat=True).distinct()[:limit]
+        )
+        if not recipient_ids:
+            return {}
+
+        notifications = list(
+            claimable().filter(recipient_id__in=recipient_ids)
+            .select_for_update(skip_locked=True).order_by('id')
+        )
+        digests = defaultdict(list)
+        new_keys = {}
+        for notification in notifications:
+            if not notification.digest_key:
+                notification.digest_key = new_keys.setdefault(
+                    notification.recipient_id, uuid.uuid4().hex
+                )
+            if notification.status == Notification.Status.SENDING:
+                notification.status = Notification.Status.PENDING
+                notification.attempts += 1
+            notification.claimed_at = now
+            digests[notification.digest_key].append(notification)
+        Notification.objects.bulk_update(
+            notifications, ['digest_key', 'claimed_at', 'status', 'attempts']
+        )
+
+    return dict(digests)
+
+
+def start(digest_key, skipped_ids=()):
+    """Mark a digest as being sent, except for the notifications it leaves out."""
+    pending = Notification.objects.filter(digest_key=digest_key, status=Notification.Status.PENDING)
+    if skipped_ids:
+        pending.filter(id__in=skipped_ids).update(status=Notification.Status.SKIPPED)
+    pending.exclude(id__in=skipped_ids).update(status=Notification.Status.SENDING)
+
+
+def complete(digest_key):
+    """Mark a digest handed to the mail server as sent."""
+    Notification.objects.filter(
+        digest_key=digest_key, status=Notification.Status.SENDING
+    ).update(status=Notification.Status.SENT, sent_at=timezone.now())
+
+
+def skip(digest_key):
+    Notification.objects.filter(
+        digest_key=digest_key, status=Notification.Status.PENDING
+    ).update(status=Notification.Status.SKIPPED)
+
+
+def release(digest_key):
+    """
+    Count a failed send. The digest stays claimed and is retried once its
+    claim expires, or given up after ``NOTIFICATION_MAX_ATTEMPTS``.
+    """
+    Notification.objects.filter(
+        digest_key=digest_key, status=Notification.Status.SENDING
+    ).update(status=Notification.Status.PENDING)
+    pending = Notification.objects.filter(digest_key=digest_key, status=Notification.Status.PENDING)
+    pending.update(attempts=F('attempts') + 1)
+    pending.filter(attempts__gte=settings.NOTIFICATION_MAX_ATTEMPTS).update(
+        status=Notification.Status.FAILED
+    )
@@ -0,0 +1,46 @@
+"""Celery tasks sending notifications from the outbox."""
+from celery import shared_task
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+from django.utils import timezone
+from datetime import timedelta
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def dispatch_notifications():
+    """Send pending notifications as one digest email per recipient."""
+    from .digest import send_digests
+    from .outbox import claim
+
+    sent = 0
+    try:
+        while True:
+            digests = claim(settings.NOTIFICATION_BATCH_SIZE)
+            if not digests:
+                break
+            sent += send_digests(digests)
+    except SoftTimeLimitExceeded:
+        # Claimed digests not sent yet are retried under their keys
+        logger.warning("Notification dispatch hit its time limit")
+
+    if sent:
+        logger.info(f"Sent {sent} notification digests")
+
+    return sent
+
+
+@shared_task
+def purge_notifications():
+    """Delete notifications finished more than NOTIFICATION_RETENTION_DAYS ago."""
+    from .models import Notification
+
+    cutoff = timezone.now() - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+    deleted, _ = Notification.objects.filter(created_at__lt=cutoff).exclude(
+        status__in=[Notification.Status.PENDING, Notification.Status.SENDING]
+    ).delete()
+    logger.info(f"Purged {deleted} notifications")
+
+    return deleted
@@ -0,0 +1,241 @@
+"""Tests for the notification outbox and digest dispatch."""
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from apps.notifications import digest, outbox
+from apps.notifications.models import Notification
+from apps.notifications.tasks import dispatch_notifications, purge_notifications
+from apps.projects.models import Project, Board
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cached project access must not leak between tests reusing user ids."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(
+        username='testuser',
+        email='test@example.com',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def other_user(db):
+    return User.objects.create_user(
+        username='other',
+        email='other@example.com',
+        password='otherpass123'
+    )
+
+
+@pytest.fixture
+def board(user):
+    project = Project.objects.create(name='Test Project', owner=user)
+    return Board.objects.create(name='Test Board', project=project)
+
+
+@pytest.fixture
+def tasks(board, user):
+    return [
+        Task.objects.create(title=f'Task {i}', board=board, reporter=user)
+        for i in range(4)
+    ]
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Count the mail connections dispatch opens."""
+    opened = []
+    get_connection = digest.get_connection
+
+    def counting(**kwargs):
+        opened.append(kwargs)
+        return get_connection(**kwargs)
+
+    monkeypatch.setattr(digest, 'get_connection', counting)
+    return opened
+
+
+def assign(api_client, task, assignee):
+    return api_client.post(reverse('task-assign', kwargs={'pk': task.id}), {'assignee_id': assignee.id})
+
+
+@pytest.mark.django_db
+class TestOutbox:
+    """Test assignments are written to the outbox with the change."""
+
+    def test_assignment_writes_outbox_row_instead_of_sending(self, api_client, user, other_user, tasks, mailoutbox):
+        api_client.force_authenticate(user=user)
+
+        response = assign(api_client, tasks[0], other_user)
+
+        assert response.status_code == status.HTTP_200_OK
+        notification = Notification.objects.get()
+        assert (notification.recipient, notification.task) == (other_user, tasks[0])
+        assert notification.status == Notification.Status.PENDING
+        assert mailoutbox == []
+
+    def test_rolled_back_assignment_leaves_no_notification(self, user, other_user, tasks):
+        from apps.notifications.outbox import record_assignments
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Task.objects.filter(pk=tasks[0].pk).update(assignee=other_user)
+                record_assignments([(tasks[0].id, other_user.id)])
+                raise RuntimeError
+
+        assert not Notification.objects.exists()
+
+    def test_bulk_assignments_are_recorded(self, api_client, user, other_user, tasks):
+        api_client.force_authenticate(user=user)
+        operations = [{'op': 'assign', 'id': task.id, 'assignee_id': other_user.id} for task in tasks]
+
+        response = api_client.post(reverse('task-bulk'), {'operations': operations}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert Notification.objects.filter(recipient=other_user).count() == 4
+
+
+@pytest.mark.django_db
+class TestDispatch:
+    """Test digests are coalesced per recipient and sent once."""
+
+    def test_one_digest_per_recipient_over_one_connection(
+        self, api_client, user, other_user, tasks, mailoutbox, connections
+    ):
+        api_client.force_authenticate(user=user)
+        for task in tasks[:3]:
+            assign(api_client, task, other_user)
+        assign(api_client, tasks[3], user)
+
+        assert dispatch_notifications() == 2
+
+        assert len(connections) == 1
+        digest_mail = next(m for m in mailoutbox if m.to == [other_user.email])
+        assert digest_mail.subject == 'You were assigned 3 tasks'
+        assert all(f'- Task {i} (Test Project / Test Board' in digest_mail.body for i in range(3))
+        single = next(m for m in mailoutbox if m.to == [user.email])
+        assert single.subject == 'New Task Assigned: Task 3'
+        assert set(Notification.objects.values_list('status', flat=True)) == {Notification.Status.SENT}
+
+    def test_reassigned_and_repeated_assignments_are_coalesced(
+        self, api_client, user, other_user, tasks, mailoutbox
+    ):
+        api_client.force_authenticate(user=user)
+        assign(api_client, tasks[0], other_user)
+        assign(api_client, tasks[0], user)
+        assign(api_client, tasks[0], other_user)
+        assign(api_client, tasks[1], user)
+        assign(api_client, tasks[1], other_user)
+
+        assert dispatch_notifications() == 1
+
+        assert [m.to for m in mailoutbox] == [[other_user.email]]
+        assert mailoutbox[0].subject == 'You were assigned 2 tasks'
+        assert Notification.objects.filter(status=Notification.Status.SKIPPED).count() == 3
+
+    def test_redispatch_never_sends_twice(self, api_client, user, other_user, tasks, mailoutbox):
+        api_client.force_authenticate(user=user)
+        assign(api_client, tasks[0], other_user)
+
+        assert dispatch_notifications() == 1
+        assert dispatch_notifications() == 0
+        assert len(mailoutbox) == 1
+
+    def test_failed_digest_is_retried_under_the_same_key(
+        self, api_client, user, other_user, tasks, mailoutbox, monkeypatch, settings
+    ):
+        settings.NOTIFICATION_MAX_ATTEMPTS = 2
+        send_messages = EmailBackend.send_messages
+        failures = [1]
+
+        def flaky(backend, messages):
+            if failures:
+                failures.pop()
+                raise ConnectionError('SMTP unavailable')
+            return send_messages(backend, messages)
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', flaky)
+        api_client.force_authenticate(user=user)
+        assign(api_client, tasks[0], other_user)
+
+        assert dispatch_notifications() == 0
+        notification = Notification.objects.get()
+        assert (notification.status, notification.attempts) == (Notification.Status.PENDING, 1)
+
+        # Not retried while the failed claim is fresh
+        assign(api_client, tasks[1], other_user)
+        assert dispatch_notifications() == 1
+        assert mailoutbox[0].subject == 'New Task Assigned: Task 1'
+
+        Notification.objects.update(claimed_at=timezone.now() - timedelta(hours=1))
+        assert dispatch_notifications() == 1
+        assert mailoutbox[1].subject == 'New Task Assigned: Task 0'
+        assert mailoutbox[1].extra_headers['Message-ID'] == digest.message_id(notification.digest_key)
+
+    def test_interrupted_digest_is_resent_under_the_same_key(
+        self, api_client, user, other_user, tasks, mailoutbox
+    ):
+        api_client.force_authenticate(user=user)
+        assign(api_client, tasks[0], other_user)
+
+        # The worker dies after handing the digest over, before completing it
+        (digest_key,) = outbox.claim(10)
+        outbox.start(digest_key)
+        assert Notification.objects.get().status == Notification.Status.SENDING
+        assert dispatch_notifications() == 0
+
+        Notification.objects.update(claimed_at=timezone.now() - timedelta(hours=1))
+        assert dispatch_notifications() == 1
+        notification = Notification.objects.get()
+        assert (notification.status, notification.attempts) == (Notification.Status.SENT, 1)
+        assert mailoutbox[0].extra_headers['Message-ID'] == digest.message_id(digest_key)
+
+    def test_digest_is_given_up_after_max_attempts(
+        self, api_client, user, other_user, tasks, monkeypatch, settings
+    ):
+        settings.NOTIFICATION_MAX_ATTEMPTS = 1
+
+        def broken(backend, messages):
+            raise ConnectionError('SMTP unavailable')
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', broken)
+        api_client.force_authenticate(user=user)
+        assign(api_client, tasks[0], other_user)
+
+        assert dispatch_notifications() == 0
+        assert Notification.objects.get().status == Notification.Status.FAILED
+
+    def test_purge_keeps_pending_notifications(self, user, tasks, settings):
+        settings.NOTIFICATION_RETENTION_DAYS = 7
+        old = timezone.now() - timedelta(days=8)
+        for status_ in (Notification.Status.SENT, Notification.Status.PENDING):
+            Notification.objects.create(
+                recipient=user, task=tasks[0], kind=Notification.Kind.TASK_ASSIGNED, status=status_
+            )
+        Notification.objects.update(created_at=old)
+
+        assert purge_notifications() == 1
+        assert Notification.objects.get().status == Notification.Status.PENDING
@@ -0,0 +1,184 @@
+"""Resolution of the projects a user can access."""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Project, ProjectMember
+from apps.metrics.registry import record_cache
+from apps.utils import async_cache
+
+ACCESS_CACHE_TIMEOUT = 60 * 15
+
+# Role reported for the project owner, who has no ProjectMember row
+OWNER_ROLE = 'OWNER'
+
+# Cached for users without access, since the cache cannot store None
+NO_ROLE = ''
+
+
+def _version_key(user_id):
+    return f'project_access:version:{user_id}'
+
+
+def _ids_key(user_id, version):
+    return f'project_access:ids:{user_id}:{version}'
+
+
+def _role_key(user_id, version, project_id):
+    return f'project_access:role:{user_id}:{version}:{project_id}'
+
+
+def _new_version():
+    # Seeding from the clock keeps a lost version key from resurrecting ids
+    # cached under an older version.
+    return int(time.time() * 1000)
+
+
+def get_membership_version(user_id):
+    """Return the current membership version for a user."""
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def get_accessible_project_ids(user):
+    """
+    Return the sorted ids of projects the user owns or is a member of.
+
+    The set is cached per user and membership version, so list endpoints can
+    filter with a plain ``IN (...)`` predicate instead of an OR join that
+    needs a DISTINCT.
+    """
+    version = get_membership_version(user.pk)
+    key = _ids_key(user.pk, version)
+    project_ids = cache.get(key)
+    record_cache('project_access', project_ids is not None)
+
+    if project_ids is None:
+        project_ids = sorted(set(_accessible_project_ids_query(user)))
+        cache.set(key, project_ids, ACCESS_CACHE_TIMEOUT)
+
+    return project_ids
+
+
+def get_project_role(user, project_id, owner_id=None, request=None):
+    """
+    Return the user's role in a project: ``OWNER_ROLE``, a
+    ``ProjectMember.Role`` value, or ``None`` without access.
+
+    Roles are memoized on ``request`` and cached per user under the
+    membership version, which membership and ownership changes bump, so a
+    warm check costs no queries. Passing a known ``owner_id`` answers owner
+    checks without touching the cache.
+    """
+    if owner_id is not None and owner_id == user.pk:
+        return OWNER_ROLE
+
+    memo = None
+    if request is not None:
+        memo = request.__dict__.setdefault('_project_roles', {})
+        if project_id in memo:
+            return memo[project_id]
+
+    key = _role_key(user.pk, get_membership_version(user.pk), project_id)
+    role = cache.get(key)
+    record_cache('project_role', role is not None)
+
+    if role is None:
+        role = ProjectMember.objects.filter(
+            project_id=project_id, user_id=user.pk
+        ).values_list('role', flat=True).first()
+        if role is None:
+            if owner_id is None:
+                owner_id = Project.objects.filter(pk=project_id).values_list(
+                    'owner_id', flat=True
+                ).first()
+            role = OWNER_ROLE if owner_id == user.pk else NO_ROLE
+        cache.set(key, role, ACCESS_CACHE_TIMEOUT)
+
+    role = role or None
+    if memo is not None:
+        memo[project_id] = role
+    return role
+
+
+async def aget_membership_version(user_id):
+    """Async variant of ``get_membership_version``."""
+    key = _version_key(user_id)
+    version = await async_cache.aget(key)
+    if version is None:
+        await async_cache.aadd(key, _new_version(), None)
+        version = await async_cache.aget(key)
+    return version
+
+
+def _accessible_project_ids_query(user):
+    owned = Project.objects.filter(owner_id=user.pk).order_by().values_list('id', flat=True)
+    joined = ProjectMember.objects.filter(user_id=user.pk).order_by().values_list(
+        'project_id', flat=True
+    )
+    return owned.union(joined)
+
+
+async def aget_accessible_project_ids(user):
+    """Async variant of ``get_accessible_project_ids`` sharing its cache entries."""
+    version = await aget_membership_version(user.pk)
+    key = _ids_key(user.pk, version)
+    project_ids = await async_cache.aget(key)
+    record_cache('project_access', project_ids is not None)
+
+    if project_ids is None:
+        project_ids = sorted({pid async for pid in _accessible_project_ids_query(user)})
+        await async_cache.aset(key, project_ids, ACCESS_CACHE_TIMEOUT)
+
+    return project_ids
+
+
+async def aget_project_role(user, project_id, owner_id=None):
+    """Async variant of ``get_project_role`` sharing its cache entries."""
+    if owner_id is not None and owner_id == user.pk:
+        return OWNER_ROLE
+
+    key = _role_key(user.pk, await aget_membership_version(user.pk), project_id)
+    role = await async_cache.aget(key)
+    record_cache('project_role', role is not None)
+
+    if role is None:
+        role = await ProjectMember.objects.filter(
+            project_id=project_id, user_id=user.pk
+        ).values_list('role', flat=True).afirst()
+        if role is None:
+            if owner_id is None:
+                owner_id = await Project.objects.filter(pk=project_id).values_list(
+                    'owner_id', flat=True
+                ).afirst()
+            role = OWNER_ROLE if owner_id == user.pk else NO_ROLE
+        await async_cache.aset(key, role, ACCESS_CACHE_TIMEOUT)
+
+    return role or None
+
+
+def invalidate_project_access(*user_ids):
+    """
+    Bump the membership version of the given users once the write commits.
+
+    Bumping earlier would let a concurrent request read the old, still
+    committed membership and cache it under the new version, where it would
+    stay until ``ACCESS_CACHE_TIMEOUT``.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if user_ids:
+        transaction.on_commit(lambda: _bump_versions(user_ids))
+
+
+def _bump_versions(user_ids):
+    for user_id in user_ids:
+        key = _version_key(user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), None)
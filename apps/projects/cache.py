@@ -0,0 +1,39 @@
+"""Project-scoped generations for the response cache."""
+from django.db import transaction
+
+from apps.utils.response_cache import ResponseCacheMixin, aget_cached_response, bump_generations
+from .access import aget_accessible_project_ids, get_accessible_project_ids
+
+# Bumped with every project generation; admin responses span all projects
+ALL_PROJECTS = 'projects'
+
+
+def project_generation(project_id):
+    return f'project:{project_id}'
+
+
+def bump_project_generations(*project_ids):
+    """Invalidate cached responses of the given projects once the write commits."""
+    names = [project_generation(pid) for pid in set(project_ids) if pid is not None]
+    if names:
+        transaction.on_commit(lambda: bump_generations(ALL_PROJECTS, *names))
+
+
+async def aget_cached_project_response(request, basename, action):
+    """Async lookup of a response cached by a ``ProjectResponseCacheMixin`` view."""
+    user = request.user
+    if user.is_admin:
+        generations = [ALL_PROJECTS]
+    else:
+        generations = [project_generation(pid) for pid in await aget_accessible_project_ids(user)]
+    return await aget_cached_response(request, basename, action, generations)
+
+
+class ProjectResponseCacheMixin(ResponseCacheMixin):
+    """Cache responses that only contain data of projects the user can access."""
+
+    def get_cache_generations(self):
+        user = self.request.user
+        if user.is_admin:
+            return [ALL_PROJECTS]
+        return [project_generation(pid) for pid in get_accessible_project_ids(user)]
@@ -1,53 +1,63 @@
 """Custom permissions for project access control."""
 from rest_framework import permissions
-from .models import ProjectMember
+from .access import OWNER_ROLE, get_project_role
+from .models import Project, ProjectMember
+
+
+def resolve_project(obj):
+    """
+    Return ``(project_id, owner_id)`` for a project or an object inside one.
+
+    ``owner_id`` is only read from a project that is already loaded, so
+    resolving never triggers a query; it is ``None`` when unknown.
+    """
+    if isinstance(obj, Project):
+        return obj.pk, obj.owner_id
+    if hasattr(obj, 'project_id'):
+        holder = obj
+    elif hasattr(obj, 'board_id'):
+        holder = obj.board
+    elif hasattr(obj, 'task_id'):
+        holder = obj.task.board
+    else:
+        return None, None
+
+    project = holder._state.fields_cache.get('project')
+    return holder.project_id, project.owner_id if project is not None else None
+
+
+def get_request_role(request, obj):
+    project_id, owner_id = resolve_project(obj)
+    if project_id is None:
+        return None
+    return get_project_role(request.user, project_id, owner_id=owner_id, request=request)
 
 
 class IsProjectMember(permissions.BasePermission):
     """Permission to check if user is a project member."""
 
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated)
+
     def has_object_permission(self, request, view, obj):
         # Admin users have full access
         if request.user.is_admin:
             return True
 
-        # Get project from object
-        if hasattr(obj, 'project'):
-            project = obj.project
-        else:
-            project = obj
-
-        # Check if user is project owner or member
-        if project.owner == request.user:
-            return True
-
-        return ProjectMember.objects.filter(
-            project=project,
-            user=request.user
-        ).exists()
+        # Owners and members of any role have access
+        return get_request_role(request, obj) is not None
 
 
 class IsProjectAdmin(permissions.BasePermission):
     """Permission to check if user is a project admin."""
 
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated)
+
     def has_object_permission(self, request, view, obj):
         # Admin users have full access
         if request.user.is_admin:
             return True
 
-        # Get project from object
-        if hasattr(obj, 'project'):
-            project = obj.project
-        else:
-            project = obj
-
-        # Check if user is project owner
-        if project.owner == request.user:
-            return True
-
-        # Check if user is project admin
-        try:
-            member = ProjectMember.objects.get(project=project, user=request.user)
-            return member.role == ProjectMember.Role.ADMIN
-        except ProjectMember.DoesNotExist:
-            return False
\ No newline at end of file
+        # Project owners and admin members have access
+        return get_request_role(request, obj) in (OWNER_ROLE, ProjectMember.Role.ADMIN)
@@ -2,6 +2,7 @@
 from rest_framework import serializers
 from .models import Project, ProjectMember, Board
 from apps.users.serializers import UserSerializer
+from apps.utils.fieldsets import COLLAPSE_PK, FlexFieldsMixin
 
 
 class ProjectMemberSerializer(serializers.ModelSerializer):
@@ -15,7 +16,7 @@ class ProjectMemberSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'joined_at']
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(FlexFieldsMixin, serializers.ModelSerializer):
     """Serializer for projects."""
     owner = UserSerializer(read_only=True)
     members = ProjectMemberSerializer(many=True, read_only=True)
@@ -30,6 +31,7 @@ class ProjectSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'owner', 'created_at', 'updated_at']
+        expandable_fields = {'owner': COLLAPSE_PK, 'members': None}
 
     def create(self, validated_data):
         validated_data['owner'] = self.context['request'].user
@@ -44,7 +46,7 @@ class ProjectSerializer(serializers.ModelSerializer):
         return project
 
 
-class BoardSerializer(serializers.ModelSerializer):
+class BoardSerializer(FlexFieldsMixin, serializers.ModelSerializer):
     """Serializer for boards."""
     task_count = serializers.IntegerField(read_only=True)
 
@@ -0,0 +1,45 @@
+"""Signal handlers keeping cached project access and responses in sync."""
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from .access import invalidate_project_access
+from .cache import bump_project_generations
+from .models import Project, ProjectMember, Board
+
+
+@receiver(post_init, sender=Project)
+def remember_owner(sender, instance, **kwargs):
+    """Keep the loaded owner so ownership changes can be detected on save."""
+    instance._loaded_owner_id = instance.owner_id
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, created, **kwargs):
+    """Invalidate access for the old and new owner when ownership changes."""
+    previous_owner_id = getattr(instance, '_loaded_owner_id', None)
+    if created or previous_owner_id != instance.owner_id:
+        invalidate_project_access(previous_owner_id, instance.owner_id)
+    instance._loaded_owner_id = instance.owner_id
+    bump_project_generations(instance.pk)
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    """Invalidate access for the owner of a deleted project."""
+    invalidate_project_access(instance.owner_id)
+    bump_project_generations(instance.pk)
+
+
+@receiver(post_save, sender=ProjectMember)
+@receiver(post_delete, sender=ProjectMember)
+def membership_changed(sender, instance, **kwargs):
+    """Invalidate access for a member that joined or left a project."""
+    invalidate_project_access(instance.user_id)
+    bump_project_generations(instance.project_id)
+
+
+@receiver(post_save, sender=Board)
+@receiver(post_delete, sender=Board)
+def board_changed(sender, instance, **kwargs):
+    """Invalidate cached responses of the board's project."""
+    bump_project_generations(instance.project_id)
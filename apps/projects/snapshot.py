@@ -0,0 +1,130 @@
+"""Compact whole-board snapshots for Kanban clients."""
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Max, Sum
+
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+TASK_FIELDS = (
+    'id', 'title', 'status', 'priority', 'assignee_id', 'reporter_id',
+    'due_date', 'sla_breached', 'estimated_hours', 'comment_count',
+    'created_at', 'updated_at',
+)
+USER_FIELDS = ('id', 'username', 'first_name', 'last_name', 'avatar')
+
+
+ETAG_AGGREGATES = {
+    'last_updated': Max('updated_at'),
+    'total': Count('id'),
+    'comments': Sum('comment_count'),
+}
+
+
+def _board_tasks(board):
+    return Task.objects.filter(board_id=board.id).order_by()
+
+
+def _format_etag(board, state):
+    last_updated = state['last_updated'].isoformat() if state['last_updated'] else ''
+    raw = f"{board.id}:{board.updated_at.isoformat()}:{last_updated}:{state['total']}:{state['comments']}"
+    return '"%s"' % hashlib.md5(raw.encode()).hexdigest()
+
+
+def board_etag(board):
+    """
+    Return a strong ETag for the tasks of a board.
+
+    Built from the newest task ``updated_at``, the task count and the comment
+    total, so edits, additions, deletions, moves to another board and new
+    comments (which only bump ``comment_count``) all change it. The aggregate
+    is answered from the (board, updated_at, comment_count) index.
+    """
+    return _format_etag(board, _board_tasks(board).aggregate(**ETAG_AGGREGATES))
+
+
+async def aboard_etag(board):
+    """Async variant of ``board_etag``."""
+    return _format_etag(board, await _board_tasks(board).aaggregate(**ETAG_AGGREGATES))
+
+
+def _task_rows(board):
+    return _board_tasks(board).values(*TASK_FIELDS)
+
+
+def _add_task(row, columns, user_ids):
+    row['assignee'] = row.pop('assignee_id')
+    row['reporter'] = row.pop('reporter_id')
+    if row['estimated_hours'] is not None:
+        row['estimated_hours'] = str(row['estimated_hours'])
+    user_ids.update(uid for uid in (row['assignee'], row['reporter']) if uid is not None)
+    columns.setdefault(row['status'], []).append(row)
+
+
+def _user_rows(user_ids):
+    return User.objects.filter(id__in=user_ids).order_by().values(*USER_FIELDS)
+
+
+def _user_entry(row, storage, request):
+    avatar = storage.url(row['avatar']) if row['avatar'] else None
+    if avatar and request is not None:
+        avatar = request.build_absolute_uri(avatar)
+    return {
+        'id': row['id'],
+        'username': row['username'],
+        'full_name': f"{row['first_name']} {row['last_name']}".strip(),
+        'avatar': avatar,
+    }
+
+
+def _snapshot(board, columns, users):
+    labels = dict(Task.Status.choices)
+    return {
+        'board': {'id': board.id, 'name': board.name, 'project': board.project_id},
+        'task_count': sum(len(tasks) for tasks in columns.values()),
+        'columns': [
+            {'status': value, 'label': labels.get(value, value), 'tasks': tasks}
+            for value, tasks in columns.items()
+        ],
+        'users': users,
+    }
+
+
+def build_board_snapshot(board, request=None):
+    """
+    Return every task of a board grouped into status columns.
+
+    Tasks are read with a single ``values()`` projection and the users they
+    reference are returned once in a ``users`` dictionary keyed by id,
+    instead of nesting a serialized user in every card.
+    """
+    columns = {value: [] for value, _ in Task.Status.choices}
+    user_ids = set()
+    for row in _task_rows(board).iterator(chunk_size=2000):
+        _add_task(row, columns, user_ids)
+
+    users = {}
+    if user_ids:
+        storage = User._meta.get_field('avatar').storage
+        for row in _user_rows(user_ids):
+            users[str(row['id'])] = _user_entry(row, storage, request)
+
+    return _snapshot(board, columns, users)
+
+
+async def abuild_board_snapshot(board, request=None):
+    """Async variant of ``build_board_snapshot``."""
+    columns = {value: [] for value, _ in Task.Status.choices}
+    user_ids = set()
+    async for row in _task_rows(board).aiterator(chunk_size=2000):
+        _add_task(row, columns, user_ids)
+
+    users = {}
+    if user_ids:
+        storage = User._meta.get_field('avatar').storage
+        async for row in _user_rows(user_ids):
+            users[str(row['id'])] = _user_entry(row, storage, request)
+
+    return _snapshot(board, columns, users)
@@ -1,10 +1,15 @@
 """URL configuration for Project API."""
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ProjectViewSet, BoardViewSet
+from apps.utils.async_views import hybrid_view, router_view
+from .views import ProjectViewSet, BoardViewSet, board_snapshot
 
 router = DefaultRouter()
 router.register(r'', ProjectViewSet, basename='project')
 router.register(r'boards', BoardViewSet, basename='board')
 
-urlpatterns = router.urls
\ No newline at end of file
+urlpatterns = [
+    path('boards/<int:pk>/snapshot/', hybrid_view(
+        router_view(router, 'board-snapshot'), get=board_snapshot
+    ), name='board-snapshot'),
+] + router.urls
@@ -2,15 +2,26 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Count, Q
+from django.db.models import Count
+from django.http import HttpResponseNotModified
 from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 
 from .models import Project, ProjectMember, Board
 from .serializers import ProjectSerializer, ProjectMemberSerializer, BoardSerializer
 from .permissions import IsProjectMember, IsProjectAdmin
+from .access import aget_project_role, get_accessible_project_ids
+from .cache import ALL_PROJECTS, ProjectResponseCacheMixin
+from .snapshot import aboard_etag, abuild_board_snapshot, board_etag, build_board_snapshot
+from apps.analytics.flow import cumulative_flow, time_in_status
+from apps.analytics.reports import project_analytics
+from apps.analytics.serializers import AnalyticsQuerySerializer
+from apps.utils.async_views import api_handler, json_response
+from apps.utils.fieldsets import expands_field, includes_field
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ProjectResponseCacheMixin, viewsets.ModelViewSet):
     """ViewSet for project CRUD operations."""
     serializer_class = ProjectSerializer
     permission_classes = [IsProjectMember]
@@ -23,14 +34,23 @@ class ProjectViewSet(viewsets.ModelViewSet):
             queryset = Project.objects.all()
         else:
             queryset = Project.objects.filter(
-                Q(owner=user) | Q(members__user=user)
-            ).distinct()
+                id__in=get_accessible_project_ids(user)
+            )
 
-        # Annotate counts
-        queryset = queryset.annotate(
-            board_count=Count('boards', distinct=True),
-            member_count=Count('members', distinct=True)
-        ).select_related('owner').prefetch_related('members__user')
+        # Analytics read rollups and only need the project row
+        if self.action == 'analytics':
+            return queryset
+
+        # Annotate, join and prefetch only what the response renders
+        request = self.request
+        if includes_field(request, ProjectSerializer, 'board_count'):
+            queryset = queryset.annotate(board_count=Count('boards', distinct=True))
+        if includes_field(request, ProjectSerializer, 'member_count'):
+            queryset = queryset.annotate(member_count=Count('members', distinct=True))
+        if expands_field(request, ProjectSerializer, 'owner'):
+            queryset = queryset.select_related('owner')
+        if expands_field(request, ProjectSerializer, 'members'):
+            queryset = queryset.prefetch_related('members__user')
 
         # Filter archived
         is_archived = self.request.query_params.get('is_archived')
@@ -39,6 +59,15 @@ class ProjectViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    @action(detail=True, methods=['get'])
+    def analytics(self, request, pk=None):
+        """Get throughput, cycle time, WIP and SLA metrics over a date range."""
+        project = self.get_object()
+        query = AnalyticsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        return Response(project_analytics(project, **query.validated_data))
+
     @action(detail=True, methods=['post'], permission_classes=[IsProjectAdmin])
     def add_member(self, request, pk=None):
         """Add a member to the project."""
@@ -84,23 +113,34 @@ class ProjectViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class BoardViewSet(viewsets.ModelViewSet):
+class BoardViewSet(ProjectResponseCacheMixin, viewsets.ModelViewSet):
     """ViewSet for board CRUD operations."""
     serializer_class = BoardSerializer
     permission_classes = [IsProjectMember]
 
+    def get_cache_generations(self):
+        # Board lists are not limited to the caller's projects
+        return [ALL_PROJECTS]
+
     def get_queryset(self):
         queryset = Board.objects.all()
 
+        # The snapshot and flow only need the board row and its project's owner
+        if self.action in ('snapshot', 'flow'):
+            return queryset.select_related('project')
+
         # Filter by project
         project_id = self.request.query_params.get('project')
         if project_id:
             queryset = queryset.filter(project_id=project_id)
 
         # Annotate task count
-        queryset = queryset.annotate(
-            task_count=Count('tasks', distinct=True)
-        ).select_related('project')
+        if includes_field(self.request, BoardSerializer, 'task_count'):
+            queryset = queryset.annotate(task_count=Count('tasks', distinct=True))
+
+        # Object permissions read the project owner
+        if self.detail:
+            queryset = queryset.select_related('project')
 
         return queryset
 
@@ -108,4 +148,62 @@ class BoardViewSet(viewsets.ModelViewSet):
         """Auto-set position on create."""
         project = serializer.validated_data['project']
         last_position = Board.objects.filter(project=project).count()
-        serializer.save(position=last_position)
\ No newline at end of file
+        serializer.save(position=last_position)
+
+    @action(detail=True, methods=['get'])
+    def snapshot(self, request, pk=None):
+        """Get all tasks of the board grouped by status, with ETag revalidation."""
+        board = self.get_object()
+        etag = board_etag(board)
+
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(build_board_snapshot(board, request))
+
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    @action(detail=True, methods=['get'])
+    def flow(self, request, pk=None):
+        """Get cumulative flow and time-in-status percentiles over a date range."""
+        board = self.get_object()
+        query = AnalyticsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        date_from, date_to = query.validated_data['date_from'], query.validated_data['date_to']
+
+        return Response({
+            'board': board.id,
+            'date_from': date_from,
+            'date_to': date_to,
+            'cumulative_flow': cumulative_flow([board.id], date_from, date_to),
+            'time_in_status': time_in_status([board.id], date_from, date_to),
+        })
+
+
+@api_handler
+async def board_snapshot(request, user, pk):
+    """
+    Async ``BoardViewSet.snapshot`` for members of the board's project.
+
+    Missing boards and denied access fall through to the viewset, which
+    renders the error.
+    """
+    board = await Board.objects.select_related('project').filter(pk=pk).afirst()
+    if board is None:
+        return None
+    if not user.is_admin and await aget_project_role(
+        user, board.project_id, owner_id=board.project.owner_id
+    ) is None:
+        return None
+
+    etag = await aboard_etag(board)
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        response = json_response(await abuild_board_snapshot(board, request))
+
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.tasks'
-    verbose_name = 'Tasks'
\ No newline at end of file
+    verbose_name = 'Tasks'
+
+    def ready(self):
+        import apps.tasks.signals  # noqa
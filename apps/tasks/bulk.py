@@ -0,0 +1,213 @@
+"""Bulk task operations."""
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import Task
+from .serializers import BulkTaskDataSerializer, BulkTaskOperationSerializer
+from apps.analytics import rollups
+from apps.notifications.outbox import record_assignments
+from apps.projects.access import get_accessible_project_ids
+from apps.projects.models import Board
+
+User = get_user_model()
+
+Op = BulkTaskOperationSerializer.Op
+
+INSERTED_ID_RANGE = 'SELECT LAST_INSERT_ID(), @@auto_increment_increment'
+
+
+def assign_inserted_ids(objs):
+    """
+    Set the primary keys of ``objs`` just written by one multi-row INSERT on
+    MySQL, which cannot return them.
+
+    InnoDB reserves the auto-increment values of a multi-row ``INSERT ...
+    VALUES`` in one step, so they are consecutive (in steps of
+    ``auto_increment_increment``) in every ``innodb_autoinc_lock_mode``, and
+    ``LAST_INSERT_ID()`` is the first of them.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(INSERTED_ID_RANGE)
+        first, step = cursor.fetchone()
+    for offset, obj in enumerate(objs):
+        obj.pk = first + offset * step
+
+
+class BulkTaskProcessor:
+    """
+    Applies a list of validated bulk operations.
+
+    Referenced tasks, boards and users are loaded with one query each,
+    permissions are checked once per distinct project and every write
+    happens in a single transaction through bulk_create/bulk_update.
+    ``post_save`` is sent for each written task so audit logging, the SLA
+    schedule and the analytics rollups treat bulk writes like single saves
+    (rollup changes are applied together before commit), and assignment
+    notifications go out as one Celery message after commit.
+    """
+
+    def __init__(self, request, queryset):
+        self.request = request
+        self.user = request.user
+        self.queryset = queryset
+        self.results = []
+        self._project_access = {}
+
+    def run(self, operations):
+        self.results = [None] * len(operations)
+        valid = []
+        for index, item in enumerate(operations):
+            if item['errors'] is not None:
+                self._fail(index, None, item['errors'])
+            else:
+                valid.append((index, item['data']))
+
+        self._preload([operation for _, operation in valid])
+
+        self.created = []
+        self.updated = {}
+        self.assignments = []
+        for index, operation in valid:
+            handler = getattr(self, f"_{operation['op']}")
+            try:
+                handler(index, operation)
+            except serializers.ValidationError as exc:
+                self._fail(index, operation, exc.detail)
+
+        self._write()
+        return self.results
+
+    def _preload(self, operations):
+        task_ids, board_ids, user_ids = set(), set(), set()
+        for operation in operations:
+            if 'id' in operation:
+                task_ids.add(operation['id'])
+            if operation.get('assignee_id') is not None:
+                user_ids.add(operation['assignee_id'])
+            data = operation.get('data') or {}
+            for key, ids in (('board', board_ids), ('assignee', user_ids)):
+                try:
+                    ids.add(int(data[key]))
+                except (KeyError, TypeError, ValueError):
+                    pass
+
+        # Access checks read each task's board
+        self.tasks = self.queryset.select_related('board').in_bulk(task_ids) if task_ids else {}
+        self.context = {
+            'request': self.request,
+            'boards': Board.objects.in_bulk(board_ids) if board_ids else {},
+            'users': User.objects.in_bulk(user_ids) if user_ids else {},
+        }
+
+    def _create(self, index, operation):
+        serializer = BulkTaskDataSerializer(data=operation['data'], context=self.context)
+        serializer.is_valid(raise_exception=True)
+        self._check_project(serializer.validated_data['board'].project_id)
+
+        task = Task(reporter=self.user, **serializer.validated_data)
+        task.sync_completed_at()
+        self.created.append((index, task))
+
+    def _update(self, index, operation):
+        task = self._get_task(operation)
+        serializer = BulkTaskDataSerializer(
+            task, data=operation['data'], partial=True, context=self.context
+        )
+        serializer.is_valid(raise_exception=True)
+        if 'board' in serializer.validated_data:
+            self._check_project(serializer.validated_data['board'].project_id)
+
+        for attr, value in serializer.validated_data.items():
+            setattr(task, attr, value)
+        self._track(index, task, serializer.validated_data.keys())
+
+    def _move(self, index, operation):
+        task = self._get_task(operation)
+        task.status = operation['status']
+        self._track(index, task, ['status'])
+
+    def _assign(self, index, operation):
+        task = self._get_task(operation)
+        assignee_id = operation['assignee_id']
+        if assignee_id is not None and assignee_id not in self.context['users']:
+            raise serializers.ValidationError({'assignee_id': ['User not found.']})
+
+        task.assignee = self.context['users'].get(assignee_id)
+        self._track(index, task, ['assignee'])
+        if assignee_id is not None:
+            self.assignments.append((task.id, assignee_id))
+
+    def _get_task(self, operation):
+        task = self.tasks.get(operation['id'])
+        if task is None:
+            raise serializers.ValidationError({'id': ['Task not found.']})
+        self._check_project(task.board.project_id)
+        return task
+
+    def _check_project(self, project_id):
+        allowed = self._project_access.get(project_id)
+        if allowed is None:
+            allowed = self.user.is_admin or project_id in self._accessible_projects()
+            self._project_access[project_id] = allowed
+        if not allowed:
+            raise serializers.ValidationError({
+                'detail': ['You do not have permission to perform this action.']
+            })
+
+    def _accessible_projects(self):
+        if not hasattr(self, '_accessible'):
+            self._accessible = set(get_accessible_project_ids(self.user))
+        return self._accessible
+
+    def _track(self, index, task, fields):
+        _, tracked = self.updated.setdefault(task.pk, (task, set()))
+        tracked.update(fields)
+        self.results[index] = self._ok(index, task)
+
+    def _write(self):
+        with transaction.atomic(), rollups.batch():
+            self._insert([task for _, task in self.created])
+            for index, task in self.created:
+                self.results[index] = self._ok(index, task)
+
+            now = timezone.now()
+            groups = defaultdict(list)
+            for task, fields in self.updated.values():
+                task.sync_completed_at()
+                task.updated_at = now
+                groups[frozenset(fields | {'completed_at', 'updated_at'})].append(task)
+            for fields, tasks in groups.items():
+                Task.objects.bulk_update(tasks, sorted(fields))
+                for task in tasks:
+                    post_save.send(
+                        sender=Task, instance=task, created=False,
+                        update_fields=fields, raw=False, using=connection.alias
+                    )
+
+            if self.assignments:
+                record_assignments(self.assignments)
+
+    @staticmethod
+    def _insert(tasks):
+        if not tasks:
+            return
+        # One multi-row INSERT, so the ids MySQL assigns are contiguous
+        Task.objects.bulk_create(tasks, batch_size=len(tasks))
+        if not connection.features.can_return_rows_from_bulk_insert:
+            assign_inserted_ids(tasks)
+        for task in tasks:
+            post_save.send(
+                sender=Task, instance=task, created=True,
+                update_fields=None, raw=False, using=connection.alias
+            )
+
+    def _ok(self, index, task):
+        return {'index': index, 'status': 'ok', 'id': task.pk}
+
+    def _fail(self, index, operation, errors):
+        self.results[index] = {'index': index, 'status': 'error', 'errors': errors}
@@ -0,0 +1,126 @@
+"""Benchmark compiled list serialization against the regular serializers."""
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.audit.models import AuditLog
+from apps.audit.serializers import AuditLogSerializer
+from apps.projects.models import Project, Board
+from apps.tasks.models import Task, Comment
+from apps.tasks.serializers import TaskSerializer, CommentSerializer
+from apps.utils.fast_serializers import compile_serializer
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    """Raised to discard the benchmark fixtures."""
+
+
+class Command(BaseCommand):
+    help = (
+        'Time one list page through the regular serializers and the compiled '
+        'path, check both render identical JSON, and roll the fixtures back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.create_fixtures(options['page_size'], options['users'])
+                for label, serializer_class, queryset in self.cases(options['page_size']):
+                    self.run_case(label, serializer_class, queryset, options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def create_fixtures(self, page_size, user_count):
+        stamp = int(time.time())
+        users = [
+            User.objects.create_user(
+                username=f'bench{stamp}_{i}',
+                email=f'bench{stamp}_{i}@example.com',
+                password=None,
+                first_name='Bench',
+                last_name=str(i),
+            )
+            for i in range(user_count)
+        ]
+        project = Project.objects.create(name='Benchmark', owner=users[0])
+        board = Board.objects.create(name='Benchmark', project=project)
+        tasks = [
+            Task.objects.create(
+                title=f'Task {i}',
+                description='Benchmark task',
+                board=board,
+                reporter=users[i % user_count],
+                assignee=users[(i + 1) % user_count],
+                due_date=timezone.now(),
+                estimated_hours=Decimal('1.50'),
+            )
+            for i in range(page_size)
+        ]
+        Comment.objects.bulk_create([
+            Comment(task=task, author=users[i % user_count], content='Benchmark comment')
+            for i, task in enumerate(tasks)
+        ])
+        AuditLog.objects.bulk_create([
+            AuditLog(
+                user=users[i % user_count], action=AuditLog.Action.UPDATE, model_name='Task',
+                object_id=task.id, changes={'status': ['TODO', 'DONE']}, ip_address='127.0.0.1',
+            )
+            for i, task in enumerate(tasks)
+        ])
+        self.board = board
+
+    def cases(self, page_size):
+        return [
+            ('tasks', TaskSerializer, Task.objects.filter(board=self.board)
+                .select_related('assignee', 'reporter').order_by('-id')[:page_size]),
+            ('comments', CommentSerializer, Comment.objects.filter(task__board=self.board)
+                .select_related('author').order_by('-id')[:page_size]),
+            ('audit logs', AuditLogSerializer, AuditLog.objects.select_related('user')
+                .order_by('-id')[:page_size]),
+        ]
+
+    def run_case(self, label, serializer_class, queryset, repeat):
+        context = {'request': Request(APIRequestFactory().get('/'))}
+        plan = compile_serializer(serializer_class)
+        if plan is None:
+            raise CommandError(f'{serializer_class.__name__} cannot be compiled')
+
+        def regular():
+            return serializer_class(list(queryset), many=True, context=context).data
+
+        def fast():
+            rows = list(queryset.select_related(None).values(*plan.attnames))
+            return plan.serialize(rows, context)
+
+        if JSONRenderer().render(regular()) != JSONRenderer().render(fast()):
+            raise CommandError(f'Compiled output for {label} differs from {serializer_class.__name__}')
+
+        regular_ms = self.time(regular, repeat)
+        fast_ms = self.time(fast, repeat)
+        self.stdout.write(
+            f'{label:<11} regular {regular_ms:8.2f} ms/page   compiled {fast_ms:8.2f} ms/page   '
+            f'speedup {regular_ms / fast_ms:5.1f}x'
+        )
+
+    @staticmethod
+    def time(func, repeat):
+        func()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) * 1000 / repeat
@@ -0,0 +1,192 @@
+"""Benchmark enqueue-to-execute latency per Celery queue under a bulk backlog."""
+import contextlib
+import logging
+import math
+import threading
+import time
+
+from celery import Celery, current_app
+from celery.contrib.testing.worker import start_worker
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from kombu import Queue
+
+from config.celery import BULK, INTERACTIVE, SCHEDULED, WORKER_PROFILES
+
+LANES = (INTERACTIVE, BULK, SCHEDULED)
+# Benchmark queues never share names with the real ones, so a run against a
+# live Redis cannot consume or leave behind production tasks
+QUEUE_PREFIX = 'benchmark.'
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Run in-process workers against an in-memory broker (or a Redis URL), '
+        'queue a backlog of long bulk jobs while interactive and scheduled '
+        'probes trickle in, and report enqueue-to-execute latency per lane, '
+        'once with every task on one queue served by a single worker and once '
+        'with the routed queues and worker profiles of config/celery.py.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--broker', default='memory://', help='Broker URL; memory:// needs no server')
+        parser.add_argument('--bulk-jobs', type=int, default=40)
+        parser.add_argument('--bulk-seconds', type=float, default=0.5, help='Run time of each bulk job')
+        parser.add_argument('--probes', type=int, default=200, help='Interactive tasks sent during the backlog')
+        parser.add_argument('--probe-interval', type=float, default=0.02)
+        parser.add_argument('--scheduled-probes', type=int, default=10)
+        parser.add_argument(
+            '--shared-concurrency', type=int, default=2,
+            help='Processes of the single worker in the shared layout'
+        )
+        parser.add_argument('--timeout', type=float, default=120, help='Seconds to wait for a layout to drain')
+
+    def handle(self, *args, **options):
+        durations = {INTERACTIVE: 0.005, BULK: options['bulk_seconds'], SCHEDULED: 0.05}
+        counts = {
+            INTERACTIVE: options['probes'],
+            BULK: options['bulk_jobs'],
+            SCHEDULED: options['scheduled_probes'],
+        }
+        if not all(counts.values()):
+            raise CommandError('Every lane needs at least one task.')
+        if counts[SCHEDULED] > counts[INTERACTIVE]:
+            raise CommandError('Scheduled probes are spread over the interactive ones; send fewer.')
+
+        # Per-task worker logging would swamp the report
+        for name in ('celery', 'kombu'):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+        # Embedded workers make their app the current one; put ours back after
+        previous_app = current_app._get_current_object()
+        try:
+            # The single default queue and worker this project used to run
+            shared = self.run(
+                options, counts, durations, routed=False,
+                workers=[(list(LANES), {'concurrency': options['shared_concurrency']})],
+            )
+            self.report('shared', shared)
+
+            routed = self.run(
+                options, counts, durations, routed=True,
+                workers=[([lane], WORKER_PROFILES[lane]) for lane in LANES],
+            )
+            self.report('routed', routed)
+        finally:
+            previous_app.set_current()
+            previous_app.set_default()
+
+        p99 = percentile(routed[INTERACTIVE], 99)
+        self.stdout.write(
+            f'interactive p99 {p99 * 1000:.1f} ms with routing, '
+            f'{percentile(shared[INTERACTIVE], 99) * 1000:.1f} ms on one queue'
+        )
+        if p99 >= 1:
+            self.stdout.write(self.style.WARNING('Interactive p99 is above one second'))
+
+    def run(self, options, counts, durations, routed, workers):
+        latencies = {lane: [] for lane in LANES}
+        done = threading.Semaphore(0)
+
+        def make_app():
+            app = self.make_app(options['broker'], routed)
+            tasks = {}
+            for lane in LANES:
+                tasks[lane] = self.make_task(app, lane, durations[lane], latencies[lane], done)
+            return app, tasks
+
+        with contextlib.ExitStack() as stack:
+            # Each worker process is a solo worker in a thread of its own, so
+            # it prefetches and acknowledges like a prefork child would (the
+            # thread pool only acknowledges between broker polls). Workers get
+            # apps of their own because selecting queues changes the app.
+            for lanes, profile in workers:
+                for _ in range(profile['concurrency']):
+                    app, _ = make_app()
+                    stack.enter_context(start_worker(
+                        app,
+                        pool='solo',
+                        prefetch_multiplier=profile.get(
+                            'prefetch_multiplier', app.conf.worker_prefetch_multiplier
+                        ),
+                        queues=[self.queue_name(lane) for lane in lanes] if routed else [app.conf.task_default_queue],
+                        perform_ping_check=False,
+                        loglevel='ERROR',
+                        shutdown_timeout=options['timeout'],
+                    ))
+
+            _, tasks = make_app()
+            # The backlog lands first, as the daily summary fan-out does
+            for _ in range(counts[BULK]):
+                tasks[BULK].delay(time.time())
+            scheduled_at = {
+                i * counts[INTERACTIVE] // counts[SCHEDULED] for i in range(counts[SCHEDULED])
+            }
+            for i in range(counts[INTERACTIVE]):
+                tasks[INTERACTIVE].delay(time.time())
+                if i in scheduled_at:
+                    tasks[SCHEDULED].delay(time.time())
+                time.sleep(options['probe_interval'])
+            sent = counts[BULK] + counts[INTERACTIVE] + len(scheduled_at)
+
+            deadline = time.monotonic() + options['timeout']
+            for _ in range(sent):
+                if not done.acquire(timeout=max(0, deadline - time.monotonic())):
+                    raise CommandError(f'Workers did not drain the queues within {options["timeout"]}s.')
+
+        return latencies
+
+    def make_app(self, broker, routed):
+        app = Celery('benchmark', broker=broker, set_as_current=False)
+        app.conf.update(
+            task_ignore_result=True,
+            # The memory transport polls; keep its interval well below the latencies measured
+            broker_transport_options={'polling_interval': 0.005},
+            worker_hijack_root_logger=False,
+            broker_connection_retry_on_startup=True,
+        )
+        if routed:
+            app.conf.update(
+                task_queues=[Queue(self.queue_name(lane)) for lane in LANES],
+                task_default_queue=self.queue_name(BULK),
+                task_routes={f'benchmark.{lane}': {'queue': self.queue_name(lane)} for lane in LANES},
+                task_acks_late=settings.CELERY_TASK_ACKS_LATE,
+                worker_prefetch_multiplier=settings.CELERY_WORKER_PREFETCH_MULTIPLIER,
+            )
+        else:
+            app.conf.update(
+                task_queues=[Queue(self.queue_name('default'))],
+                task_default_queue=self.queue_name('default'),
+            )
+        return app
+
+    @staticmethod
+    def make_task(app, lane, duration, latencies, done):
+        # Not shared, or apps created later would pick up this closure
+        @app.task(name=f'benchmark.{lane}', shared=False)
+        def probe(enqueued_at):
+            latencies.append(time.time() - enqueued_at)
+            time.sleep(duration)
+            done.release()
+
+        return probe
+
+    @staticmethod
+    def queue_name(lane):
+        return f'{QUEUE_PREFIX}{lane}'
+
+    def report(self, layout, latencies):
+        for lane in LANES:
+            values = latencies[lane]
+            self.stdout.write(
+                f'{layout:<7} {lane:<12} {len(values):>5} tasks   '
+                f'p50 {percentile(values, 50) * 1000:9.1f} ms   '
+                f'p99 {percentile(values, 99) * 1000:9.1f} ms   '
+                f'max {max(values) * 1000:9.1f} ms'
+            )
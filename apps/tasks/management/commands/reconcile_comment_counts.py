@@ -0,0 +1,74 @@
+"""Reconcile the denormalized Task.comment_count column."""
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from apps.projects.cache import bump_project_generations
+from apps.tasks.models import Task, Comment
+
+
+def live_count():
+    """Correlated subquery counting the comments of the outer task."""
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(task_id=OuterRef('pk'))
+            .order_by()
+            .values('task_id')
+            .annotate(total=Count('id'))
+            .values('total')
+        ),
+        0,
+    )
+
+
+class Command(BaseCommand):
+    help = 'Recompute Task.comment_count in batches and fix any drifted rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drifted tasks without updating them.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+        last_id = 0
+        checked = fixed = 0
+
+        while True:
+            batch = list(
+                Task.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', 'comment_count')[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+            checked += len(batch)
+
+            actual = dict(
+                Comment.objects.filter(task_id__in=[task_id for task_id, _ in batch])
+                .order_by()
+                .values_list('task_id')
+                .annotate(total=Count('id'))
+            )
+            drifted = [
+                task_id for task_id, stored in batch
+                if stored != actual.get(task_id, 0)
+            ]
+            if drifted and not dry_run:
+                # Recount inside the UPDATE so comments added since the
+                # check above are not lost.
+                Task.objects.filter(id__in=drifted).update(comment_count=live_count())
+                bump_project_generations(*Task.objects.filter(id__in=drifted).values_list(
+                    'board__project_id', flat=True
+                ).order_by().distinct())
+            fixed += len(drifted)
+
+        verb = 'Found' if dry_run else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {fixed} drifted comment counts across {checked} tasks'
+        ))
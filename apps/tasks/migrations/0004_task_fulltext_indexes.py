@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def add_fulltext_indexes(apps, schema_editor):
+    """Create the InnoDB FULLTEXT indexes used by TaskSearchFilter on MySQL."""
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute(
+        "ALTER TABLE tasks ADD FULLTEXT INDEX tasks_title_description_ft (title, description)"
+    )
+    schema_editor.execute(
+        "ALTER TABLE comments ADD FULLTEXT INDEX comments_content_ft (content)"
+    )
+
+
+def drop_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute("ALTER TABLE tasks DROP INDEX tasks_title_description_ft")
+    schema_editor.execute("ALTER TABLE comments DROP INDEX comments_content_ft")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_comment_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_fulltext_indexes, drop_fulltext_indexes),
+    ]
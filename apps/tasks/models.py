@@ -1,5 +1,5 @@
 """Task models."""
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from apps.projects.models import Board
 
@@ -60,6 +60,8 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    # Maintained by apps.tasks.signals; never written through save()
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         db_table = 'tasks'
@@ -68,22 +70,49 @@ class Task(models.Model):
             models.Index(fields=['board', 'status']),
             models.Index(fields=['assignee', 'status']),
             models.Index(fields=['priority', 'status']),
-            models.Index(fields=['due_date']),
-            models.Index(fields=['created_at']),
+            # Composite keys backing keyset pagination on each ordering field
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['board', 'created_at', 'id']),
+            models.Index(fields=['updated_at', 'id']),
+            models.Index(fields=['due_date', 'id']),
+            # Covers the aggregate behind board snapshot ETags
+            models.Index(fields=['board', 'updated_at', 'comment_count']),
         ]
 
     def __str__(self):
         return self.title
 
-    def save(self, *args, **kwargs):
-        # Set completed_at when status changes to DONE
+    def sync_completed_at(self):
+        """Set completed_at when status changes to DONE, clear it otherwise."""
         if self.status == self.Status.DONE and not self.completed_at:
             from django.utils import timezone
             self.completed_at = timezone.now()
         elif self.status != self.Status.DONE:
             self.completed_at = None
 
-        super().save(*args, **kwargs)
+    def save(self, *args, **kwargs):
+        self.sync_completed_at()
+
+        # Leave the denormalized counter to its atomic updates so a stale
+        # in-memory value can't overwrite concurrent comment changes. Only
+        # loaded fields are named, so deferred ones are never fetched; when
+        # the counter itself is deferred Django already skips it.
+        if (
+            not self._state.adding
+            and kwargs.get('update_fields') is None
+            and 'comment_count' in self.__dict__
+        ):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname in self.__dict__
+                and field.name != 'comment_count'
+            ]
+
+        # post_save receivers (analytics rollups, transition history) write
+        # in the same transaction as the row itself.
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            super().save(*args, **kwargs)
 
 
 class Comment(models.Model):
@@ -0,0 +1,75 @@
+"""Full-text search backend for tasks."""
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+# InnoDB ignores words shorter than innodb_ft_min_token_size (default 3)
+MIN_TOKEN_LENGTH = 3
+
+# Characters with a meaning in MySQL boolean-mode queries
+BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]+')
+
+TASK_MATCH = 'MATCH (tasks.title, tasks.description) AGAINST (%s IN BOOLEAN MODE)'
+COMMENT_MATCH = 'MATCH (comments.content) AGAINST (%s IN BOOLEAN MODE)'
+
+# Each branch is resolved by its own FULLTEXT index; an OR of the two
+# predicates in one WHERE clause cannot use either and scans every task.
+# The derived table is materialized once and semi-joined to the filtered
+# tasks instead of being re-evaluated per row.
+MATCHING_TASK_IDS = (
+    f'SELECT matches.id FROM ('
+    f'SELECT tasks.id FROM tasks WHERE {TASK_MATCH} '
+    f'UNION SELECT comments.task_id FROM comments WHERE {COMMENT_MATCH}'
+    f') AS matches'
+)
+
+
+def boolean_query(terms):
+    """
+    Build a boolean-mode query requiring every term as a prefix match,
+    e.g. ``['auth', 'bug']`` becomes ``+auth* +bug*``.
+    """
+    words = []
+    for term in terms:
+        words.extend(word for word in BOOLEAN_OPERATORS.sub(' ', term).split() if word)
+    return ' '.join(f'+{word}*' for word in words)
+
+
+class TaskSearchFilter(SearchFilter):
+    """
+    ``?search=`` backed by the FULLTEXT indexes on task title/description and
+    comment content (see migration 0004).
+
+    On MySQL every term is matched as a prefix against the indexed columns.
+    The ids of matching tasks and of tasks with matching comments come from
+    one index lookup each, in a subquery joined to the visible tasks, and
+    only those tasks are ranked by relevance unless the client asks for
+    another ordering.
+    InnoDB keeps the indexes current on every insert, update and delete.
+    Other backends use the default ``icontains`` search.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms or connection.vendor != 'mysql':
+            return super().filter_queryset(request, queryset, view)
+
+        indexed = [term for term in terms if len(term) >= MIN_TOKEN_LENGTH]
+        short = [term for term in terms if len(term) < MIN_TOKEN_LENGTH]
+        query = boolean_query(indexed)
+        if not query:
+            return super().filter_queryset(request, queryset, view)
+
+        queryset = queryset.filter(id__in=RawSQL(MATCHING_TASK_IDS, [query, query])).annotate(
+            search_rank=RawSQL(TASK_MATCH, [query], output_field=FloatField())
+        )
+
+        for term in short:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+
+        if not request.query_params.get('ordering'):
+            queryset = queryset.order_by('-search_rank', '-created_at', '-id')
+        return queryset
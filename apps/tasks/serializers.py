@@ -1,10 +1,19 @@
 """Serializers for Task API."""
 from rest_framework import serializers
+from django.contrib.auth import get_user_model
+from django.db import models
 from .models import Task, Comment
+from apps.projects.models import Board
 from apps.users.serializers import UserSerializer
+from apps.utils.fieldsets import COLLAPSE_PK, FlexFieldsMixin
 
+User = get_user_model()
 
-class CommentSerializer(serializers.ModelSerializer):
+# Upper bound on operations accepted by one bulk request
+BULK_MAX_OPERATIONS = 500
+
+
+class CommentSerializer(FlexFieldsMixin, serializers.ModelSerializer):
     """Serializer for comments."""
     author = UserSerializer(read_only=True)
 
@@ -12,13 +21,13 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
         fields = ['id', 'task', 'author', 'content', 'created_at', 'updated_at']
         read_only_fields = ['id', 'author', 'created_at', 'updated_at']
+        expandable_fields = {'author': COLLAPSE_PK}
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(FlexFieldsMixin, serializers.ModelSerializer):
     """Serializer for tasks."""
     assignee_detail = UserSerializer(source='assignee', read_only=True)
     reporter_detail = UserSerializer(source='reporter', read_only=True)
-    comment_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Task
@@ -29,9 +38,10 @@ class TaskSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'completed_at'
         ]
         read_only_fields = [
-            'id', 'reporter', 'sla_breached', 'created_at',
-            'updated_at', 'completed_at'
+            'id', 'reporter', 'sla_breached', 'comment_count',
+            'created_at', 'updated_at', 'completed_at'
         ]
+        expandable_fields = {'assignee_detail': None, 'reporter_detail': None}
 
     def create(self, validated_data):
         validated_data['reporter'] = self.context['request'].user
@@ -43,4 +53,104 @@ class TaskDetailSerializer(TaskSerializer):
     comments = CommentSerializer(many=True, read_only=True)
 
     class Meta(TaskSerializer.Meta):
-        fields = TaskSerializer.Meta.fields + ['comments']
\ No newline at end of file
+        fields = TaskSerializer.Meta.fields + ['comments']
+        expandable_fields = {**TaskSerializer.Meta.expandable_fields, 'comments': None}
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field that resolves ids from a ``{pk: instance}`` map in the
+    serializer context, so validating many payloads costs no query per item.
+    Falls back to a regular lookup when the map is absent.
+    """
+
+    def __init__(self, context_key, **kwargs):
+        self.context_key = context_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get(self.context_key)
+        if preloaded is None:
+            return super().to_internal_value(data)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if pk not in preloaded:
+            self.fail('does_not_exist', pk_value=data)
+        return preloaded[pk]
+
+
+class BulkTaskDataSerializer(TaskSerializer):
+    """Task payload validation for bulk operations."""
+    board = PreloadedPrimaryKeyRelatedField('boards', queryset=Board.objects.all())
+    assignee = PreloadedPrimaryKeyRelatedField(
+        'users',
+        queryset=User.objects.all(),
+        allow_null=True,
+        required=False
+    )
+
+
+class BulkTaskOperationListSerializer(serializers.ListSerializer):
+    """
+    Validates each operation independently, so one bad item is reported in
+    its result instead of rejecting the whole batch.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            raise serializers.ValidationError({
+                'non_field_errors': ['Expected a list of operations.']
+            })
+        if not data:
+            raise serializers.ValidationError({
+                'non_field_errors': ['At least one operation is required.']
+            })
+        if len(data) > BULK_MAX_OPERATIONS:
+            raise serializers.ValidationError({
+                'non_field_errors': [f'At most {BULK_MAX_OPERATIONS} operations are allowed.']
+            })
+
+        operations = []
+        for item in data:
+            try:
+                operations.append({'data': self.child.run_validation(item), 'errors': None})
+            except serializers.ValidationError as exc:
+                operations.append({'data': None, 'errors': exc.detail})
+        return operations
+
+
+class BulkTaskOperationSerializer(serializers.Serializer):
+    """A single create/update/move/assign operation in a bulk request."""
+
+    class Op(models.TextChoices):
+        CREATE = 'create', 'Create'
+        UPDATE = 'update', 'Update'
+        MOVE = 'move', 'Move'
+        ASSIGN = 'assign', 'Assign'
+
+    op = serializers.ChoiceField(choices=Op.choices)
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False)
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
+    assignee_id = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        list_serializer_class = BulkTaskOperationListSerializer
+
+    def validate(self, attrs):
+        op = attrs['op']
+        if op != self.Op.CREATE and 'id' not in attrs:
+            raise serializers.ValidationError({'id': ['This field is required.']})
+        if op in (self.Op.CREATE, self.Op.UPDATE) and 'data' not in attrs:
+            raise serializers.ValidationError({'data': ['This field is required.']})
+        if op == self.Op.MOVE and 'status' not in attrs:
+            raise serializers.ValidationError({'status': ['This field is required.']})
+        if op == self.Op.ASSIGN and 'assignee_id' not in attrs:
+            raise serializers.ValidationError({'assignee_id': ['This field is required.']})
+        return attrs
+
+
+class BulkTaskSerializer(serializers.Serializer):
+    """Envelope for ``POST /tasks/bulk/``."""
+    operations = BulkTaskOperationSerializer(many=True)
@@ -0,0 +1,161 @@
+"""Signals and handlers for task denormalizations and schedules."""
+import logging
+import threading
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_init, post_save, post_delete, pre_delete
+from django.dispatch import Signal, receiver
+
+from .models import Task, Comment
+from apps.projects.cache import bump_project_generations
+from apps.projects.models import Board
+
+logger = logging.getLogger(__name__)
+
+# Sent with ``task_ids`` once tasks have been flagged as SLA breached
+task_sla_breached = Signal()
+
+# Ids of the boards and tasks whose deletion is cascading in this thread
+_deleting = threading.local()
+
+
+@receiver(pre_delete, sender=Board)
+@receiver(pre_delete, sender=Task)
+def mark_deleting(sender, instance, **kwargs):
+    """Remember a board or task whose children are about to be deleted with it."""
+    _deleting.__dict__.setdefault(sender, set()).add(instance.pk)
+
+
+@receiver(post_delete, sender=Board)
+@receiver(post_delete, sender=Task)
+def unmark_deleting(sender, instance, **kwargs):
+    # Children are deleted, and their signals sent, before their parent
+    _deleting.__dict__.get(sender, set()).discard(instance.pk)
+
+
+def parent_deleted(instance):
+    """
+    Return whether a task's board or a comment's task is being deleted
+    along with it, so per-child work the parent's own handlers cover can be
+    skipped instead of costing a query per cascaded row.
+    """
+    if isinstance(instance, Comment):
+        return instance.task_id in _deleting.__dict__.get(Task, ())
+    if isinstance(instance, Task):
+        return instance.board_id in _deleting.__dict__.get(Board, ())
+    return False
+
+
+@receiver(post_init, sender=Comment)
+def remember_task(sender, instance, **kwargs):
+    """Keep the loaded task so a comment moved to another task can be recounted."""
+    instance._loaded_task_id = instance.__dict__.get('task_id')
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    """Count a new comment on its task, or move its count to the task it moved to."""
+    previous_task_id = getattr(instance, '_loaded_task_id', None)
+    instance._loaded_task_id = instance.task_id
+    if not created:
+        if previous_task_id is None or previous_task_id == instance.task_id:
+            return
+        Task.objects.filter(pk=previous_task_id, comment_count__gt=0).update(
+            comment_count=F('comment_count') - 1
+        )
+    Task.objects.filter(pk=instance.task_id).update(
+        comment_count=F('comment_count') + 1
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    """Uncount a deleted comment; cascades from its task's deletion need no count."""
+    if parent_deleted(instance):
+        return
+    Task.objects.filter(pk=instance.task_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1
+    )
+
+
+def task_project_id(task):
+    """Return the project id of a task, reading a loaded board when possible."""
+    board = task._state.fields_cache.get('board')
+    if board is not None:
+        return board.project_id
+    return Board.objects.filter(pk=task.board_id).values_list('project_id', flat=True).first()
+
+
+@receiver(post_init, sender=Task)
+def remember_board(sender, instance, **kwargs):
+    """Keep the loaded board so moves to another project can be detected on save."""
+    instance._loaded_board_id = instance.__dict__.get('board_id')
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, **kwargs):
+    """
+    Invalidate cached responses of the task's project, and of the project
+    it left when it was moved to a board of another one.
+    """
+    if parent_deleted(instance):
+        return
+    project_ids = [task_project_id(instance)]
+    previous_board_id = getattr(instance, '_loaded_board_id', None)
+    if previous_board_id is not None and previous_board_id != instance.board_id:
+        project_ids.append(
+            Board.objects.filter(pk=previous_board_id).values_list('project_id', flat=True).first()
+        )
+    instance._loaded_board_id = instance.board_id
+    bump_project_generations(*project_ids)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    """Invalidate cached responses of the comment's project."""
+    if parent_deleted(instance):
+        return
+    task = instance._state.fields_cache.get('task')
+    if task is not None:
+        project_id = task_project_id(task)
+    else:
+        project_id = Task.objects.filter(pk=instance.task_id).values_list(
+            'board__project_id', flat=True
+        ).first()
+    bump_project_generations(project_id)
+
+
+@receiver(post_save, sender=Task)
+def schedule_sla_check(sender, instance, **kwargs):
+    """Keep the task's due date in the SLA schedule once the save commits."""
+    from . import sla
+
+    args = (instance.pk, instance.due_date, instance.status, instance.sla_breached)
+
+    def update_schedule():
+        try:
+            sla.schedule_task(*args)
+        except Exception as e:
+            # The hourly reconciler picks up anything missed here
+            logger.error(f"Failed to update SLA schedule for task {args[0]}: {str(e)}")
+
+    transaction.on_commit(update_schedule)
+
+
+@receiver(post_delete, sender=Task)
+def unschedule_sla_check(sender, instance, **kwargs):
+    """Drop a deleted task from the SLA schedule."""
+    from . import sla
+
+    task_id = instance.pk
+
+    def update_schedule():
+        try:
+            sla.unschedule_task(task_id)
+        except Exception as e:
+            logger.error(f"Failed to update SLA schedule for task {task_id}: {str(e)}")
+
+    transaction.on_commit(update_schedule)
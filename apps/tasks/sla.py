@@ -0,0 +1,139 @@
+"""Due-date schedule for incremental SLA breach detection.
+
+Open tasks with a due date are kept in a Redis sorted set scored by their
+due timestamp. A minute-level beat task pops only the members whose score
+has passed, so breaches are detected within about a minute without scanning
+the tasks table. Members are read and removed by one script, so overlapping
+runs never claim the same task. ``check_sla_breaches`` keeps running hourly as a reconciler
+for anything the schedule missed (bulk updates, Redis data loss).
+"""
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from apps.projects.cache import bump_project_generations
+from .models import Task
+from .signals import task_sla_breached
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_KEY = 'sla:due'
+SLA_STATUSES = [Task.Status.BACKLOG, Task.Status.TODO, Task.Status.IN_PROGRESS]
+# Members popped from the schedule per round trip
+BATCH_SIZE = 1000
+
+# KEYS[1]: schedule; ARGV: cutoff score, max members
+TAKE_DUE_SCRIPT = """
+local members = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+if #members > 0 then
+    redis.call('ZREM', KEYS[1], unpack(members))
+end
+return members
+"""
+
+_take_due = None
+
+
+def get_redis():
+    return get_redis_connection('default')
+
+
+def is_tracked(task):
+    return bool(task.due_date) and task.status in SLA_STATUSES and not task.sla_breached
+
+
+def schedule_task(task_id, due_date, status, sla_breached):
+    """Add, move or remove a task in the due-date schedule."""
+    redis = get_redis()
+    if due_date and status in SLA_STATUSES and not sla_breached:
+        redis.zadd(SCHEDULE_KEY, {task_id: due_date.timestamp()})
+    else:
+        redis.zrem(SCHEDULE_KEY, task_id)
+
+
+def unschedule_task(task_id):
+    get_redis().zrem(SCHEDULE_KEY, task_id)
+
+
+def mark_breached(task_ids):
+    """
+    Flag the given tasks as breached and emit ``task_sla_breached``.
+
+    Rows are re-checked under a lock so a task completed or rescheduled in
+    the meantime is left alone. Returns the ids that were flagged.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        breached = list(
+            Task.objects.select_for_update()
+            .filter(id__in=task_ids, due_date__lt=now, status__in=SLA_STATUSES, sla_breached=False)
+            .order_by()
+            .values_list('id', flat=True)
+        )
+        if breached:
+            # updated_at moves with the flag so board ETags and feed versions change
+            Task.objects.filter(id__in=breached).update(sla_breached=True, updated_at=now)
+            bump_project_generations(*Task.objects.filter(id__in=breached).values_list(
+                'board__project_id', flat=True
+            ).order_by().distinct())
+            transaction.on_commit(
+                lambda: task_sla_breached.send(sender=Task, task_ids=breached)
+            )
+    return breached
+
+
+def take_due(cutoff, limit):
+    """Atomically remove and return up to ``limit`` members due by ``cutoff``."""
+    global _take_due
+    redis = get_redis()
+    if _take_due is None:
+        _take_due = redis.register_script(TAKE_DUE_SCRIPT)
+    return _take_due(keys=[SCHEDULE_KEY], args=[cutoff, limit])
+
+
+def process_due_tasks(now=None):
+    """
+    Flag every scheduled task whose due date has passed.
+
+    Claimed members leave the schedule before they are checked; a task whose
+    due date moved forward meanwhile fails the re-check in ``mark_breached``
+    and has been re-added with its new score. Members lost to a failed run
+    are picked up by the hourly reconciler.
+    """
+    cutoff = (now or timezone.now()).timestamp()
+    breached = []
+
+    while True:
+        members = take_due(cutoff, BATCH_SIZE)
+        if not members:
+            break
+        breached.extend(mark_breached([int(member) for member in members]))
+        if len(members) < BATCH_SIZE:
+            break
+
+    return breached
+
+
+def rebuild_schedule():
+    """Repopulate the schedule from the database."""
+    redis = get_redis()
+    redis.delete(SCHEDULE_KEY)
+    tracked = (
+        Task.objects.filter(due_date__isnull=False, status__in=SLA_STATUSES, sla_breached=False)
+        .order_by()
+        .values_list('id', 'due_date')
+    )
+    batch = {}
+    count = 0
+    for task_id, due_date in tracked.iterator(chunk_size=BATCH_SIZE):
+        batch[task_id] = due_date.timestamp()
+        if len(batch) == BATCH_SIZE:
+            redis.zadd(SCHEDULE_KEY, batch)
+            count += len(batch)
+            batch = {}
+    if batch:
+        redis.zadd(SCHEDULE_KEY, batch)
+        count += len(batch)
+    return count
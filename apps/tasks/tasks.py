@@ -1,6 +1,5 @@
 """Celery tasks for async operations."""
 from celery import shared_task
-from django.core.mail import send_mail
 from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
@@ -10,153 +9,224 @@ logger = logging.getLogger(__name__)
 
 
 @shared_task
-def send_task_assignment_email(task_id, user_id):
-    """Send email when task is assigned."""
+def check_sla_breaches():
+    """Reconcile SLA breaches missed by the incremental schedule."""
     from .models import Task
-    from django.contrib.auth import get_user_model
+    from .sla import BATCH_SIZE, SLA_STATUSES, mark_breached
 
-    User = get_user_model()
+    now = timezone.now()
+    overdue_ids = list(
+        Task.objects.filter(
+            due_date__lt=now,
+            status__in=SLA_STATUSES,
+            sla_breached=False
+        ).order_by().values_list('id', flat=True)
+    )
 
-    try:
-        task = Task.objects.select_related('board__project', 'reporter').get(id=task_id)
-        user = User.objects.get(id=user_id)
+    count = 0
+    for start in range(0, len(overdue_ids), BATCH_SIZE):
+        count += len(mark_breached(overdue_ids[start:start + BATCH_SIZE]))
+    logger.info(f"Marked {count} tasks as SLA breached")
 
-        subject = f'New Task Assigned: {task.title}'
-        message = f"""
-        Hello {user.get_full_name() or user.username},
+    return count
 
-        You have been assigned a new task:
 
-        Task: {task.title}
-        Project: {task.board.project.name}
-        Board: {task.board.name}
-        Priority: {task.get_priority_display()}
-        Reporter: {task.reporter.get_full_name() or task.reporter.username}
+@shared_task
+def process_sla_schedule():
+    """Flag tasks whose due date passed since the last tick."""
+    from .sla import process_due_tasks
 
-        {'Due Date: ' + task.due_date.strftime('%Y-%m-%d %H:%M') if task.due_date else ''}
+    breached = process_due_tasks()
+    if breached:
+        logger.info(f"Marked {len(breached)} tasks as SLA breached")
 
-        Description:
-        {task.description}
+    return len(breached)
 
-        Please check the task management system for more details.
-        """
 
-        send_mail(
-            subject,
-            message,
-            settings.EMAIL_HOST_USER,
-            [user.email],
-            fail_silently=False,
-        )
+@shared_task
+def rebuild_sla_schedule():
+    """Repopulate the SLA schedule from the database."""
+    from .sla import rebuild_schedule
+
+    count = rebuild_schedule()
+    logger.info(f"Scheduled {count} tasks for SLA checks")
+
+    return count
 
-        logger.info(f"Task assignment email sent to {user.email} for task {task_id}")
 
-    except Exception as e:
-        logger.error(f"Failed to send task assignment email: {str(e)}")
+# Users handled by one send_daily_task_summary_batch task
+SUMMARY_BATCH_SIZE = 500
+# Overdue tasks listed in each summary
+SUMMARY_OVERDUE_LIMIT = 5
 
 
 @shared_task
-def check_sla_breaches():
-    """Check for overdue tasks and mark SLA breaches."""
+def send_daily_task_summary():
+    """Fan daily task summaries out to batches of users with active tasks."""
     from .models import Task
 
-    now = timezone.now()
-    overdue_tasks = Task.objects.filter(
-        due_date__lt=now,
-        status__in=[Task.Status.BACKLOG, Task.Status.TODO, Task.Status.IN_PROGRESS],
-        sla_breached=False
+    assignee_ids = (
+        Task.objects.filter(
+            assignee__is_active=True,
+            status__in=[Task.Status.TODO, Task.Status.IN_PROGRESS]
+        )
+        .order_by('assignee_id')
+        .values_list('assignee_id', flat=True)
+        .distinct()
     )
 
-    count = overdue_tasks.update(sla_breached=True)
-    logger.info(f"Marked {count} tasks as SLA breached")
+    batches = 0
+    batch = []
+    for assignee_id in assignee_ids.iterator(chunk_size=SUMMARY_BATCH_SIZE):
+        batch.append(assignee_id)
+        if len(batch) == SUMMARY_BATCH_SIZE:
+            send_daily_task_summary_batch.delay(batch)
+            batches += 1
+            batch = []
+    if batch:
+        send_daily_task_summary_batch.delay(batch)
+        batches += 1
 
-    return count
+    logger.info(f"Queued daily summaries in {batches} batches")
+
+    return batches
 
 
 @shared_task
-def send_daily_task_summary():
-    """Send daily task summary to users."""
+def send_daily_task_summary_batch(user_ids):
+    """
+    Send daily task summaries to a batch of users.
+
+    Totals for every user in the batch come from one grouped aggregate, the
+    overdue listings from one windowed query, and all messages go out over a
+    single mail connection.
+    """
     from .models import Task
     from django.contrib.auth import get_user_model
+    from django.core.mail import EmailMessage, get_connection
+    from django.db.models import Count, F, Q, Window
+    from django.db.models.functions import RowNumber
 
     User = get_user_model()
 
-    for user in User.objects.filter(is_active=True):
-        # Get user's tasks
-        tasks = Task.objects.filter(
-            assignee=user,
-            status__in=[Task.Status.TODO, Task.Status.IN_PROGRESS]
-        ).select_related('board__project')
+    now = timezone.now()
+    day_start = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    day_end = day_start + timedelta(days=1)
+
+    active = Task.objects.filter(
+        assignee_id__in=user_ids,
+        status__in=[Task.Status.TODO, Task.Status.IN_PROGRESS]
+    ).order_by()
+
+    stats = {
+        row['assignee_id']: row
+        for row in active.values('assignee_id').annotate(
+            total=Count('id'),
+            overdue=Count('id', filter=Q(due_date__lt=now)),
+            due_today=Count('id', filter=Q(due_date__gte=day_start, due_date__lt=day_end)),
+            high_priority=Count(
+                'id',
+                filter=Q(priority__in=[Task.Priority.HIGH, Task.Priority.CRITICAL])
+            ),
+        )
+    }
+
+    overdue = {}
+    overdue_rows = (
+        active.filter(due_date__lt=now)
+        .annotate(position=Window(
+            RowNumber(),
+            partition_by=[F('assignee_id')],
+            order_by=F('created_at').desc(),
+        ))
+        .filter(position__lte=SUMMARY_OVERDUE_LIMIT)
+        .values_list('assignee_id', 'title', 'due_date')
+        .order_by('assignee_id', 'position')
+    )
+    for assignee_id, title, due_date in overdue_rows:
+        overdue.setdefault(assignee_id, []).append((title, due_date))
 
-        if not tasks.exists():
-            continue
+    users = User.objects.filter(id__in=stats.keys(), is_active=True).only(
+        'id', 'email', 'username', 'first_name', 'last_name'
+    )
 
-        # Categorize tasks
-        overdue = tasks.filter(due_date__lt=timezone.now())
-        due_today = tasks.filter(
-            due_date__date=timezone.now().date()
-        )
-        high_priority = tasks.filter(priority__in=[Task.Priority.HIGH, Task.Priority.CRITICAL])
+    subject = f'Daily Task Summary - {now.strftime("%Y-%m-%d")}'
+    messages = [
+        (user, EmailMessage(
+            subject,
+            render_daily_summary(user, stats[user.id], overdue.get(user.id, [])),
+            settings.EMAIL_HOST_USER,
+            [user.email],
+        ))
+        for user in users
+    ]
 
-        subject = f'Daily Task Summary - {timezone.now().strftime("%Y-%m-%d")}'
-        message = f"""
+    sent = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+        for user, message in messages:
+            try:
+                sent += connection.send_messages([message]) or 0
+                logger.info(f"Daily summary sent to {user.email}")
+            except Exception as e:
+                logger.error(f"Failed to send daily summary to {user.email}: {str(e)}")
+    finally:
+        connection.close()
+
+    return sent
+
+
+def render_daily_summary(user, stats, overdue):
+    """Render the daily summary body from precomputed counts."""
+    overdue_lines = chr(10).join(
+        f"- {title} (Due: {due_date.strftime('%Y-%m-%d')})" for title, due_date in overdue
+    )
+    return f"""
         Hello {user.get_full_name() or user.username},
 
         Here's your daily task summary:
 
-        Total Active Tasks: {tasks.count()}
-        Overdue Tasks: {overdue.count()}
-        Due Today: {due_today.count()}
-        High Priority: {high_priority.count()}
+        Total Active Tasks: {stats['total']}
+        Overdue Tasks: {stats['overdue']}
+        Due Today: {stats['due_today']}
+        High Priority: {stats['high_priority']}
 
-        {'Overdue Tasks:' if overdue.exists() else ''}
-        {chr(10).join([f"- {task.title} (Due: {task.due_date.strftime('%Y-%m-%d')})" for task in overdue[:5]])}
+        {'Overdue Tasks:' if stats['overdue'] else ''}
+        {overdue_lines}
 
         Please review and update your tasks in the system.
         """
 
-        try:
-            send_mail(
-                subject,
-                message,
-                settings.EMAIL_HOST_USER,
-                [user.email],
-                fail_silently=False,
-            )
-            logger.info(f"Daily summary sent to {user.email}")
-        except Exception as e:
-            logger.error(f"Failed to send daily summary to {user.email}: {str(e)}")
+
+@shared_task
+def export_to_file(view_path, user_id, query_string, export_format):
+    """Write an export too large to stream to a gzip-compressed file."""
+    import uuid
+    from apps.utils.export import build_export_view, write_export_file
+
+    view, queryset = build_export_view(view_path, user_id, query_string)
+    name = f'{view.export_name}_{user_id}_{timezone.now():%Y%m%d%H%M%S}_{uuid.uuid4().hex[:8]}'
+    path, count = write_export_file(queryset, list(view.export_columns), export_format, name)
+    logger.info(f"Exported {count} rows to {path}")
+
+    return {'path': str(path), 'rows': count, 'user_id': user_id}
 
 
 @shared_task
-def send_webhook_notification(task_id, event_type):
-    """Send webhook notification for task events."""
-    import requests
-    from .models import Task
+def purge_exports():
+    """Delete export files written more than EXPORT_RETENTION_HOURS ago."""
+    from pathlib import Path
 
-    try:
-        task = Task.objects.select_related('board__project', 'assignee', 'reporter').get(id=task_id)
-
-        # This is a placeholder - in production, you'd have webhook URLs configured per project
-        webhook_url = "https://your-webhook-endpoint.com/notifications"
-
-        payload = {
-            'event': event_type,
-            'task': {
-                'id': task.id,
-                'title': task.title,
-                'status': task.status,
-                'priority': task.priority,
-                'assignee': task.assignee.email if task.assignee else None,
-                'project': task.board.project.name,
-            },
-            'timestamp': timezone.now().isoformat()
-        }
-
-        response = requests.post(webhook_url, json=payload, timeout=5)
-        response.raise_for_status()
-
-        logger.info(f"Webhook sent for task {task_id}: {event_type}")
-
-    except Exception as e:
-        logger.error(f"Failed to send webhook for task {task_id}: {str(e)}")
\ No newline at end of file
+    cutoff = (timezone.now() - timedelta(hours=settings.EXPORT_RETENTION_HOURS)).timestamp()
+    deleted = 0
+    for path in Path(settings.EXPORT_DIR).glob('*.gz*'):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                deleted += 1
+        except FileNotFoundError:
+            continue
+    logger.info(f"Purged {deleted} export files")
+
+    return deleted
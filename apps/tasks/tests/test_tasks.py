@@ -1,15 +1,27 @@
 """Tests for Task API."""
 import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncClient
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
-from apps.projects.models import Project, Board
-from apps.tasks.models import Task
+from apps.projects.models import Project, ProjectMember, Board
+from apps.tasks.models import Task, Comment
 
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cached project access must not leak between tests reusing user ids."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -139,6 +151,26 @@ class TestTaskAPI:
         assert response.status_code == status.HTTP_204_NO_CONTENT
         assert not Task.objects.filter(id=task.id).exists()
 
+    def test_list_follows_membership_changes(self, api_client, task, admin_user, django_capture_on_commit_callbacks):
+        """Test cached project access is invalidated on membership changes."""
+        outsider = User.objects.create_user(
+            username='outsider',
+            email='outsider@example.com',
+            password='outsiderpass123'
+        )
+        api_client.force_authenticate(user=outsider)
+        url = reverse('task-list')
+
+        assert api_client.get(url).data['results'] == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            member = ProjectMember.objects.create(project=task.board.project, user=outsider)
+        assert [t['id'] for t in api_client.get(url).data['results']] == [task.id]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            member.delete()
+        assert api_client.get(url).json()['results'] == []
+
     def test_unauthorized_access(self, api_client, task):
         """Test unauthorized access is denied."""
         url = reverse('task-list')
@@ -147,6 +179,95 @@ class TestTaskAPI:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+@pytest.mark.django_db
+class TestProjectPermissions:
+    """Test cached project role resolution."""
+
+    @pytest.fixture
+    def member(self, project):
+        user = User.objects.create_user(
+            username='member',
+            email='member@example.com',
+            password='memberpass123'
+        )
+        ProjectMember.objects.create(project=project, user=user)
+        return user
+
+    def test_role_is_cached(self, member, project, django_assert_num_queries):
+        """Test a warm role lookup costs no queries."""
+        from apps.projects.access import get_project_role
+
+        assert get_project_role(member, project.id) == ProjectMember.Role.MEMBER
+        with django_assert_num_queries(0):
+            assert get_project_role(member, project.id) == ProjectMember.Role.MEMBER
+
+    def test_role_follows_membership_changes(self, member, project, django_capture_on_commit_callbacks):
+        """Test role changes and removal invalidate the cached role."""
+        from apps.projects.access import get_project_role
+
+        assert get_project_role(member, project.id) == ProjectMember.Role.MEMBER
+        membership = ProjectMember.objects.get(project=project, user=member)
+        membership.role = ProjectMember.Role.ADMIN
+        with django_capture_on_commit_callbacks(execute=True):
+            membership.save()
+        assert get_project_role(member, project.id) == ProjectMember.Role.ADMIN
+
+        with django_capture_on_commit_callbacks(execute=True):
+            membership.delete()
+        assert get_project_role(member, project.id) is None
+
+    def test_revocation_inside_transaction(self, member, project, django_capture_on_commit_callbacks):
+        """Test a role read concurrently with a revocation is not cached past its commit."""
+        from django.db import transaction
+        from apps.projects.access import _role_key, get_membership_version, get_project_role
+
+        version = get_membership_version(member.pk)
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                ProjectMember.objects.filter(project=project, user=member).delete()
+                assert get_membership_version(member.pk) == version
+                # What another request still reads from the committed rows
+                cache.set(_role_key(member.pk, version, project.id), ProjectMember.Role.MEMBER)
+
+        assert get_membership_version(member.pk) != version
+        assert get_project_role(member, project.id) is None
+
+    def test_role_follows_ownership_change(self, member, user, project, django_capture_on_commit_callbacks):
+        """Test transferring ownership updates both users' roles."""
+        from apps.projects.access import OWNER_ROLE, get_project_role
+
+        assert get_project_role(user, project.id) == OWNER_ROLE
+        with django_capture_on_commit_callbacks(execute=True):
+            ProjectMember.objects.filter(user=member).delete()
+            project.owner = member
+            project.save()
+
+        assert get_project_role(member, project.id) == OWNER_ROLE
+        assert get_project_role(user, project.id) is None
+
+    def test_member_can_comment_without_admin_rights(self, api_client, member, task):
+        """Test object-level checks resolve the project through the board."""
+        api_client.force_authenticate(user=member)
+        url = reverse('task-add-comment', kwargs={'pk': task.id})
+        response = api_client.post(url, {'content': 'Hello'}, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_comment_detail_loads_project_with_comment(
+        self, api_client, member, task, django_assert_num_queries
+    ):
+        """Test comment permissions resolve the project without lazy loads."""
+        comment = Comment.objects.create(task=task, author=member, content='Hello')
+        api_client.force_authenticate(user=member)
+        url = reverse('comment-detail', kwargs={'pk': comment.id})
+        api_client.get(url)
+
+        # The comment joined to its task, board and project
+        with django_assert_num_queries(1):
+            response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+
+
 @pytest.mark.django_db
 class TestTaskModel:
     """Test Task model."""
@@ -171,6 +292,939 @@ class TestTaskModel:
 
         assert task.completed_at is not None
 
+    def test_comment_count_maintained(self, task, user):
+        """Test comment_count follows comment creation and deletion."""
+        comment = Comment.objects.create(task=task, author=user, content='First')
+        Comment.objects.create(task=task, author=user, content='Second')
+        task.refresh_from_db()
+        assert task.comment_count == 2
+
+        comment.delete()
+        task.refresh_from_db()
+        assert task.comment_count == 1
+
+    def test_comment_count_follows_moved_comment(self, api_client, board, task, user):
+        """Test moving a comment to another task moves its count too."""
+        other = Task.objects.create(title='Other', board=board, reporter=user)
+        comment = Comment.objects.create(task=task, author=user, content='Misplaced')
+        api_client.force_authenticate(user=user)
+
+        response = api_client.patch(
+            reverse('comment-detail', kwargs={'pk': comment.id}), {'task': other.id}, format='json'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        task.refresh_from_db()
+        other.refresh_from_db()
+        assert (task.comment_count, other.comment_count) == (0, 1)
+
+    def test_save_does_not_overwrite_comment_count(self, task, user):
+        """Test a stale instance save keeps the stored comment_count."""
+        Comment.objects.create(task=task, author=user, content='Concurrent')
+        task.title = 'Renamed'
+        task.save()
+
+        task.refresh_from_db()
+        assert task.comment_count == 1
+
+    def test_save_leaves_deferred_fields_unloaded(self, task):
+        """Test saving a partially loaded task does not fetch deferred fields."""
+        partial = Task.objects.defer('description').get(pk=task.pk)
+        partial.title = 'Renamed'
+        partial.save()
+
+        assert 'description' not in partial.__dict__
+        task.refresh_from_db()
+        assert task.title == 'Renamed'
+
+    def test_reconcile_comment_counts(self, task, user):
+        """Test the reconcile command repairs drifted counts."""
+        from django.core.management import call_command
+
+        Comment.objects.create(task=task, author=user, content='Hello')
+        Task.objects.filter(pk=task.pk).update(comment_count=7)
+
+        call_command('reconcile_comment_counts', batch_size=1)
+
+        task.refresh_from_db()
+        assert task.comment_count == 1
+
     def test_task_string_representation(self, task):
         """Test task __str__ method."""
-        assert str(task) == task.title
\ No newline at end of file
+        assert str(task) == task.title
+
+@pytest.mark.django_db
+class TestTaskCursorPagination:
+    """Test opt-in keyset pagination on the task list."""
+
+    @pytest.fixture
+    def tasks(self, board, user):
+        return [
+            Task.objects.create(title=f'Task {i}', board=board, reporter=user)
+            for i in range(5)
+        ]
+
+    def test_cursor_walks_all_pages_without_count(self, api_client, user, tasks):
+        """Test following next links visits every task exactly once."""
+        api_client.force_authenticate(user=user)
+        url = reverse('task-list')
+
+        response = api_client.get(url, {'cursor': '', 'page_size': 2})
+        seen = []
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            assert 'count' not in response.data
+            seen.extend(item['id'] for item in response.data['results'])
+            if not response.data['next']:
+                break
+            response = api_client.get(response.data['next'])
+
+        assert seen == [task.id for task in reversed(tasks)]
+
+    def test_page_size_only_applies_to_cursor_pages(self, api_client, user, tasks):
+        """Test page-number pagination ignores page_size."""
+        api_client.force_authenticate(user=user)
+        response = api_client.get(reverse('task-list'), {'page_size': 2})
+
+        assert response.data['count'] == 5
+        assert len(response.data['results']) == 5
+
+    def test_cursor_previous_link(self, api_client, user, tasks):
+        """Test the previous link returns the preceding page."""
+        api_client.force_authenticate(user=user)
+        url = reverse('task-list')
+
+        first = api_client.get(url, {'cursor': '', 'page_size': 2})
+        second = api_client.get(first.data['next'])
+        previous = api_client.get(second.data['previous'])
+
+        assert [t['id'] for t in previous.data['results']] == [t['id'] for t in first.data['results']]
+
+    def test_cursor_count_on_request(self, api_client, user, tasks):
+        """Test count is only included when asked for."""
+        api_client.force_authenticate(user=user)
+        url = reverse('task-list')
+
+        response = api_client.get(url, {'cursor': '', 'count': 'true'})
+
+        assert response.data['count'] == len(tasks)
+
+    def test_invalid_cursor(self, api_client, user, tasks):
+        """Test a malformed cursor is rejected."""
+        api_client.force_authenticate(user=user)
+        url = reverse('task-list')
+
+        response = api_client.get(url, {'cursor': 'not-a-cursor'})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestDailySummary:
+    """Test the batched daily summary task."""
+
+    def test_batch_sends_one_summary_per_assignee(
+        self, board, user, admin_user, mailoutbox, django_assert_max_num_queries
+    ):
+        """Test summaries are computed with a fixed number of queries."""
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.tasks.tasks import send_daily_task_summary_batch
+
+        yesterday = timezone.now() - timedelta(days=1)
+        for assignee in (user, admin_user):
+            Task.objects.create(
+                title=f'Overdue for {assignee.username}', board=board, reporter=user,
+                assignee=assignee, status=Task.Status.TODO, due_date=yesterday,
+                priority=Task.Priority.HIGH
+            )
+            Task.objects.create(
+                title='Open', board=board, reporter=user,
+                assignee=assignee, status=Task.Status.IN_PROGRESS
+            )
+        Task.objects.create(title='Finished', board=board, reporter=user, assignee=user,
+                            status=Task.Status.DONE)
+
+        with django_assert_max_num_queries(3):
+            sent = send_daily_task_summary_batch([user.id, admin_user.id])
+
+        assert sent == 2
+        body = next(m.body for m in mailoutbox if m.to == [user.email])
+        assert 'Total Active Tasks: 2' in body
+        assert 'Overdue Tasks: 1' in body
+        assert 'High Priority: 1' in body
+        assert f'- Overdue for {user.username}' in body
+
+
+class FakeSortedSet:
+    """Minimal in-memory stand-in for the Redis sorted set commands used by sla."""
+
+    def __init__(self):
+        self.scores = {}
+
+    def zadd(self, key, mapping):
+        self.scores.update({str(member).encode(): score for member, score in mapping.items()})
+
+    def zrem(self, key, *members):
+        for member in members:
+            self.scores.pop(str(member).encode() if not isinstance(member, bytes) else member, None)
+
+    def register_script(self, script):
+        from apps.tasks.sla import TAKE_DUE_SCRIPT
+        assert script == TAKE_DUE_SCRIPT
+
+        def take_due(keys, args):
+            cutoff, limit = args
+            due = sorted((score, member) for member, score in self.scores.items() if score <= cutoff)
+            members = [member for _, member in due][:limit]
+            for member in members:
+                del self.scores[member]
+            return members
+
+        return take_due
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSLASchedule:
+    """Test incremental SLA breach detection."""
+
+    @pytest.fixture
+    def redis(self, monkeypatch):
+        from apps.tasks import sla
+        fake = FakeSortedSet()
+        monkeypatch.setattr(sla, 'get_redis', lambda: fake)
+        monkeypatch.setattr(sla, '_take_due', None)
+        return fake
+
+    def test_due_tasks_are_flagged_and_announced(self, redis, board, user):
+        """Test only tasks past their due date are breached and emitted."""
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.tasks import sla
+        from apps.tasks.signals import task_sla_breached
+
+        now = timezone.now()
+        late = Task.objects.create(title='Late', board=board, reporter=user,
+                                   due_date=now - timedelta(minutes=1))
+        future = Task.objects.create(title='Future', board=board, reporter=user,
+                                     due_date=now + timedelta(hours=1))
+        done = Task.objects.create(title='Done', board=board, reporter=user,
+                                   status=Task.Status.DONE, due_date=now - timedelta(minutes=1))
+        assert set(redis.scores) == {str(late.id).encode(), str(future.id).encode()}
+
+        events = []
+        receiver = lambda sender, task_ids, **kwargs: events.extend(task_ids)
+        task_sla_breached.connect(receiver)
+        try:
+            breached = sla.process_due_tasks()
+        finally:
+            task_sla_breached.disconnect(receiver)
+
+        assert breached == [late.id] == events
+        assert Task.objects.get(pk=late.pk).sla_breached
+        assert not Task.objects.get(pk=done.pk).sla_breached
+        assert set(redis.scores) == {str(future.id).encode()}
+
+    def test_overlapping_runs_claim_each_task_once(self, redis, board, user):
+        """Test due tasks claimed by one run are not processed by another."""
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.tasks import sla
+
+        now = timezone.now()
+        tasks = [
+            Task.objects.create(title=f'Late {i}', board=board, reporter=user,
+                                due_date=now - timedelta(minutes=i + 1))
+            for i in range(3)
+        ]
+
+        claimed = sla.take_due(now.timestamp(), 2)
+        breached = sla.process_due_tasks(now)
+
+        assert sorted(int(member) for member in claimed) == sorted(t.id for t in tasks[1:])
+        assert breached == [tasks[0].id]
+        assert redis.scores == {}
+
+    def test_breach_changes_board_etag(self, redis, board, user):
+        """Test flagging a breach moves updated_at, so snapshots are not revalidated as fresh."""
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.projects.snapshot import board_etag
+        from apps.tasks import sla
+
+        late = Task.objects.create(title='Late', board=board, reporter=user,
+                                   due_date=timezone.now() - timedelta(minutes=1))
+        etag = board_etag(board)
+
+        assert sla.mark_breached([late.id]) == [late.id]
+        assert Task.objects.get(pk=late.pk).updated_at > late.updated_at
+        assert board_etag(board) != etag
+
+
+@pytest.mark.django_db
+class TestBulkTaskAPI:
+    """Test the bulk task operations endpoint."""
+
+    def test_bulk_operations_report_per_item_results(
+        self, api_client, user, admin_user, board, task, django_assert_max_num_queries
+    ):
+        """Test mixed operations are applied with a bounded number of queries."""
+        api_client.force_authenticate(user=user)
+        url = reverse('task-bulk')
+        operations = [
+            {'op': 'create', 'data': {'title': f'Imported {i}', 'board': board.id}}
+            for i in range(3)
+        ] + [
+            {'op': 'move', 'id': task.id, 'status': Task.Status.DONE},
+            {'op': 'assign', 'id': task.id, 'assignee_id': admin_user.id},
+            {'op': 'create', 'data': {'title': 'No board'}},
+            {'op': 'move', 'id': 999999, 'status': Task.Status.DONE},
+        ]
+
+        with django_assert_max_num_queries(13):
+            response = api_client.post(url, {'operations': operations}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.data['results']
+        assert [r['status'] for r in results] == ['ok'] * 5 + ['error'] * 2
+        assert 'board' in results[5]['errors']
+        assert Task.objects.filter(title__startswith='Imported', reporter=user).count() == 3
+
+        task.refresh_from_db()
+        assert task.status == Task.Status.DONE
+        assert task.completed_at is not None
+        assert task.assignee == admin_user
+
+    def test_bulk_queries_do_not_grow_with_operations(self, api_client, user, admin_user, board):
+        """Test moves and updates over many tasks cost as many queries as over a few."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        tasks = [Task.objects.create(title=f'Task {i}', board=board, reporter=user) for i in range(23)]
+        api_client.force_authenticate(user=user)
+
+        def run(batch):
+            operations = [
+                operation
+                for task in batch
+                for operation in (
+                    {'op': 'move', 'id': task.id, 'status': Task.Status.DONE},
+                    {'op': 'update', 'id': task.id, 'data': {'priority': Task.Priority.HIGH}},
+                    {'op': 'assign', 'id': task.id, 'assignee_id': admin_user.id},
+                )
+            ]
+            with CaptureQueriesContext(connection) as captured:
+                response = api_client.post(reverse('task-bulk'), {'operations': operations}, format='json')
+            assert [r['status'] for r in response.data['results']] == ['ok'] * len(operations)
+            return len(captured)
+
+        run(tasks[:1])  # Warms the project access cache
+        few = run(tasks[1:3])
+        assert run(tasks[3:]) == few
+
+    def test_bulk_rejects_foreign_projects(self, api_client, board):
+        """Test operations on projects the user cannot access fail per item."""
+        outsider = User.objects.create_user(
+            username='outsider',
+            email='outsider@example.com',
+            password='outsiderpass123'
+        )
+        api_client.force_authenticate(user=outsider)
+
+        response = api_client.post(reverse('task-bulk'), {'operations': [
+            {'op': 'create', 'data': {'title': 'Sneaky', 'board': board.id}},
+        ]}, format='json')
+
+        assert response.data['results'][0]['status'] == 'error'
+        assert not Task.objects.filter(title='Sneaky').exists()
+
+    def test_bulk_create_recovers_ids_without_returning(
+        self, api_client, user, board, monkeypatch, django_assert_max_num_queries
+    ):
+        """Test backends without INSERT ... RETURNING get one insert and the id range."""
+        from django.db import connection
+        from apps.tasks.bulk import INSERTED_ID_RANGE
+
+        def last_insert_id(execute, sql, params, many, context):
+            if sql == INSERTED_ID_RANGE:
+                # SQLite reports the last rowid of the three, not the first
+                sql, params = 'SELECT last_insert_rowid() - 2, 1', None
+            return execute(sql, params, many, context)
+
+        monkeypatch.setattr(type(connection.features), 'can_return_rows_from_bulk_insert', False)
+        api_client.force_authenticate(user=user)
+        operations = [
+            {'op': 'create', 'data': {'title': f'Imported {i}', 'board': board.id}}
+            for i in range(3)
+        ]
+        with connection.execute_wrapper(last_insert_id), django_assert_max_num_queries(10) as captured:
+            response = api_client.post(reverse('task-bulk'), {'operations': operations}, format='json')
+
+        inserts = [q['sql'] for q in captured.captured_queries if q['sql'].startswith('INSERT INTO "tasks"')]
+        assert len(inserts) == 1
+        ids = [result['id'] for result in response.data['results']]
+        assert list(Task.objects.filter(id__in=ids).order_by('id').values_list('title', flat=True)) == [
+            f'Imported {i}' for i in range(3)
+        ]
+
+
+class TestTaskSearch:
+    """Test full-text search query building."""
+
+    def test_boolean_query_requires_prefix_of_every_term(self):
+        """Test operators are stripped and terms become required prefixes."""
+        from apps.tasks.search import boolean_query
+
+        assert boolean_query(['auth', '+bug*', '"login"']) == '+auth* +bug* +login*'
+
+    @pytest.mark.django_db
+    def test_search_parameter_filters_tasks(self, api_client, user, task):
+        """Test ?search= keeps filtering on title and description."""
+        api_client.force_authenticate(user=user)
+        url = reverse('task-list')
+
+        assert len(api_client.get(url, {'search': 'Test'}).data['results']) == 1
+        assert api_client.get(url, {'search': 'missing'}).data['results'] == []
+
+    @pytest.mark.django_db
+    def test_mysql_search_filters_on_indexed_ids(self, user, task, monkeypatch):
+        """Test MySQL search unions two index lookups in a subquery of the visible tasks."""
+        from django.db import connection
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+        from apps.tasks import search
+        from apps.tasks.views import TaskViewSet
+
+        monkeypatch.setattr(connection, 'vendor', 'mysql')
+        request = Request(APIRequestFactory().get('/', {'search': 'auth bug'}))
+        queryset = search.TaskSearchFilter().filter_queryset(
+            request, Task.objects.filter(board__project_id__in=[task.board.project_id]), TaskViewSet()
+        )
+
+        sql, params = queryset.query.sql_with_params()
+        assert search.MATCHING_TASK_IDS in sql
+        assert ' OR ' not in sql
+        assert sql.count('MATCH') == 3
+        assert list(params).count('+auth* +bug*') == 3
+        assert task.board.project_id in params
+
+
+@pytest.mark.django_db
+class TestBoardSnapshot:
+    """Test the board snapshot endpoint."""
+
+    def test_snapshot_groups_tasks_by_status(self, api_client, user, board, task):
+        """Test tasks are grouped into columns with users referenced by id."""
+        Task.objects.create(title='Done', board=board, reporter=user, status=Task.Status.DONE)
+        api_client.force_authenticate(user=user)
+        response = api_client.get(reverse('board-snapshot', kwargs={'pk': board.id}))
+
+        assert response.status_code == status.HTTP_200_OK
+        columns = {column['status']: column['tasks'] for column in response.data['columns']}
+        assert [t['title'] for t in columns['TODO']] == ['Test Task']
+        assert [t['title'] for t in columns['DONE']] == ['Done']
+        assert columns['TODO'][0]['reporter'] == user.id
+        assert response.data['users'][str(user.id)]['username'] == 'testuser'
+        assert response.data['task_count'] == 2
+
+    def test_snapshot_revalidates_with_etag(self, api_client, user, board, task):
+        """Test If-None-Match returns 304 until a task or comment changes."""
+        api_client.force_authenticate(user=user)
+        url = reverse('board-snapshot', kwargs={'pk': board.id})
+        etag = api_client.get(url)['ETag']
+
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+        Comment.objects.create(task=task, author=user, content='New')
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+
+@pytest.mark.django_db(transaction=True)
+class TestResponseCache:
+    """Test the read-through response cache."""
+
+    def test_list_is_served_from_cache_until_a_write(self, api_client, user, task):
+        """Test repeated lists hit the cache and task writes invalidate it."""
+        api_client.force_authenticate(user=user)
+        url = reverse('task-list')
+
+        assert api_client.get(url)['X-Cache'] == 'MISS'
+        cached = api_client.get(url)
+        assert cached['X-Cache'] == 'HIT'
+        assert cached.json()['results'][0]['title'] == 'Test Task'
+
+        task.title = 'Renamed'
+        task.save()
+        response = api_client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.data['results'][0]['title'] == 'Renamed'
+
+    def test_cache_is_scoped_per_user(self, api_client, user, admin_user, task):
+        """Test a cached response is never served to another user."""
+        api_client.force_authenticate(user=user)
+        url = reverse('task-detail', kwargs={'pk': task.id})
+        api_client.get(url)
+
+        outsider = User.objects.create_user(
+            username='outsider',
+            email='outsider@example.com',
+            password='outsiderpass123'
+        )
+        api_client.force_authenticate(user=outsider)
+        assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_comment_invalidates_project_responses(self, api_client, user, task):
+        """Test a new comment bumps the project generation."""
+        api_client.force_authenticate(user=user)
+        url = reverse('task-detail', kwargs={'pk': task.id})
+        api_client.get(url)
+
+        Comment.objects.create(task=task, author=user, content='New')
+        response = api_client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.data['comment_count'] == 1
+
+    def test_move_invalidates_the_project_left(self, api_client, user, task):
+        """Test moving a task to another project's board drops it from the old project's lists."""
+        member = User.objects.create_user(
+            username='member', email='member@example.com', password='memberpass123'
+        )
+        ProjectMember.objects.create(project=task.board.project, user=member)
+        api_client.force_authenticate(user=member)
+        url = reverse('task-list')
+        assert [t['id'] for t in api_client.get(url).data['results']] == [task.id]
+
+        other = Project.objects.create(name='Other', owner=user)
+        task.board = Board.objects.create(name='Elsewhere', project=other)
+        task.save()
+
+        response = api_client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.data['results'] == []
+
+
+def async_get(url, headers=None):
+    async def request():
+        return await AsyncClient().get(url, headers=headers or {})
+
+    return async_to_sync(request)()
+
+
+def bearer(user):
+    return {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncReads:
+    """Test the async handlers in front of the hot read endpoints."""
+
+    def fail(self, *args, **kwargs):
+        pytest.fail('Served by the sync view')
+
+    def test_cached_task_reads_skip_the_viewset(self, api_client, user, task, monkeypatch):
+        """Test cache hits are answered without DRF and misses fall back to it."""
+        from apps.tasks.views import TaskViewSet
+
+        api_client.credentials(**{'HTTP_AUTHORIZATION': bearer(user)['Authorization']})
+        list_url = reverse('task-list')
+        detail_url = reverse('task-detail', kwargs={'pk': task.id})
+        assert async_get(detail_url, bearer(user))['X-Cache'] == 'MISS'
+        expected = api_client.get(list_url).content
+
+        monkeypatch.setattr(TaskViewSet, 'list', self.fail)
+        monkeypatch.setattr(TaskViewSet, 'retrieve', self.fail)
+        response = async_get(list_url, bearer(user))
+        assert response['X-Cache'] == 'HIT'
+        assert response.content == expected
+        assert async_get(detail_url, bearer(user))['X-Cache'] == 'HIT'
+        assert len(cache.get(f'throttle_user_{user.pk}')) == 4
+
+    def test_snapshot_matches_sync_view(self, api_client, user, board, task, monkeypatch):
+        """Test the async snapshot renders the sync output and revalidates."""
+        from apps.projects.views import BoardViewSet
+
+        Task.objects.create(title='Done', board=board, reporter=user, status=Task.Status.DONE)
+        api_client.force_authenticate(user=user)
+        url = reverse('board-snapshot', kwargs={'pk': board.id})
+        expected = api_client.get(url)
+
+        monkeypatch.setattr(BoardViewSet, 'snapshot', self.fail)
+        response = async_get(url, bearer(user))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == expected.json()
+        assert response['ETag'] == expected['ETag']
+        assert response['Cache-Control'] == expected['Cache-Control']
+
+        revalidated = async_get(url, {'If-None-Match': response['ETag'], **bearer(user)})
+        assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_denied_requests_fall_back_to_sync_errors(self, user, board):
+        """Test non-members and anonymous users get the sync view's errors."""
+        outsider = User.objects.create_user(
+            username='outsider', email='outsider@example.com', password='outsiderpass123'
+        )
+        url = reverse('board-snapshot', kwargs={'pk': board.id})
+
+        assert async_get(url, bearer(outsider)).status_code == status.HTTP_403_FORBIDDEN
+        assert async_get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_streams_are_pulled_chunk_by_chunk(self, user, board, monkeypatch, settings):
+        """Test list streams and exports hand ASGI an async iterator, not a list to buffer."""
+        import json
+        from apps.tasks.views import TaskViewSet
+
+        monkeypatch.setattr(TaskViewSet, 'stream_chunk_size', 2)
+        settings.EXPORT_CHUNK_SIZE = 2
+        ids = [
+            Task.objects.create(title=f'Task {i}', board=board, reporter=user).id
+            for i in range(5)
+        ]
+
+        async def stream(url):
+            response = await AsyncClient().get(url, headers=bearer(user))
+            assert response.is_async
+            return [part async for part in response.streaming_content]
+
+        parts = async_to_sync(stream)(f'{reverse("task-list")}?stream=true&ordering=created_at')
+        # Opening bracket, three chunks, closing bracket
+        assert len(parts) == 5
+        assert [task['id'] for task in json.loads(b''.join(parts))] == ids
+
+        parts = async_to_sync(stream)(f'{reverse("task-export")}?export_format=jsonl')
+        assert len(parts) == 3
+        assert [json.loads(line)['id'] for line in b''.join(parts).splitlines()] == ids
+
+    def test_current_user_and_health_check(self, user):
+        """Test the async profile and health endpoints."""
+        response = async_get(reverse('user-me'), bearer(user))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['username'] == 'testuser'
+
+        health = async_get(reverse('health-check'))
+        assert health.status_code == status.HTTP_200_OK
+        assert health.json() == {'status': 'healthy', 'database': 'connected', 'cache': 'connected'}
+
+
+@pytest.mark.django_db
+class TestFastListSerialization:
+    """Test compiled list serialization matches the regular serializers."""
+
+    def render_both(self, serializer_class, queryset):
+        from rest_framework.renderers import JSONRenderer
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+        from apps.utils.fast_serializers import compile_serializer
+
+        request = Request(APIRequestFactory().get('/'))
+        context = {'request': request}
+        plan = compile_serializer(serializer_class)
+        rows = list(queryset.values(*plan.attnames))
+
+        fast = JSONRenderer().render(plan.serialize(rows, context))
+        regular = JSONRenderer().render(serializer_class(queryset, many=True, context=context).data)
+        return fast, regular
+
+    def test_task_comment_and_audit_output_is_identical(self, user, admin_user, board, task):
+        """Test the compiled output is byte-identical for every list serializer."""
+        from decimal import Decimal
+        from django.utils import timezone
+        from apps.audit.models import AuditLog
+        from apps.audit.serializers import AuditLogSerializer
+        from apps.tasks.serializers import CommentSerializer, TaskSerializer
+
+        user.first_name, user.last_name, user.avatar = 'Test', 'User', 'avatars/test.png'
+        user.save()
+        Task.objects.create(
+            title='Full', board=board, reporter=user, assignee=admin_user,
+            due_date=timezone.now(), estimated_hours=Decimal('2.50'),
+        )
+        Comment.objects.create(task=task, author=user, content='Hello')
+        AuditLog.objects.create(
+            user=user, action=AuditLog.Action.UPDATE, model_name='Task',
+            object_id=task.id, changes={'title': ['a', 'b']}, ip_address='127.0.0.1',
+        )
+        AuditLog.objects.create(action=AuditLog.Action.DELETE, model_name='Task', object_id=1)
+
+        for serializer_class, model in (
+            (TaskSerializer, Task), (CommentSerializer, Comment), (AuditLogSerializer, AuditLog),
+        ):
+            fast, regular = self.render_both(serializer_class, model.objects.order_by('id'))
+            assert fast == regular
+
+    def test_list_loads_users_once_per_page(self, api_client, user, board, django_assert_max_num_queries):
+        """Test users are loaded once per page instead of per row."""
+        for i in range(10):
+            Task.objects.create(title=f'Task {i}', board=board, reporter=user, assignee=user)
+        api_client.force_authenticate(user=user)
+
+        with django_assert_max_num_queries(4):
+            response = api_client.get(reverse('task-list'), {'cursor': ''})
+        assert len(response.data['results']) == 10
+        assert response.data['results'][0]['reporter_detail']['username'] == 'testuser'
+
+
+    def test_plan_cache_is_bounded(self, api_client, user, task, monkeypatch):
+        """Test varying ?fields= cannot grow the compiled plan cache without limit."""
+        from apps.utils import fast_serializers
+
+        monkeypatch.setattr(fast_serializers, 'PLAN_CACHE_SIZE', 3)
+        monkeypatch.setattr(fast_serializers, '_plans', type(fast_serializers._plans)())
+        api_client.force_authenticate(user=user)
+        for extra in ['title', 'status', 'priority', 'board', 'due_date']:
+            response = api_client.get(reverse('task-list'), {'fields': f'id,{extra}'})
+            assert list(response.data['results'][0]) == ['id', extra]
+
+        assert len(fast_serializers._plans) == 3
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    """Test ?fields= and ?expand= handling."""
+
+    def test_fields_limits_task_list(self, api_client, user, task):
+        """Test only the requested fields are returned."""
+        api_client.force_authenticate(user=user)
+        response = api_client.get(reverse('task-list'), {'fields': 'id,title'})
+
+        assert response.data['results'] == [{'id': task.id, 'title': 'Test Task'}]
+
+    def test_empty_expand_drops_nested_users(self, api_client, user, task):
+        """Test unexpanded detail objects are dropped and ids remain."""
+        api_client.force_authenticate(user=user)
+        response = api_client.get(reverse('task-detail', kwargs={'pk': task.id}), {'expand': ''})
+
+        assert 'reporter_detail' not in response.data
+        assert 'comments' not in response.data
+        assert response.data['reporter'] == user.id
+
+    def test_expand_selects_nested_objects(self, api_client, user, task):
+        """Test listed expansions stay embedded."""
+        api_client.force_authenticate(user=user)
+        response = api_client.get(reverse('task-list'), {'expand': 'reporter_detail'})
+        result = response.data['results'][0]
+
+        assert result['reporter_detail']['id'] == user.id
+        assert 'assignee_detail' not in result
+
+    def test_project_owner_collapses_to_id(self, api_client, user, project, django_assert_max_num_queries):
+        """Test unexpanded owners render as ids without joins or prefetches."""
+        api_client.force_authenticate(user=user)
+        url = reverse('project-list')
+
+        with django_assert_max_num_queries(3):
+            response = api_client.get(url, {'expand': '', 'fields': 'id,name,owner'})
+        assert response.data['results'] == [{'id': project.id, 'name': 'Test Project', 'owner': user.id}]
+
+    def test_writes_ignore_fieldsets(self, api_client, user, board):
+        """Test ?fields= does not restrict the fields accepted on create."""
+        api_client.force_authenticate(user=user)
+        response = api_client.post(
+            reverse('task-list') + '?fields=id',
+            {'title': 'Created', 'board': board.id},
+            format='json'
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['title'] == 'Created'
+
+
+class TestORJSONRendering:
+    """Test the orjson renderer and parser."""
+
+    def test_output_matches_stdlib_renderer(self):
+        """Test rendering is byte-identical to DRF's JSONRenderer."""
+        import uuid
+        from datetime import date, datetime, timezone as dt_timezone
+        from decimal import Decimal
+        from django.utils.translation import gettext_lazy
+        from rest_framework.renderers import JSONRenderer
+        from apps.utils.renderers import ORJSONRenderer
+
+        data = {
+            'when': datetime(2024, 12, 1, 10, 0, 0, 123456, tzinfo=dt_timezone.utc),
+            'day': date(2024, 12, 1),
+            'hours': Decimal('8.50'),
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'label': gettext_lazy('To Do'),
+            'text': 'naïve   line',
+            1: [None, True, 1.5],
+        }
+
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_parser_reads_json_body(self):
+        """Test request bodies are parsed with orjson and errors are 400s."""
+        import io
+        from rest_framework.exceptions import ParseError
+        from apps.utils.parsers import ORJSONParser
+
+        assert ORJSONParser().parse(io.BytesIO(b'{"title": "T\\u00e9st"}')) == {'title': 'Tést'}
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"title": NaN}'))
+
+
+@pytest.mark.django_db
+class TestStreamingList:
+    """Test ?stream=true list responses."""
+
+    def test_stream_returns_every_task_in_order(self, api_client, user, board, monkeypatch):
+        """Test all rows are streamed across several keyset chunks."""
+        import json
+        from apps.tasks.views import TaskViewSet
+
+        monkeypatch.setattr(TaskViewSet, 'stream_chunk_size', 2)
+        ids = [
+            Task.objects.create(title=f'Task {i}', board=board, reporter=user).id
+            for i in range(5)
+        ]
+        api_client.force_authenticate(user=user)
+        response = api_client.get(reverse('task-list'), {'stream': 'true', 'ordering': 'created_at'})
+
+        assert response.streaming
+        results = json.loads(b''.join(response.streaming_content))
+        assert [task['id'] for task in results] == ids
+        assert results[0]['reporter_detail']['id'] == user.id
+
+
+@pytest.mark.django_db
+class TestTaskExport:
+    """Test CSV/JSONL task exports."""
+
+    @pytest.fixture
+    def tasks(self, board, user):
+        return [
+            Task.objects.create(
+                title=f'Task {i}', description='Line one\nline, two', board=board, reporter=user,
+                status=Task.Status.DONE if i % 2 else Task.Status.TODO,
+            )
+            for i in range(5)
+        ]
+
+    def test_csv_export_honours_filters(self, api_client, user, tasks, settings):
+        """Test the CSV streams only filtered rows across several chunks."""
+        import csv
+        import io
+
+        settings.EXPORT_CHUNK_SIZE = 1
+        api_client.force_authenticate(user=user)
+        response = api_client.get(reverse('task-export'), {'status': Task.Status.TODO})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['Content-Type'].startswith('text/csv')
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        assert [int(row['id']) for row in rows] == [t.id for t in tasks if t.status == Task.Status.TODO]
+        assert rows[0]['description'] == 'Line one\nline, two'
+        assert rows[0]['assignee_id'] == ''
+        assert rows[0]['sla_breached'] == 'false'
+
+    def test_jsonl_export(self, api_client, user, tasks):
+        """Test JSONL emits one object per task."""
+        import json
+
+        api_client.force_authenticate(user=user)
+        response = api_client.get(reverse('task-export'), {'export_format': 'jsonl'})
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert [json.loads(line)['id'] for line in lines] == [t.id for t in tasks]
+        assert json.loads(lines[0])['created_at'].endswith('Z')
+
+    def test_export_excludes_inaccessible_projects(self, api_client, tasks):
+        """Test exports apply the same visibility rules as the list."""
+        outsider = User.objects.create_user(username='outsider', email='outsider@example.com', password='x')
+        api_client.force_authenticate(user=outsider)
+        response = api_client.get(reverse('task-export'), {'export_format': 'jsonl'})
+
+        assert b''.join(response.streaming_content) == b''
+
+    def test_unknown_format(self, api_client, user):
+        """Test an unsupported format is rejected."""
+        api_client.force_authenticate(user=user)
+        response = api_client.get(reverse('task-export'), {'export_format': 'xml'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_large_export_runs_as_job(self, api_client, user, admin_user, tasks, settings, tmp_path, monkeypatch):
+        """Test exports over the threshold are written to a file and downloadable by their owner."""
+        import csv
+        import gzip
+        import io
+        from apps.tasks.tasks import export_to_file
+        from config.celery import app
+
+        monkeypatch.setattr(app.conf, 'task_store_eager_result', True)
+        monkeypatch.setattr(export_to_file._get_current_object(), 'store_eager_result', True)
+        settings.EXPORT_ASYNC_THRESHOLD = 2
+        settings.EXPORT_DIR = str(tmp_path)
+        api_client.force_authenticate(user=user)
+        response = api_client.get(reverse('task-export'), {'status': Task.Status.TODO})
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job = response.json()['job']
+
+        download = api_client.get(reverse('task-export'), {'job': job})
+        assert download.status_code == status.HTTP_200_OK
+        content = gzip.decompress(b''.join(download.streaming_content)).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert [int(row['id']) for row in rows] == [t.id for t in tasks if t.status == Task.Status.TODO]
+
+        api_client.force_authenticate(user=admin_user)
+        assert api_client.get(reverse('task-export'), {'job': job}).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_purge_removes_expired_export_files(self, settings, tmp_path):
+        """Test export files past EXPORT_RETENTION_HOURS are deleted."""
+        import os
+        import time
+        from apps.tasks.tasks import purge_exports
+
+        settings.EXPORT_DIR = str(tmp_path)
+        settings.EXPORT_RETENTION_HOURS = 24
+        old, fresh = tmp_path / 'tasks_old.csv.gz', tmp_path / 'tasks_new.csv.gz'
+        old.write_bytes(b'')
+        fresh.write_bytes(b'')
+        expired = time.time() - 25 * 3600
+        os.utime(old, (expired, expired))
+
+        assert purge_exports() == 1
+        assert not old.exists()
+        assert fresh.exists()
+
+
+class TestQueueRouting:
+    """Test the Celery queue layout."""
+
+    def test_every_task_is_routed_to_a_declared_queue(self):
+        """Test no project task falls through to the default queue."""
+        import apps.analytics.tasks  # noqa
+        import apps.audit.tasks  # noqa
+        import apps.notifications.tasks  # noqa
+        import apps.tasks.tasks  # noqa
+        import apps.webhooks.tasks  # noqa
+        from config.celery import app
+
+        queues = {queue.name for queue in app.conf.task_queues}
+        names = [name for name in app.tasks if name.startswith('apps.')]
+
+        assert 'apps.notifications.tasks.dispatch_notifications' in names
+        for name in names:
+            assert name in app.conf.task_routes, name
+            assert app.amqp.router.route({}, name)['queue'].name in queues
+
+    def test_benchmark_reports_latency_per_lane(self):
+        """Test the load-test harness drains both layouts on the memory broker."""
+        import io
+        from django.core.management import call_command
+
+        out = io.StringIO()
+        call_command(
+            'benchmark_queues', bulk_jobs=4, bulk_seconds=0.05, probes=8,
+            probe_interval=0.005, scheduled_probes=2, timeout=30, stdout=out
+        )
+
+        lines = out.getvalue().splitlines()
+        for layout in ('shared', 'routed'):
+            for lane in ('interactive', 'bulk', 'scheduled'):
+                assert any(line.split()[:2] == [layout, lane] for line in lines)
+        assert lines[-1].startswith('interactive p99')
@@ -1,10 +1,20 @@
 """URL configuration for Task API."""
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import TaskViewSet, CommentViewSet
+from apps.utils.async_views import hybrid_view, router_view
+from .views import TaskViewSet, CommentViewSet, cached_task_list, cached_task_detail
 
 router = DefaultRouter()
 router.register(r'', TaskViewSet, basename='task')
 router.register(r'comments', CommentViewSet, basename='comment')
 
-urlpatterns = router.urls
\ No newline at end of file
+# Cache hits of the hottest reads are answered by async handlers in front of
+# the router's views, which serve everything else in a thread
+urlpatterns = [
+    path('', hybrid_view(
+        router_view(router, 'task-list'), get=cached_task_list
+    ), name='task-list'),
+    path('<int:pk>/', hybrid_view(
+        router_view(router, 'task-detail'), get=cached_task_detail
+    ), name='task-detail'),
+] + router.urls
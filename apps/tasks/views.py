@@ -2,13 +2,29 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Count, Q
+from rest_framework.filters import OrderingFilter
+from django.contrib.auth import get_user_model
+from django.db import transaction
 from django_filters import rest_framework as filters
 
 from .models import Task, Comment
-from .serializers import TaskSerializer, TaskDetailSerializer, CommentSerializer
+from .serializers import (
+    TaskSerializer, TaskDetailSerializer, CommentSerializer, BulkTaskSerializer
+)
+from .bulk import BulkTaskProcessor
+from .search import TaskSearchFilter
+from apps.notifications.outbox import record_assignments
+from apps.projects.access import get_accessible_project_ids
+from apps.projects.cache import ProjectResponseCacheMixin, aget_cached_project_response
 from apps.projects.permissions import IsProjectMember
-from .tasks import send_task_assignment_email
+from apps.utils.async_views import api_handler
+from apps.utils.export import ExportMixin
+from apps.utils.fast_serializers import FastListMixin
+from apps.utils.fieldsets import expands_field
+from apps.utils.pagination import HybridPagination
+from apps.utils.streaming import StreamingListMixin
+
+User = get_user_model()
 
 
 class TaskFilter(filters.FilterSet):
@@ -25,12 +41,22 @@ class TaskFilter(filters.FilterSet):
         fields = ['status', 'priority', 'assignee', 'board', 'sla_breached']
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(
+    ProjectResponseCacheMixin, ExportMixin, StreamingListMixin, FastListMixin, viewsets.ModelViewSet
+):
     """ViewSet for task CRUD operations."""
     permission_classes = [IsProjectMember]
+    pagination_class = HybridPagination
+    filter_backends = [filters.DjangoFilterBackend, TaskSearchFilter, OrderingFilter]
     filterset_class = TaskFilter
     search_fields = ['title', 'description']
     ordering_fields = ['created_at', 'updated_at', 'due_date', 'priority', 'status']
+    export_name = 'tasks'
+    export_columns = [
+        'id', 'title', 'description', 'board_id', 'status', 'priority',
+        'assignee_id', 'reporter_id', 'due_date', 'sla_breached', 'estimated_hours',
+        'comment_count', 'created_at', 'updated_at', 'completed_at',
+    ]
 
     def get_queryset(self):
         queryset = Task.objects.all()
@@ -39,18 +65,22 @@ class TaskViewSet(viewsets.ModelViewSet):
         user = self.request.user
         if not user.is_admin:
             queryset = queryset.filter(
-                Q(board__project__owner=user) |
-                Q(board__project__members__user=user)
-            ).distinct()
-
-        # Annotate comment count
-        queryset = queryset.annotate(
-            comment_count=Count('comments', distinct=True)
-        ).select_related(
-            'board__project',
-            'assignee',
-            'reporter'
-        )
+                board__project_id__in=get_accessible_project_ids(user)
+            )
+
+        # Only join what the response renders; object permissions and bulk
+        # operations need the project, which list responses never check.
+        serializer_class = self.get_serializer_class()
+        related = [] if self.action == 'list' else ['board__project']
+        if expands_field(self.request, serializer_class, 'assignee_detail'):
+            related.append('assignee')
+        if expands_field(self.request, serializer_class, 'reporter_detail'):
+            related.append('reporter')
+        if related:
+            queryset = queryset.select_related(*related)
+
+        if self.action == 'retrieve' and expands_field(self.request, serializer_class, 'comments'):
+            queryset = queryset.prefetch_related('comments__author')
 
         return queryset
 
@@ -59,6 +89,17 @@ class TaskViewSet(viewsets.ModelViewSet):
             return TaskDetailSerializer
         return TaskSerializer
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Create, update, move or assign many tasks in one request."""
+        serializer = BulkTaskSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        processor = BulkTaskProcessor(request, self.get_queryset())
+        results = processor.run(serializer.validated_data['operations'])
+
+        return Response({'results': results})
+
     @action(detail=True, methods=['post'])
     def assign(self, request, pk=None):
         """Assign task to a user."""
@@ -71,11 +112,17 @@ class TaskViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        task.assignee_id = assignee_id
-        task.save()
+        assignee = User.objects.filter(pk=assignee_id).first() if str(assignee_id).isdigit() else None
+        if assignee is None:
+            return Response(
+                {'detail': 'Assignee not found'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        # Send async email notification
-        send_task_assignment_email.delay(task.id, assignee_id)
+        with transaction.atomic():
+            task.assignee = assignee
+            task.save()
+            record_assignments([(task.id, assignee.id)])
 
         return Response(TaskSerializer(task).data)
 
@@ -100,18 +147,43 @@ class TaskViewSet(viewsets.ModelViewSet):
     def add_comment(self, request, pk=None):
         """Add a comment to the task."""
         task = self.get_object()
-        serializer = CommentSerializer(data=request.data)
+        data = request.data.copy()
+        data['task'] = task.id
+        serializer = CommentSerializer(data=data)
         serializer.is_valid(raise_exception=True)
         serializer.save(task=task, author=request.user)
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(FastListMixin, viewsets.ModelViewSet):
     """ViewSet for comment operations."""
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = [IsProjectMember]
+    pagination_class = HybridPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Object permissions reach the project through the task's board
+        related = ['task__board__project'] if self.detail else []
+        if expands_field(self.request, CommentSerializer, 'author'):
+            related.append('author')
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
\ No newline at end of file
+        serializer.save(author=self.request.user)
+
+
+@api_handler
+async def cached_task_list(request, user):
+    """Serve a cached task list without entering DRF; misses fall through."""
+    return await aget_cached_project_response(request, 'task', 'list')
+
+
+@api_handler
+async def cached_task_detail(request, user, pk):
+    """Serve a cached task without entering DRF; misses fall through."""
+    return await aget_cached_project_response(request, 'task', 'retrieve')
@@ -3,7 +3,8 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenRefreshView
 
-from .views import UserViewSet
+from apps.utils.async_views import hybrid_view, router_view
+from .views import UserViewSet, current_user
 from .serializers import CustomTokenObtainPairView  # Import from serializers, not views
 
 
@@ -12,6 +13,9 @@ router = DefaultRouter()
 router.register(r'users', UserViewSet, basename='user')
 
 urlpatterns = [
+    path('users/me/', hybrid_view(
+        router_view(router, 'user-me'), get=current_user
+    ), name='user-me'),
     path('', include(router.urls)),
     path('login/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('refresh/', TokenRefreshView.as_view(), name='token_refresh'),
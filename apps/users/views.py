@@ -6,6 +6,8 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.contrib.auth import get_user_model
 
+from apps.utils.async_views import api_handler, json_response
+
 from .serializers import (
     UserSerializer, UserCreateSerializer, UserUpdateSerializer
 )
@@ -46,4 +48,10 @@ class UserViewSet(viewsets.ModelViewSet):
         )
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return Response(UserSerializer(request.user).data)
\ No newline at end of file
+        return Response(UserSerializer(request.user).data)
+
+
+@api_handler
+async def current_user(request, user):
+    """Async ``UserViewSet.me``."""
+    return json_response(UserSerializer(user, context={'request': request}).data)
@@ -0,0 +1,72 @@
+"""Async access to Redis and the default cache.
+
+When the default cache is django-redis, reads and writes go through a
+``redis.asyncio`` client on the running event loop, using django-redis'
+own key function and serializer, so entries are shared with the sync
+``cache``. Other backends (tests use locmem) fall back to Django's
+``cache.a*`` methods, which run the sync calls in a thread.
+"""
+import asyncio
+import weakref
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from redis import asyncio as aioredis
+
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_redis(url=None):
+    """Return the ``redis.asyncio`` client for ``url`` on the running event loop."""
+    url = url or settings.CACHES['default']['LOCATION']
+    clients = _clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(url)
+    if client is None:
+        client = clients[url] = aioredis.from_url(url)
+    return client
+
+
+def _redis_backend():
+    """Return the django-redis client behind the default cache, if it is one."""
+    client = getattr(cache, 'client', None)
+    if client is None or not hasattr(client, 'encode') or not hasattr(client, 'make_key'):
+        return None
+    return client
+
+
+def _expiry_ms(timeout):
+    if timeout is DEFAULT_TIMEOUT:
+        timeout = cache.default_timeout
+    return None if timeout is None else max(int(timeout * 1000), 1)
+
+
+async def aget(key, default=None):
+    return (await aget_many([key])).get(key, default)
+
+
+async def aget_many(keys):
+    """Return a dict of the keys found in the cache."""
+    backend = _redis_backend()
+    if backend is None:
+        return await cache.aget_many(keys)
+    if not keys:
+        return {}
+    values = await get_async_redis().mget([backend.make_key(key) for key in keys])
+    return {key: backend.decode(value) for key, value in zip(keys, values) if value is not None}
+
+
+async def aset(key, value, timeout=DEFAULT_TIMEOUT, nx=False):
+    backend = _redis_backend()
+    if backend is None:
+        if nx:
+            return await cache.aadd(key, value, timeout)
+        await cache.aset(key, value, timeout)
+        return True
+    return bool(await get_async_redis().set(
+        backend.make_key(key), backend.encode(value), px=_expiry_ms(timeout), nx=nx
+    ))
+
+
+async def aadd(key, value, timeout=DEFAULT_TIMEOUT):
+    return await aset(key, value, timeout, nx=True)
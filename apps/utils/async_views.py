@@ -0,0 +1,183 @@
+"""Async request handling alongside the sync DRF viewsets.
+
+DRF views are synchronous, so under ASGI each of them holds a worker
+thread for its whole duration. ``hybrid_view`` puts an async handler in
+front of a viewset for the requests it can answer without DRF, typically
+from Redis or a couple of async ORM queries, and hands everything else to
+the sync view in a thread. Handlers return ``None`` to defer to the sync
+view, which then behaves exactly as before, errors included.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.settings import api_settings as drf_settings
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from . import async_cache
+from .renderers import dumps
+
+User = get_user_model()
+
+# Accept media ranges the default JSON renderer is negotiated for
+JSON_MEDIA_RANGES = {'', '*/*', 'application/*', 'application/json'}
+
+
+def hybrid_view(sync_view, **handlers):
+    """
+    Return an async view serving methods with the given async handlers,
+    e.g. ``get=...``, and falling back to ``sync_view`` for other methods
+    and whenever a handler returns ``None``.
+    """
+    sync_handler = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        handler = handlers.get(request.method.lower())
+        if handler is not None:
+            response = await handler(request, *args, **kwargs)
+            if response is not None:
+                return response
+        return await sync_handler(request, *args, **kwargs)
+
+    # DRF views handle CSRF themselves
+    view.csrf_exempt = True
+    view.cls = getattr(sync_view, 'cls', None)
+    view.initkwargs = getattr(sync_view, 'initkwargs', None)
+    view.actions = getattr(sync_view, 'actions', None)
+    return view
+
+
+def router_view(router, name):
+    """Return the view ``router`` registered under the URL name ``name``."""
+    for pattern in router.urls:
+        if pattern.name == name:
+            return pattern.callback
+    raise ImproperlyConfigured(f'No route named {name!r}')
+
+
+def wants_json(request):
+    """Whether DRF would render this request with the compact JSON renderer."""
+    if drf_settings.URL_FORMAT_OVERRIDE in request.GET:
+        return False
+    for media_range in request.headers.get('Accept', '').split(','):
+        media_type, *params = (part.strip() for part in media_range.split(';'))
+        # Parameters such as indent= change the output
+        if media_type not in JSON_MEDIA_RANGES or any(not p.startswith('q=') for p in params):
+            return False
+    return True
+
+
+def json_response(data, status=200):
+    """Render ``data`` like the default DRF renderer."""
+    return HttpResponse(dumps(data), content_type='application/json', status=status)
+
+
+async def aauthenticate(request):
+    """
+    Return the active user of the request's bearer token, or ``None``.
+
+    Mirrors ``JWTAuthentication`` with an async user lookup and sets
+    ``request.user``. Invalid credentials return ``None`` as well, so the
+    sync view can report them.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header is not None else None
+    if raw_token is None:
+        return None
+    try:
+        token = authentication.get_validated_token(raw_token)
+        user_id = token[jwt_settings.USER_ID_CLAIM]
+    except (InvalidToken, TokenError, KeyError):
+        return None
+
+    user = await User.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}).afirst()
+    if user is None or not user.is_active:
+        return None
+    if jwt_settings.CHECK_REVOKE_TOKEN and (
+        token.get(jwt_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+    ):
+        return None
+    request.user = user
+    return user
+
+
+class AsyncUserRateThrottle(UserRateThrottle):
+    """``UserRateThrottle`` keeping its history through the async cache."""
+
+    async def aallow_request(self, request):
+        """Check the rate without recording the request."""
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, None)
+        if self.key is None:
+            return True
+        self.history = await async_cache.aget(self.key, [])
+        self.now = self.timer()
+        while self.history and self.history[-1] <= self.now - self.duration:
+            self.history.pop()
+        return len(self.history) < self.num_requests
+
+    async def arecord(self):
+        if self.rate is not None and self.key is not None:
+            self.history.insert(0, self.now)
+            await async_cache.aset(self.key, self.history, self.duration)
+
+
+async def athrottle(request):
+    """
+    Check the default throttles for an authenticated request.
+
+    Returns the throttles to record once the async handler serves the
+    response, or ``None`` when the sync view must handle the request: it
+    is over a limit (DRF renders the 429) or a throttle has no async
+    counterpart.
+    """
+    throttles = []
+    for throttle_class in drf_settings.DEFAULT_THROTTLE_CLASSES:
+        if throttle_class is AnonRateThrottle:
+            continue
+        if throttle_class is not UserRateThrottle:
+            return None
+        throttle = AsyncUserRateThrottle()
+        if not await throttle.aallow_request(request):
+            return None
+        throttles.append(throttle)
+    return throttles
+
+
+async def arecord_throttles(throttles):
+    for throttle in throttles:
+        await throttle.arecord()
+
+
+def api_handler(handler):
+    """
+    Wrap an async handler ``handler(request, user, *args, **kwargs)`` for
+    JSON requests of authenticated users.
+
+    Requests the sync view must answer (other formats, missing or invalid
+    credentials, throttled users) return ``None`` before the handler runs.
+    The throttles record the request only when the handler serves it.
+    """
+    async def wrapper(request, *args, **kwargs):
+        if not wants_json(request):
+            return None
+        user = await aauthenticate(request)
+        if user is None:
+            return None
+        throttles = await athrottle(request)
+        if throttles is None:
+            return None
+        response = await handler(request, user, *args, **kwargs)
+        if response is not None:
+            await arecord_throttles(throttles)
+            patch_vary_headers(response, ['Accept'])
+        return response
+
+    return wrapper
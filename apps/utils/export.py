@@ -0,0 +1,203 @@
+"""Streaming CSV/JSONL exports of filtered querysets.
+
+Exports read ``values_list`` tuples in primary key order through
+``apps.utils.pagination.keyset_chunks``, one seek query per chunk, so memory
+stays constant however many rows match.
+``QuerySet.iterator(chunk_size=...)`` is not enough on its own: mysqlclient
+buffers the whole result set client-side unless a server-side cursor class
+is used, and a long-lived streaming cursor would hold the connection (and,
+on replicas, purge) for the whole download.
+
+Small exports stream straight into the response. Exports above
+``EXPORT_ASYNC_THRESHOLD`` rows are written to a gzip file by a Celery job
+that rebuilds the same queryset from the view, user and query string; files
+older than ``EXPORT_RETENTION_HOURS`` are removed by ``purge_exports``.
+"""
+import csv
+import gzip
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import FileResponse, HttpRequest, QueryDict, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .pagination import keyset_chunks
+from .renderers import dumps
+from .streaming import streaming_content
+
+FORMAT_PARAM = 'export_format'
+JOB_PARAM = 'job'
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+def export_rows(queryset, columns):
+    """Return ``(rows, ordering)`` to read ``columns`` with ``keyset_chunks``."""
+    rows = queryset.select_related(None).prefetch_related(None).values_list(*columns, named=True)
+    return rows, [queryset.model._meta.pk.attname]
+
+
+def _text(value):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class _Echo:
+    """File-like object whose ``write`` returns what it was given."""
+
+    def write(self, value):
+        return value
+
+
+def encode_csv(columns, chunks):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns).encode()
+    for chunk in chunks:
+        lines = []
+        for row in chunk:
+            lines.append(writer.writerow([
+                '' if value is None
+                else ('true' if value else 'false') if isinstance(value, bool)
+                else dumps(value).decode() if isinstance(value, (dict, list))
+                else _text(value)
+                for value in row
+            ]))
+        yield ''.join(lines).encode()
+
+
+def encode_jsonl(columns, chunks):
+    for chunk in chunks:
+        yield b''.join(
+            dumps({column: _text(value) for column, value in zip(columns, row)}) + b'\n'
+            for row in chunk
+        )
+
+
+ENCODERS = {'csv': encode_csv, 'jsonl': encode_jsonl}
+
+
+def export_path(name, export_format):
+    return Path(settings.EXPORT_DIR) / f'{name}.{export_format}.gz'
+
+
+def write_export_file(queryset, columns, export_format, name):
+    """Write a gzip-compressed export and return ``(path, row_count)``."""
+    path = export_path(name, export_format)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+
+    count = 0
+
+    def counted(chunks):
+        nonlocal count
+        for chunk in chunks:
+            count += len(chunk)
+            yield chunk
+
+    chunks = counted(keyset_chunks(*export_rows(queryset, columns), settings.EXPORT_CHUNK_SIZE))
+    with gzip.open(tmp_path, 'wb') as export_file:
+        for data in ENCODERS[export_format](columns, chunks):
+            export_file.write(data)
+    os.replace(tmp_path, path)
+    return path, count
+
+
+def build_export_view(view_path, user_id, query_string):
+    """Rebuild an export view and its filtered queryset outside of a request cycle."""
+    http_request = HttpRequest()
+    http_request.method = 'GET'
+    http_request.GET = QueryDict(query_string)
+    request = Request(http_request)
+    request.user = get_user_model().objects.get(pk=user_id)
+
+    view = import_string(view_path)(
+        request=request, args=(), kwargs={}, format_kwarg=None,
+        action='export', detail=False, basename=None,
+    )
+    return view, view.filter_queryset(view.get_queryset())
+
+
+class ExportMixin:
+    """
+    ``GET <list>/export/?export_format=csv|jsonl`` for a viewset.
+
+    The export honours the view's filters, search and visibility rules and
+    includes ``export_columns`` (concrete attnames, primary key included).
+    Large exports answer ``202`` with a job id; poll the same URL with
+    ``?job=<id>`` to download the compressed file once it is ready.
+    """
+    export_columns = ()
+    export_name = None
+
+    @action(detail=False, methods=['get'])
+    def export(self, request, *args, **kwargs):
+        job_id = request.query_params.get(JOB_PARAM)
+        if job_id:
+            return self.export_job_response(job_id)
+
+        export_format = request.query_params.get(FORMAT_PARAM, 'csv')
+        if export_format not in ENCODERS:
+            return Response(
+                {'detail': f'{FORMAT_PARAM} must be one of: {", ".join(ENCODERS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        columns = list(self.export_columns)
+        threshold = settings.EXPORT_ASYNC_THRESHOLD
+        if queryset.order_by()[threshold:threshold + 1].exists():
+            return self.start_export_job(request, export_format)
+
+        chunks = keyset_chunks(*export_rows(queryset, columns), settings.EXPORT_CHUNK_SIZE)
+        response = StreamingHttpResponse(
+            streaming_content(request, ENCODERS[export_format](columns, chunks)),
+            content_type=CONTENT_TYPES[export_format],
+        )
+        filename = f'{self.export_name}_{timezone.now():%Y%m%d%H%M%S}.{export_format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def start_export_job(self, request, export_format):
+        from apps.tasks.tasks import export_to_file
+
+        view_path = f'{type(self).__module__}.{type(self).__qualname__}'
+        query_string = request.query_params.urlencode()
+        job = export_to_file.delay(view_path, request.user.pk, query_string, export_format)
+        return Response({
+            'detail': 'Export is being prepared',
+            'job': job.id,
+            'url': request.build_absolute_uri(f'{request.path}?{JOB_PARAM}={job.id}'),
+        }, status=status.HTTP_202_ACCEPTED)
+
+    def export_job_response(self, job_id):
+        from celery.result import AsyncResult
+
+        job = AsyncResult(job_id)
+        if not job.ready():
+            return Response({'status': job.status}, status=status.HTTP_202_ACCEPTED)
+
+        result = job.result if job.successful() else None
+        if not isinstance(result, dict) or result.get('user_id') != self.request.user.pk:
+            return Response({'detail': 'Export not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        path = Path(result['path'])
+        if not path.exists():
+            return Response({'detail': 'Export not found'}, status=status.HTTP_404_NOT_FOUND)
+        return FileResponse(path.open('rb'), as_attachment=True, filename=path.name, content_type='application/gzip')
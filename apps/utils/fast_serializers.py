@@ -0,0 +1,248 @@
+"""Compiled read-only serialization for list endpoints.
+
+``ModelSerializer`` resolves every field of every row through the generic
+field machinery (``get_attribute``, ``SkipField`` handling, nested
+serializer instances per related object). For read-only lists the shape of
+the output is fixed, so it can be compiled once per serializer class into a
+plan of ``(output key, values() column, converter)`` entries:
+
+- rows are read with ``.values()`` on exactly the columns the plan needs,
+- plain columns are copied as they are, and only fields whose representation
+  differs from the database value keep their DRF ``to_representation``,
+- nested serializers on foreign keys are rendered once per distinct related
+  object per response, from a single ``pk__in`` query.
+
+Output is identical to ``serializer_class(rows, many=True).data``.
+Serializers with fields the compiler does not understand (method fields,
+dotted sources, reverse relations) are not compiled and keep the regular
+path.
+"""
+import copy
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from apps.metrics.registry import timed_serialization
+
+# Fields whose representation of a database value is the value itself
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+)
+
+# Compiled plans kept per process, least recently used first. ``?fields=``
+# and ``?expand=`` let clients pick any subset of fields, so the number of
+# distinct layouts is bounded here rather than by the clients.
+PLAN_CACHE_SIZE = 256
+
+_plans = OrderedDict()
+_plans_lock = threading.Lock()
+
+
+class Column:
+    """A field read from a ``values()`` column, optionally converted."""
+
+    def __init__(self, key, attname, convert=None):
+        self.key = key
+        self.attname = attname
+        self.convert = convert
+
+
+class FileColumn(Column):
+    """A file field rendered as an (absolute) storage URL."""
+
+    def __init__(self, key, attname, storage, use_url):
+        super().__init__(key, attname)
+        self.storage = storage
+        self.use_url = use_url
+
+
+class NestedColumn(Column):
+    """A nested serializer on a foreign key, rendered once per related object."""
+
+    def __init__(self, key, attname, model, serializer_class):
+        super().__init__(key, attname)
+        self.model = model
+        self.serializer_class = serializer_class
+
+
+class ListPlan:
+    """The compiled representation of one serializer class."""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.attnames = list(dict.fromkeys(column.attname for column in columns))
+
+    def serialize(self, rows, context):
+        with timed_serialization():
+            return self._serialize(rows, context)
+
+    def _serialize(self, rows, context):
+        request = context.get('request')
+        related = self._load_related(rows, context)
+
+        data = []
+        for row in rows:
+            item = {}
+            for column in self.columns:
+                value = row[column.attname]
+                if value is None:
+                    item[column.key] = None
+                elif column.convert is not None:
+                    item[column.key] = column.convert(value)
+                elif isinstance(column, FileColumn):
+                    item[column.key] = self._file_url(column, value, request)
+                elif isinstance(column, NestedColumn):
+                    item[column.key] = related[column.key][value]
+                else:
+                    item[column.key] = value
+            data.append(item)
+        return data
+
+    def _load_related(self, rows, context):
+        """Render each distinct related object once with its serializer."""
+        rendered = {}
+        by_target = {}
+        for column in self.columns:
+            if isinstance(column, NestedColumn):
+                target = by_target.setdefault((column.model, column.serializer_class), {})
+                ids = {row[column.attname] for row in rows} - {None}
+                rendered[column.key] = target
+                target.update(dict.fromkeys(ids))
+
+        for (model, serializer_class), target in by_target.items():
+            if not target:
+                continue
+            serializer = serializer_class(context=context)
+            for instance in model._default_manager.filter(pk__in=list(target)):
+                target[instance.pk] = serializer.to_representation(instance)
+        return rendered
+
+    @staticmethod
+    def _file_url(column, name, request):
+        if not name:
+            return None
+        if not column.use_url:
+            return name
+        url = column.storage.url(name)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+
+def compile_serializer(serializer):
+    """
+    Return the ``ListPlan`` of a serializer, or ``None`` if unsupported.
+
+    Accepts a class or an instance; an instance is compiled with the fields
+    it resolved for its context (e.g. after ``?fields=``/``?expand=``).
+    Plans are cached per class and field layout, up to ``PLAN_CACHE_SIZE``.
+    """
+    if isinstance(serializer, type):
+        serializer = serializer()
+    if not isinstance(serializer, serializers.ModelSerializer):
+        return None
+
+    fields = list(serializer._readable_fields)
+    key = (type(serializer), tuple((field.field_name, type(field)) for field in fields))
+    with _plans_lock:
+        if key in _plans:
+            _plans.move_to_end(key)
+            return _plans[key]
+
+    plan = _compile(serializer.Meta.model, fields)
+    with _plans_lock:
+        _plans[key] = plan
+        while len(_plans) > PLAN_CACHE_SIZE:
+            _plans.popitem(last=False)
+    return plan
+
+
+def _compile(model, fields):
+    columns = []
+    for field in fields:
+        if len(field.source_attrs) != 1:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+
+        key, attname = field.field_name, model_field.attname
+        if isinstance(field, serializers.ModelSerializer):
+            if not model_field.many_to_one:
+                return None
+            columns.append(NestedColumn(key, attname, model_field.related_model, type(field)))
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            if field.pk_field is not None or not model_field.many_to_one:
+                return None
+            columns.append(Column(key, attname))
+        elif isinstance(field, serializers.FileField):
+            if not isinstance(model_field, models.FileField):
+                return None
+            columns.append(FileColumn(key, attname, model_field.storage, field.use_url))
+        elif isinstance(field, serializers.RelatedField) or isinstance(field, serializers.BaseSerializer):
+            return None
+        elif isinstance(field, PASSTHROUGH_FIELDS) and not _needs_conversion(model_field):
+            columns.append(Column(key, attname))
+        else:
+            # An unbound copy, so cached plans hold no request context
+            columns.append(Column(key, attname, copy.deepcopy(field).to_representation))
+    return ListPlan(columns)
+
+
+def _needs_conversion(model_field):
+    # Values of these columns are not already the str/int/bool DRF emits
+    return not isinstance(model_field, (
+        models.BooleanField, models.CharField, models.IntegerField,
+        models.TextField, models.AutoField, models.ForeignKey,
+    ))
+
+
+class FastListMixin:
+    """
+    Serve ``list`` through the compiled plan of the view's serializer.
+
+    Falls back to the regular serializer when the plan is unavailable or
+    ``FAST_LIST_SERIALIZATION`` is off.
+    """
+
+    def list(self, request, *args, **kwargs):
+        plan = None
+        if getattr(settings, 'FAST_LIST_SERIALIZATION', False):
+            plan = compile_serializer(self.get_serializer())
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        columns = plan.attnames + [
+            name for name in self._ordering_attnames(queryset.model) if name not in plan.attnames
+        ]
+        rows = queryset.select_related(None).prefetch_related(None).values(*columns)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.serialize(page, self.get_serializer_context()))
+        return Response(plan.serialize(list(rows), self.get_serializer_context()))
+
+    def _ordering_attnames(self, model):
+        """Columns keyset pagination may read from a row besides the plan's own."""
+        names = list(getattr(self, 'ordering_fields', None) or []) + list(model._meta.ordering)
+        attnames = [model._meta.pk.attname]
+        for name in names:
+            try:
+                field = model._meta.get_field(name.lstrip('-'))
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and not field.many_to_many:
+                attnames.append(field.attname)
+        return attnames
@@ -0,0 +1,83 @@
+"""Sparse fieldsets (``?fields=``) and expansion control (``?expand=``).
+
+``?fields=id,title`` limits a read response to the listed top-level fields.
+``?expand=`` lists the nested objects to embed; serializers declare them in
+``Meta.expandable_fields``, mapping each one to what it becomes when it is
+not expanded: dropped (``None``) or collapsed to the primary key
+(``COLLAPSE_PK``). Without ``?expand=`` every nested object is embedded as
+before. Views use ``includes_field``/``expands_field`` to skip joins,
+prefetches and annotations the response will not use.
+"""
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+# Expandable field rendered as the related primary key when not expanded
+COLLAPSE_PK = 'pk'
+
+
+def _param_names(request, param):
+    """Return the comma-separated names of a query parameter, or None if absent."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    value = request.query_params.get(param)
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def includes_field(request, serializer_class, name):
+    """Return whether responses to ``request`` contain the field at all."""
+    only = _param_names(request, FIELDS_PARAM)
+    if only is not None and name not in only:
+        return False
+    expandable = getattr(serializer_class.Meta, 'expandable_fields', {})
+    if name in expandable and expandable[name] is None:
+        return expands_field(request, serializer_class, name)
+    return True
+
+
+def expands_field(request, serializer_class, name):
+    """Return whether responses to ``request`` embed the nested object."""
+    only = _param_names(request, FIELDS_PARAM)
+    if only is not None and name not in only:
+        return False
+    if name not in getattr(serializer_class.Meta, 'expandable_fields', {}):
+        return True
+    expand = _param_names(request, EXPAND_PARAM)
+    return expand is None or name in expand
+
+
+class FlexFieldsMixin:
+    """Apply ``?fields=`` and ``?expand=`` to a top-level serializer on reads."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self._is_top_level():
+            return fields
+
+        request = self.context.get('request')
+        expand = _param_names(request, EXPAND_PARAM)
+        if expand is not None:
+            for name, collapsed in getattr(self.Meta, 'expandable_fields', {}).items():
+                if name not in fields or name in expand:
+                    continue
+                if collapsed == COLLAPSE_PK:
+                    fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+                else:
+                    del fields[name]
+
+        only = _param_names(request, FIELDS_PARAM)
+        if only is not None:
+            for name in list(fields):
+                if name not in only:
+                    del fields[name]
+        return fields
+
+    def _is_top_level(self):
+        parent = self.parent
+        if parent is None:
+            return True
+        return isinstance(parent, serializers.ListSerializer) and parent.parent is None
@@ -0,0 +1,304 @@
+"""Pagination classes for list endpoints."""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a stable composite ordering.
+
+    The cursor carries the ordering values of the boundary row, so each page
+    is a bounded range scan on the ordering index instead of an OFFSET, and
+    the total count is only computed when the client passes ``?count=true``.
+    The primary key is always appended to the ordering as a tie-breaker.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_query_param = 'count'
+    ordering = ('-created_at',)
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.fields = [self._get_field(queryset.model, name) for name in self.ordering]
+        position, reverse = self.decode_cursor(request)
+
+        ordering = self._flip(self.ordering) if reverse else self.ordering
+        page_queryset = queryset.order_by(*self._order_expressions(ordering))
+        if position is not None:
+            page_queryset = page_queryset.filter(self._seek_filter(ordering, position))
+
+        results = list(page_queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.count = None
+        if self._wants_count(request):
+            self.count = queryset.order_by().count()
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            payload = {'count': self.count, **payload}
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'count': {'type': 'integer', 'example': 123},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                value = int(request.query_params[self.page_size_query_param])
+                if value > 0:
+                    return min(value, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Resolve the requested ordering into local concrete fields and append
+        the primary key so that every row has a unique position.
+        """
+        ordering = None
+        for backend in getattr(view, 'filter_backends', []):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        if not ordering:
+            ordering = queryset.query.order_by or queryset.model._meta.ordering or self.ordering
+
+        opts = queryset.model._meta
+        resolved = []
+        for term in ordering:
+            if not isinstance(term, str):
+                continue
+            descending = term.startswith('-')
+            name = term.lstrip('-')
+            if name == 'pk':
+                name = opts.pk.name
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if not field.concrete or field.many_to_many:
+                continue
+            attname = ('-' if descending else '') + field.attname
+            if attname.lstrip('-') not in [t.lstrip('-') for t in resolved]:
+                resolved.append(attname)
+
+        if not resolved:
+            resolved = list(self.ordering)
+        if opts.pk.attname not in [t.lstrip('-') for t in resolved]:
+            prefix = '-' if resolved[0].startswith('-') else ''
+            resolved.append(prefix + opts.pk.attname)
+        return resolved
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self._position(self.page[0]), reverse=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            values = payload['p']
+            reverse = bool(payload.get('r', False))
+            if len(values) != len(self.fields):
+                raise ValueError
+            position = [
+                None if value is None else field.to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except (TypeError, ValueError, KeyError, ValidationError, binascii.Error, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        payload = {'p': [self._dump(value) for value in position]}
+        if reverse:
+            payload['r'] = True
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(',', ':')).encode('ascii')
+        ).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _wants_count(self, request):
+        value = request.query_params.get(self.count_query_param, '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    def _position(self, instance):
+        return row_position(instance, self.ordering)
+
+    @staticmethod
+    def _get_field(model, attname):
+        attname = attname.lstrip('-')
+        for field in model._meta.concrete_fields:
+            if field.attname == attname:
+                return field
+        raise FieldDoesNotExist(attname)
+
+    @staticmethod
+    def _flip(ordering):
+        return [term[1:] if term.startswith('-') else '-' + term for term in ordering]
+
+    @staticmethod
+    def _order_expressions(ordering):
+        # NULL sorts as the smallest value in both directions, which matches
+        # MySQL's native behaviour and keeps the ORDER BY index-friendly.
+        expressions = []
+        for term in ordering:
+            if term.startswith('-'):
+                expressions.append(F(term[1:]).desc(nulls_last=True))
+            else:
+                expressions.append(F(term).asc(nulls_first=True))
+        return expressions
+
+    @staticmethod
+    def _seek_filter(ordering, position):
+        """
+        Build ``(a, b, c) > (x, y, z)`` for the given ordering as an OR of
+        prefix-equality terms, treating NULL as the smallest value.
+        """
+        seek = Q(pk__in=[])
+        equal = Q()
+        for term, value in zip(ordering, position):
+            descending = term.startswith('-')
+            name = term.lstrip('-')
+
+            if value is None:
+                after = Q() if descending else Q(**{f'{name}__isnull': False})
+                if not descending:
+                    seek |= equal & after
+                equal &= Q(**{f'{name}__isnull': True})
+            else:
+                if descending:
+                    after = Q(**{f'{name}__lt': value}) | Q(**{f'{name}__isnull': True})
+                else:
+                    after = Q(**{f'{name}__gt': value})
+                seek |= equal & after
+                equal &= Q(**{name: value})
+        return seek
+
+    @staticmethod
+    def _dump(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+
+def row_position(row, ordering):
+    """Return the ordering values of a model instance or a ``values()`` dict."""
+    if isinstance(row, dict):
+        return [row[term.lstrip('-')] for term in ordering]
+    return [getattr(row, term.lstrip('-')) for term in ordering]
+
+
+def keyset_chunks(queryset, ordering, chunk_size):
+    """
+    Yield the rows of ``queryset`` in ``ordering`` as lists of at most
+    ``chunk_size``, one seek query per chunk.
+
+    ``ordering`` is a list of attnames as returned by
+    ``KeysetPagination.get_ordering``. Memory stays bounded by the chunk
+    size whatever the database driver does with large result sets.
+    """
+    ordered = queryset.order_by(*KeysetPagination._order_expressions(ordering))
+    position = None
+    while True:
+        chunk_queryset = ordered
+        if position is not None:
+            chunk_queryset = ordered.filter(KeysetPagination._seek_filter(ordering, position))
+        rows = list(chunk_queryset[:chunk_size])
+        if rows:
+            yield rows
+        if len(rows) < chunk_size:
+            return
+        position = row_position(rows[-1], ordering)
+
+
+class HybridPagination(PageNumberPagination):
+    """
+    Page-number pagination that switches to keyset pagination when the
+    client opts in with ``?cursor=`` (an empty cursor requests the first page).
+
+    ``?page_size=`` is only honoured in cursor mode; page-number pages keep
+    the fixed ``PAGE_SIZE`` so existing page links stay stable.
+    """
+    keyset_class = KeysetPagination
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_previous_link()
+        return super().get_previous_link()
@@ -0,0 +1,203 @@
+"""Read-through cache for GET responses of list and detail endpoints.
+
+Cached responses are keyed by the caller's visibility scope, the full
+request URL and the current values of the *generation* counters the view
+depends on. Writes invalidate by incrementing a counter, which makes every
+key built from the old value unreachable; nothing is ever scanned or deleted
+and stale entries simply expire.
+"""
+import hashlib
+import logging
+import time
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from apps.metrics.registry import record_cache
+from . import async_cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds a rebuild may hold the dogpile lock before others give up on it
+LOCK_TIMEOUT = 10
+
+# How long a request waits for a concurrent rebuild before doing its own
+LOCK_WAIT = 2.0
+LOCK_POLL_INTERVAL = 0.05
+
+
+def _generation_key(name):
+    return f'generation:{name}'
+
+
+def _new_generation():
+    # Seeding from the clock keeps a lost counter from resurrecting entries
+    # cached under an older value.
+    return int(time.time() * 1000)
+
+
+def get_generations(names):
+    """Return the current value of each named generation counter."""
+    keys = [_generation_key(name) for name in names]
+    values = cache.get_many(keys) if keys else {}
+    for key in keys:
+        if key not in values:
+            cache.add(key, _new_generation(), None)
+            values[key] = cache.get(key)
+    return [values[key] for key in keys]
+
+
+async def aget_generations(names):
+    """Async variant of ``get_generations``."""
+    keys = [_generation_key(name) for name in names]
+    values = await async_cache.aget_many(keys) if keys else {}
+    for key in keys:
+        if key not in values:
+            await async_cache.aadd(key, _new_generation(), None)
+            values[key] = await async_cache.aget(key)
+    return [values[key] for key in keys]
+
+
+def bump_generations(*names):
+    """Increment the named generation counters."""
+    for name in set(names):
+        key = _generation_key(name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_generation(), None)
+
+
+def response_cache_scope(user):
+    return 'admin' if user.is_admin else f'user:{user.pk}'
+
+
+def response_cache_key(url, renderer_format, generations, basename, action, scope):
+    raw = f'{url}|{renderer_format}|{generations}'
+    digest = hashlib.sha1(raw.encode()).hexdigest()
+    return f'response:{basename}:{action}:{scope}:{digest}'
+
+
+def hit_response(entry):
+    content_type, content = entry
+    response = HttpResponse(zlib.decompress(content), content_type=content_type)
+    response['X-Cache'] = 'HIT'
+    return response
+
+
+async def aget_cached_response(request, basename, action, generation_names):
+    """
+    Return the JSON response ``ResponseCacheMixin`` stored for a GET request
+    of the named view and action by ``request.user``, or None.
+
+    Misses are not recorded: the view records them when it rebuilds the entry.
+    """
+    if not getattr(settings, 'RESPONSE_CACHE_ENABLED', False):
+        return None
+    generations = await aget_generations(generation_names)
+    key = response_cache_key(
+        request.build_absolute_uri(), 'json', generations, basename, action,
+        response_cache_scope(request.user),
+    )
+    entry = await async_cache.aget(key)
+    if entry is None:
+        return None
+    record_cache('response', True)
+    return hit_response(entry)
+
+
+class ResponseCacheMixin:
+    """
+    Serve ``list`` and ``retrieve`` from the cache.
+
+    Views implement ``get_cache_generations`` to name the counters their
+    responses depend on. Only successful responses of ``response_cache_formats``
+    are stored, zlib-compressed. On a miss a short lock ensures one request
+    rebuilds an entry while concurrent requests for it wait for the result.
+    Object permissions are not re-checked on a hit; that is safe because
+    only 200 responses are cached and the key is scoped to the caller.
+    """
+    response_cache_timeout = None
+    response_cache_formats = ('json',)
+
+    def get_cache_generations(self):
+        raise NotImplementedError('Views must name the generations they depend on')
+
+    def get_cache_scope(self):
+        return response_cache_scope(self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not self._response_cache_applies(request):
+            return handler(request, *args, **kwargs)
+
+        key = self.get_response_cache_key(request)
+        entry = cache.get(key)
+        if entry is None:
+            if cache.add(f'{key}:lock', 1, LOCK_TIMEOUT):
+                self._response_cache_key = key
+            else:
+                entry = self._wait_for_entry(key)
+
+        record_cache('response', entry is not None)
+        if entry is not None:
+            return hit_response(entry)
+        return handler(request, *args, **kwargs)
+
+    def get_response_cache_key(self, request):
+        return response_cache_key(
+            request.build_absolute_uri(),
+            request.accepted_renderer.format,
+            get_generations(self.get_cache_generations()),
+            self.basename,
+            self.action,
+            self.get_cache_scope(),
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, '_response_cache_key', None)
+        if key is None:
+            return response
+
+        self._response_cache_key = None
+        try:
+            if response.status_code == 200 and not response.streaming:
+                response.render()
+                entry = (response['Content-Type'], zlib.compress(response.content))
+                cache.set(key, entry, self._response_cache_timeout())
+                response['X-Cache'] = 'MISS'
+        except Exception as e:
+            logger.error(f"Failed to cache response for {request.path}: {str(e)}")
+        finally:
+            cache.delete(f'{key}:lock')
+        return response
+
+    def _response_cache_applies(self, request):
+        return (
+            getattr(settings, 'RESPONSE_CACHE_ENABLED', False)
+            and request.method == 'GET'
+            and request.accepted_renderer.format in self.response_cache_formats
+        )
+
+    def _response_cache_timeout(self):
+        if self.response_cache_timeout is not None:
+            return self.response_cache_timeout
+        return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60)
+
+    @staticmethod
+    def _wait_for_entry(key):
+        deadline = time.monotonic() + LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry
+        return None
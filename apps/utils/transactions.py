@@ -0,0 +1,59 @@
+"""Buffers of work to run once the current transaction commits."""
+import threading
+import weakref
+
+from django.db import transaction
+
+
+class _Flush:
+    """``on_commit`` callback flushing one buffer."""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        self.buffer.flush()
+
+
+class CommitBuffers:
+    """
+    Per-thread buffers, one per savepoint, each flushed by its own
+    ``transaction.on_commit`` callback.
+
+    ``get()`` returns the buffer of the innermost savepoint of the current
+    transaction, creating and registering it on first use. Rolling back a
+    savepoint discards its callback, so the buffer and everything added to
+    it are dropped while the enclosing savepoints still flush theirs. The
+    registry only holds weak references to the callbacks: once Django
+    discards or runs a callback its buffer is replaced on the next ``get()``.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._local = threading.local()
+
+    def get(self, using=None):
+        connection = transaction.get_connection(using)
+        # Atomic blocks without a savepoint roll back with their parent
+        key = (connection.alias, tuple(sid for sid in connection.savepoint_ids if sid is not None))
+
+        buffers = self._local.__dict__.setdefault('buffers', {})
+        for stale in [k for k, (_, ref) in buffers.items() if not self._pending(ref)]:
+            del buffers[stale]
+
+        entry = buffers.get(key)
+        if entry is not None:
+            return entry[0]
+
+        buffer = self.factory()
+        flush = _Flush(buffer)
+        buffers[key] = (buffer, weakref.ref(flush))
+        transaction.on_commit(flush, using=using)
+        return buffer
+
+    @staticmethod
+    def _pending(ref):
+        flush = ref()
+        return flush is not None and not flush.done
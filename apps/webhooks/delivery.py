@@ -0,0 +1,196 @@
+"""
+Coalescing, batching, signing and sending of webhook deliveries.
+
+Each worker process keeps one ``requests`` session whose connection pool
+holds keep-alive connections to webhook endpoints, so a batch costs a
+request on an open connection rather than a TCP and TLS handshake.
+Deliveries carry ``X-Webhook-Signature: sha256=<hex>``, the HMAC-SHA256 of
+``"<X-Webhook-Timestamp>.<body>"`` keyed with the webhook's secret.
+
+A failed batch is retried together with the batches after it, with
+exponential backoff, and stored as a dead letter once retries are
+exhausted or the endpoint rejects it with a non-retryable status.
+"""
+import hashlib
+import hmac
+import logging
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from http import HTTPStatus
+
+import orjson
+import requests
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+from apps.feed.events import EventBuffer
+from .models import WebhookDeadLetter
+from .network import BlockedAddress, GuardedAdapter, check_url
+
+logger = logging.getLogger(__name__)
+
+# Client errors worth retrying; other 4xx responses are dead-lettered at once
+RETRYABLE_STATUSES = {408, 425, 429}
+
+_session = None
+
+
+@dataclass
+class DeliveryResult:
+    ok: bool
+    retryable: bool = False
+    status_code: int = None
+    error: str = ''
+
+
+def get_session():
+    """Return this process's pooled session, created after the worker forks."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        # Environment proxies would be connected to instead of the checked endpoint
+        session.trust_env = False
+        adapter = GuardedAdapter(
+            pool_connections=settings.WEBHOOK_POOL_SIZE,
+            pool_maxsize=settings.WEBHOOK_POOL_SIZE,
+            max_retries=0,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({
+            'Content-Type': 'application/json',
+            'User-Agent': 'TaskAPI-Webhooks/1.0',
+        })
+        _session = session
+    return _session
+
+
+def coalesce(events):
+    """
+    Merge events of the same object: updates fold into one event with all
+    changed fields, and a creation followed by updates stays a creation.
+    """
+    buffer = EventBuffer()
+    for event in events:
+        buffer.add(None, event)
+    return list(buffer.events.values())
+
+
+def sign(secret, timestamp, body):
+    message = str(timestamp).encode() + b'.' + body
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def build_body(webhook, events):
+    return orjson.dumps({
+        'id': uuid.uuid4().hex,
+        'webhook': webhook.id,
+        'project': webhook.project_id,
+        'events': events,
+    })
+
+
+def send(webhook, body):
+    """
+    POST a signed body to a webhook.
+
+    Only the status code and a short reason are kept from a failure; the
+    response body is never stored, so an endpoint cannot be used to read
+    responses of other services back through dead letters.
+    """
+    try:
+        check_url(webhook.url)
+    except BlockedAddress as e:
+        return DeliveryResult(ok=False, error=str(e))
+
+    timestamp = int(time.time())
+    headers = {
+        'X-Webhook-Id': str(webhook.id),
+        'X-Webhook-Timestamp': str(timestamp),
+        'X-Webhook-Signature': f'sha256={sign(webhook.secret, timestamp, body)}',
+    }
+    try:
+        response = get_session().post(
+            webhook.url, data=body, headers=headers, timeout=settings.WEBHOOK_TIMEOUT_SECONDS,
+            allow_redirects=False,
+        )
+    except requests.RequestException as e:
+        return DeliveryResult(ok=False, retryable=True, error=type(e).__name__)
+
+    status_code = response.status_code
+    if 200 <= status_code < 300:
+        return DeliveryResult(ok=True, status_code=status_code)
+    return DeliveryResult(
+        ok=False,
+        retryable=status_code >= 500 or status_code in RETRYABLE_STATUSES,
+        status_code=status_code,
+        error=status_phrase(status_code),
+    )
+
+
+def status_phrase(status_code):
+    try:
+        return HTTPStatus(status_code).phrase
+    except ValueError:
+        return ''
+
+
+def backoff(attempt):
+    """Seconds before retry ``attempt + 1``, doubling with jitter up to a cap."""
+    delay = min(
+        settings.WEBHOOK_RETRY_BASE_SECONDS * 2 ** (attempt - 1),
+        settings.WEBHOOK_RETRY_MAX_SECONDS,
+    )
+    return random.uniform(delay / 2, delay)
+
+
+def deliver(webhook, events, attempt=1):
+    """
+    Send events to a webhook in batches of ``WEBHOOK_BATCH_SIZE``.
+
+    Returns the number of events delivered. On the first failure the
+    remaining events are handed to a retry or a dead letter, so an
+    unreachable endpoint costs one timeout per attempt. Events left when the
+    task's soft time limit strikes are handed to a retry as well.
+    """
+    batch_size = settings.WEBHOOK_BATCH_SIZE
+    for start in range(0, len(events), batch_size):
+        try:
+            result = send(webhook, build_body(webhook, events[start:start + batch_size]))
+        except SoftTimeLimitExceeded:
+            fail(webhook, events[start:], attempt, DeliveryResult(
+                ok=False, retryable=True, error='Delivery time limit exceeded'
+            ))
+            raise
+        if not result.ok:
+            fail(webhook, events[start:], attempt, result)
+            return start
+    return len(events)
+
+
+def fail(webhook, events, attempt, result):
+    if result.retryable and attempt < settings.WEBHOOK_MAX_ATTEMPTS:
+        from .tasks import retry_webhook_delivery
+
+        delay = backoff(attempt)
+        logger.warning(
+            f"Webhook {webhook.id} delivery attempt {attempt} failed "
+            f"({result.status_code or result.error}), retrying in {delay:.0f}s"
+        )
+        retry_webhook_delivery.apply_async(
+            (webhook.id, events, attempt + 1), countdown=delay
+        )
+        return
+
+    WebhookDeadLetter.objects.create(
+        webhook=webhook,
+        events=events,
+        attempts=attempt,
+        status_code=result.status_code,
+        error=result.error,
+    )
+    logger.error(
+        f"Webhook {webhook.id} gave up on {len(events)} events after {attempt} attempts: "
+        f"{result.status_code or result.error}"
+    )
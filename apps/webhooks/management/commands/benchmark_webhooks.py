@@ -0,0 +1,78 @@
+"""Benchmark webhook delivery against a local stub endpoint."""
+import time
+
+import orjson
+import requests
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.utils import timezone
+
+from apps.webhooks.delivery import coalesce, deliver
+from apps.webhooks.models import Webhook
+from apps.webhooks.stub import StubEndpoint
+
+
+class Command(BaseCommand):
+    help = (
+        'Deliver a burst of task events to a local stub endpoint, once with one '
+        'fresh request per event and once through coalescing, batching and the '
+        'pooled session, and report events per second for both.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=20000)
+        parser.add_argument('--objects', type=int, default=2000, help='Distinct tasks the events update')
+        parser.add_argument(
+            '--baseline-events', type=int, default=1000,
+            help='Events sent one request each; the per-event path is slow, so it runs on a sample'
+        )
+
+    def handle(self, *args, **options):
+        events = self.make_events(options['events'], options['objects'])
+
+        with StubEndpoint(record=False) as endpoint:
+            sample = events[:options['baseline_events']]
+            per_event = self.time(lambda: self.send_each(endpoint.url, sample))
+            self.report('per event', len(sample), per_event, endpoint)
+
+            webhook = Webhook(id=0, project_id=0, url=endpoint.url, secret='benchmark')
+            endpoint.server.requests = endpoint.server.connections = 0
+            # The stub listens on loopback over plain http
+            with override_settings(WEBHOOK_REQUIRE_HTTPS=False, WEBHOOK_ALLOW_PRIVATE_ADDRESSES=True):
+                batched = self.time(lambda: deliver(webhook, coalesce(events)))
+            self.report('batched', len(events), batched, endpoint)
+
+        self.stdout.write(f'speedup {len(events) / batched / (len(sample) / per_event):.1f}x')
+
+    @staticmethod
+    def make_events(count, objects):
+        now = timezone.now().isoformat()
+        return [
+            {
+                'type': 'task.updated',
+                'id': i % objects,
+                'board': 1,
+                'fields': {'status': 'IN_PROGRESS', 'title': f'Task {i % objects} v{i // objects}'},
+                'version': now,
+            }
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def send_each(url, events):
+        # What the old Celery task did: a new connection and request per event
+        for event in events:
+            requests.post(url, data=orjson.dumps(event), timeout=5)
+
+    @staticmethod
+    def time(func):
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+
+    def report(self, label, count, seconds, endpoint):
+        self.stdout.write(
+            f'{label:<10} {count:>7} events in {seconds * 1000:8.1f} ms   '
+            f'{count / seconds:10.0f} events/s   {endpoint.requests} requests '
+            f'over {endpoint.connections} connections'
+        )
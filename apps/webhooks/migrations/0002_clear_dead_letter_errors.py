@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def clear_errors(apps, schema_editor):
+    # Errors used to hold the endpoint's response body; keep none of it
+    WebhookDeadLetter = apps.get_model('webhooks', 'WebhookDeadLetter')
+    WebhookDeadLetter.objects.exclude(error='').update(error='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webhooks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_errors, migrations.RunPython.noop),
+    ]
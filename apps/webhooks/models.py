@@ -0,0 +1,81 @@
+"""Webhook subscriptions and undeliverable batches."""
+import secrets
+
+from django.db import models
+from django.conf import settings
+
+from apps.projects.models import Project
+
+# Event types a webhook can subscribe to, as sent by the change feed
+EVENT_TYPES = [
+    f'{kind}.{action}'
+    for kind in ('task', 'comment', 'board')
+    for action in ('created', 'updated', 'deleted')
+]
+
+
+def generate_secret():
+    return secrets.token_hex(32)
+
+
+class Webhook(models.Model):
+    """An endpoint receiving a project's change events."""
+
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='webhooks'
+    )
+    url = models.URLField(max_length=500)
+    # Key of the HMAC-SHA256 signature sent with every delivery
+    secret = models.CharField(max_length=64, default=generate_secret)
+    # Subscribed event types; empty means all of them
+    events = models.JSONField(default=list, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='webhooks'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'webhooks'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', 'is_active']),
+        ]
+
+    def __str__(self):
+        return f"{self.url} ({self.project_id})"
+
+    def accepts(self, event_type):
+        return not self.events or event_type in self.events
+
+
+class WebhookDeadLetter(models.Model):
+    """Events a webhook did not accept after all delivery attempts."""
+
+    webhook = models.ForeignKey(
+        Webhook,
+        on_delete=models.CASCADE,
+        related_name='dead_letters'
+    )
+    events = models.JSONField()
+    attempts = models.PositiveSmallIntegerField()
+    # Status of the last attempt; null when the endpoint was unreachable
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'webhook_dead_letters'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['webhook', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{len(self.events)} events for webhook {self.webhook_id}"
@@ -0,0 +1,117 @@
+"""
+Guards keeping webhook deliveries away from internal networks.
+
+Webhook URLs are checked when saved and again before every send, and the
+delivery session connects only to the addresses it checked, so a host
+re-pointed to an internal address after the check (DNS rebinding) is
+refused as well.
+"""
+import ipaddress
+import socket
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util import connection
+
+
+class BlockedAddress(ValueError):
+    """A webhook URL that must not be requested."""
+
+
+def lookup(host, port):
+    """Return the addresses ``host`` resolves to."""
+    try:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror:
+        raise BlockedAddress(f'{host} does not resolve.')
+    return list(dict.fromkeys(info[4][0] for info in infos))
+
+
+def is_public(address):
+    """Whether an address is globally routable: not loopback, private, link-local or reserved."""
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def resolve(host, port):
+    """Resolve ``host``, refusing it when any of its addresses is not public."""
+    addresses = lookup(host, port)
+    if not addresses:
+        raise BlockedAddress(f'{host} does not resolve.')
+    if not settings.WEBHOOK_ALLOW_PRIVATE_ADDRESSES and not all(map(is_public, addresses)):
+        raise BlockedAddress(f'{host} resolves to a non-public address.')
+    return addresses
+
+
+def check_url(url):
+    """Raise ``BlockedAddress`` unless ``url`` may receive webhook deliveries."""
+    parts = urlsplit(url)
+    allowed = ('https',) if settings.WEBHOOK_REQUIRE_HTTPS else ('http', 'https')
+    if parts.scheme not in allowed:
+        raise BlockedAddress('Webhook URLs must use https.')
+    if not parts.hostname:
+        raise BlockedAddress('Webhook URLs need a host.')
+    try:
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+    except ValueError:
+        raise BlockedAddress('Webhook URL has an invalid port.')
+    resolve(parts.hostname, port)
+
+
+class GuardedConnectionMixin:
+    """Connect only to checked addresses of the host, never re-resolving it."""
+
+    def _new_conn(self):
+        try:
+            addresses = resolve(self._dns_host, self.port)
+        except BlockedAddress as e:
+            raise NewConnectionError(self, str(e)) from e
+
+        error = None
+        for address in addresses:
+            try:
+                return connection.create_connection(
+                    (address, self.port),
+                    self.timeout,
+                    source_address=self.source_address,
+                    socket_options=self.socket_options,
+                )
+            except OSError as e:
+                error = e
+        raise NewConnectionError(self, f'Failed to establish a new connection: {error}')
+
+
+class GuardedHTTPConnection(GuardedConnectionMixin, HTTPConnection):
+    pass
+
+
+class GuardedHTTPSConnection(GuardedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class GuardedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = GuardedHTTPConnection
+
+
+class GuardedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = GuardedHTTPSConnection
+
+
+class GuardedAdapter(HTTPAdapter):
+    """HTTP adapter whose connections pass through ``resolve``."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': GuardedHTTPConnectionPool,
+            'https': GuardedHTTPSConnectionPool,
+        }
@@ -0,0 +1,89 @@
+"""
+Redis queue of change events waiting to be delivered to webhooks.
+
+Committed events of projects with webhooks are appended to a per-project
+list, and the project is scheduled in a sorted set for
+``WEBHOOK_COALESCE_SECONDS`` after its first pending event. The periodic
+dispatcher takes the events of due projects with a script, so an event is
+handed to exactly one delivery even when dispatchers overlap, and a busy
+project costs one delivery task per window instead of one per event.
+"""
+import logging
+import time
+
+import orjson
+from django.conf import settings
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+DUE_KEY = 'webhooks:due'
+
+# KEYS[1]: pending list, KEYS[2]: due set; ARGV: project id, max events, next due time
+TAKE_SCRIPT = """
+local events = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[2]) - 1)
+redis.call('LTRIM', KEYS[1], #events, -1)
+if redis.call('LLEN', KEYS[1]) == 0 then
+    redis.call('ZREM', KEYS[2], ARGV[1])
+else
+    redis.call('ZADD', KEYS[2], ARGV[3], ARGV[1])
+end
+return events
+"""
+
+_script = None
+
+
+def pending_key(project_id):
+    return f'webhooks:pending:{project_id}'
+
+
+def get_redis():
+    return get_redis_connection('default')
+
+
+def push(events):
+    """
+    Queue ``(project_id, event)`` pairs for delivery.
+
+    Queueing is best effort, like the feed: a Redis failure is logged and
+    the events are not delivered.
+    """
+    by_project = {}
+    for project_id, event in events:
+        by_project.setdefault(project_id, []).append(orjson.dumps(event))
+
+    due = time.time() + settings.WEBHOOK_COALESCE_SECONDS
+    try:
+        pipeline = get_redis().pipeline()
+        for project_id, payloads in by_project.items():
+            pipeline.rpush(pending_key(project_id), *payloads)
+        # NX keeps the deadline of the first pending event
+        pipeline.zadd(DUE_KEY, {str(project_id): due for project_id in by_project}, nx=True)
+        pipeline.execute()
+    except Exception as e:
+        logger.error(f"Failed to queue {len(events)} webhook events: {str(e)}")
+
+
+def due_projects(limit=500):
+    """Return ids of projects whose coalescing window has passed."""
+    return [
+        int(project_id)
+        for project_id in get_redis().zrangebyscore(DUE_KEY, '-inf', time.time(), start=0, num=limit)
+    ]
+
+
+def take(project_id, limit):
+    """
+    Remove and return up to ``limit`` pending events of a project, oldest
+    first. A project with events left over stays due.
+    """
+    global _script
+    redis = get_redis()
+    if _script is None:
+        _script = redis.register_script(TAKE_SCRIPT)
+    payloads = _script(
+        keys=[pending_key(project_id), DUE_KEY],
+        args=[project_id, limit, time.time()],
+    )
+    return [orjson.loads(payload) for payload in payloads]
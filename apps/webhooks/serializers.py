@@ -0,0 +1,49 @@
+"""Serializers for Webhook API."""
+from rest_framework import serializers
+
+from apps.projects.access import OWNER_ROLE, get_project_role
+from apps.projects.models import ProjectMember
+from .models import EVENT_TYPES, Webhook, WebhookDeadLetter
+from .network import BlockedAddress, check_url
+
+
+class WebhookSerializer(serializers.ModelSerializer):
+    """Serializer for webhooks."""
+    events = serializers.ListField(
+        child=serializers.ChoiceField(choices=EVENT_TYPES), required=False
+    )
+
+    class Meta:
+        model = Webhook
+        fields = [
+            'id', 'project', 'url', 'secret', 'events', 'is_active',
+            'created_by', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'secret', 'created_by', 'created_at', 'updated_at']
+
+    def validate_project(self, project):
+        user = self.context['request'].user
+        if not user.is_admin and get_project_role(
+            user, project.id, owner_id=project.owner_id
+        ) not in (OWNER_ROLE, ProjectMember.Role.ADMIN):
+            raise serializers.ValidationError('Only project admins can manage webhooks.')
+        return project
+
+    def validate_url(self, url):
+        try:
+            check_url(url)
+        except BlockedAddress as e:
+            raise serializers.ValidationError(str(e))
+        return url
+
+    def validate_events(self, events):
+        return sorted(set(events))
+
+
+class WebhookDeadLetterSerializer(serializers.ModelSerializer):
+    """Serializer for dead-lettered webhook events."""
+
+    class Meta:
+        model = WebhookDeadLetter
+        fields = ['id', 'webhook', 'events', 'attempts', 'status_code', 'error', 'created_at']
+        read_only_fields = fields
@@ -0,0 +1,50 @@
+"""Signal handlers queueing committed change events for webhooks."""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.feed.events import events_committed
+from . import queue
+from .models import Webhook
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBED_PROJECTS_KEY = 'webhooks:subscribed_projects'
+
+
+def subscribed_project_ids():
+    """Return the ids of projects with active webhooks, cached until one changes."""
+    project_ids = cache.get(SUBSCRIBED_PROJECTS_KEY)
+    if project_ids is None:
+        project_ids = set(
+            Webhook.objects.filter(is_active=True).order_by().values_list('project_id', flat=True)
+        )
+        cache.set(SUBSCRIBED_PROJECTS_KEY, project_ids, None)
+    return project_ids
+
+
+@receiver(events_committed)
+def queue_webhook_events(sender, events, **kwargs):
+    """Queue the committed events of projects that have webhooks."""
+    if not settings.WEBHOOKS_ENABLED:
+        return
+    try:
+        project_ids = subscribed_project_ids()
+    except Exception as e:
+        logger.error(f"Failed to load webhook subscriptions: {str(e)}")
+        return
+    if not project_ids:
+        return
+    events = [(project_id, event) for project_id, event in events if project_id in project_ids]
+    if events:
+        queue.push(events)
+
+
+@receiver(post_save, sender=Webhook)
+@receiver(post_delete, sender=Webhook)
+def invalidate_subscribed_projects(sender, instance, **kwargs):
+    transaction.on_commit(lambda: cache.delete(SUBSCRIBED_PROJECTS_KEY))
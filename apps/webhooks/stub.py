@@ -0,0 +1,74 @@
+"""Local HTTP endpoint standing in for webhook receivers in benchmarks and tests."""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so pooled clients reuse their connections
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            if server.record:
+                server.received.append((dict(self.headers), body))
+            status = server.statuses.pop(0) if server.statuses else server.status
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubEndpoint:
+    """
+    Accepts POSTs on a free local port in a background thread.
+
+    Responds with ``statuses`` in order, then with ``status``, and keeps the
+    received ``(headers, body)`` pairs when ``record`` is set.
+    """
+
+    def __init__(self, status=204, statuses=None, record=True):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.status = status
+        self.server.statuses = list(statuses or [])
+        self.server.record = record
+        self.server.received = []
+        self.server.requests = 0
+        self.server.connections = 0
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f'http://{host}:{port}/hook'
+
+    @property
+    def received(self):
+        return self.server.received
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    @property
+    def connections(self):
+        return self.server.connections
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,69 @@
+"""Celery tasks dispatching and delivering webhook events."""
+from celery import shared_task
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def dispatch_webhook_events():
+    """Hand the queued events of every due project to one delivery task each."""
+    from . import queue
+
+    dispatched = 0
+    for project_id in queue.due_projects():
+        events = queue.take(project_id, settings.WEBHOOK_MAX_EVENTS_PER_DISPATCH)
+        if not events:
+            continue
+        try:
+            deliver_webhook_events.delay(project_id, events)
+            dispatched += 1
+        except Exception as e:
+            logger.error(f"Failed to dispatch {len(events)} webhook events of project {project_id}: {str(e)}")
+
+    return dispatched
+
+
+@shared_task
+def deliver_webhook_events(project_id, events):
+    """Coalesce a project's events and deliver them to its active webhooks."""
+    from .delivery import coalesce, deliver
+    from .models import Webhook
+
+    events = coalesce(events)
+    pending = []
+    for webhook in Webhook.objects.filter(project_id=project_id, is_active=True):
+        selected = [event for event in events if webhook.accepts(event['type'])]
+        if selected:
+            pending.append((webhook, selected))
+
+    delivered = 0
+    for index, (webhook, selected) in enumerate(pending):
+        try:
+            delivered += deliver(webhook, selected)
+        except SoftTimeLimitExceeded:
+            # Hand the webhooks not reached to retries on the bulk queue
+            for skipped, skipped_events in pending[index + 1:]:
+                retry_webhook_delivery.delay(skipped.id, skipped_events, 1)
+            logger.warning(
+                f"Webhook delivery for project {project_id} hit its time limit, "
+                f"{len(pending) - index - 1} webhooks left to retries"
+            )
+            break
+
+    return delivered
+
+
+@shared_task
+def retry_webhook_delivery(webhook_id, events, attempt):
+    """Retry events a webhook failed to accept."""
+    from .delivery import deliver
+    from .models import Webhook
+
+    webhook = Webhook.objects.filter(pk=webhook_id, is_active=True).first()
+    if webhook is None:
+        return 0
+
+    return deliver(webhook, events, attempt)
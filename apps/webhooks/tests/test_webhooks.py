@@ -0,0 +1,326 @@
+"""Tests for webhook subscriptions and delivery."""
+import hashlib
+import hmac
+import ipaddress
+
+import orjson
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from apps.projects.models import Project, ProjectMember, Board
+from apps.tasks.models import Task
+from apps.webhooks import delivery, network, queue
+from apps.webhooks.models import Webhook, WebhookDeadLetter
+from apps.webhooks.stub import StubEndpoint
+from apps.webhooks.tasks import deliver_webhook_events
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cached subscriptions and access checks must not leak between tests."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(
+        username='testuser',
+        email='test@example.com',
+        password='testpass123'
+    )
+
+
+@pytest.fixture
+def project(user):
+    return Project.objects.create(name='Test Project', owner=user)
+
+
+@pytest.fixture
+def board(project):
+    return Board.objects.create(name='Test Board', project=project)
+
+
+# Addresses the fake resolver hands out; anything else does not resolve
+HOSTS = {
+    'example.com': ['93.184.216.34'],
+    'internal.example.com': ['93.184.216.35', '10.0.0.5'],
+}
+
+
+@pytest.fixture(autouse=True)
+def resolver(monkeypatch):
+    """Resolve hosts from HOSTS instead of DNS; IP literals resolve to themselves."""
+    def lookup(host, port):
+        if host in HOSTS:
+            return HOSTS[host]
+        try:
+            return [str(ipaddress.ip_address(host))]
+        except ValueError:
+            pass
+        raise network.BlockedAddress(f'{host} does not resolve.')
+
+    monkeypatch.setattr(network, 'lookup', lookup)
+    return lookup
+
+
+@pytest.fixture
+def local_endpoints(settings):
+    """Allow deliveries to the plain-http stub on loopback."""
+    settings.WEBHOOK_REQUIRE_HTTPS = False
+    settings.WEBHOOK_ALLOW_PRIVATE_ADDRESSES = True
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    """Collect queued events instead of writing them to Redis."""
+    pushed = []
+    monkeypatch.setattr(queue, 'push', pushed.extend)
+    return pushed
+
+
+def event(event_type, object_id, fields, version='2024-01-01T00:00:00+00:00'):
+    return {'type': event_type, 'id': object_id, 'board': 1, 'fields': fields, 'version': version}
+
+
+@pytest.mark.django_db(transaction=True)
+class TestEventQueueing:
+    """Test committed changes are queued for projects with webhooks only."""
+
+    def test_only_subscribed_projects_are_queued(self, user, board, queued):
+        other_board = Board.objects.create(
+            name='Quiet', project=Project.objects.create(name='Quiet', owner=user)
+        )
+        Webhook.objects.create(project=board.project, url='http://example.com/hook')
+        queued.clear()
+
+        with transaction.atomic():
+            task = Task.objects.create(title='Task', board=board, reporter=user)
+            task.title = 'Renamed'
+            task.save()
+            Task.objects.create(title='Elsewhere', board=other_board, reporter=user)
+
+        assert [(project_id, e['type']) for project_id, e in queued] == [
+            (board.project_id, 'task.created')
+        ]
+        assert queued[0][1]['fields']['title'] == 'Renamed'
+
+    def test_disabled_webhooks_are_not_queued(self, user, board, queued, settings):
+        settings.WEBHOOKS_ENABLED = False
+        Webhook.objects.create(project=board.project, url='http://example.com/hook')
+        Task.objects.create(title='Task', board=board, reporter=user)
+
+        assert queued == []
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('local_endpoints')
+class TestDelivery:
+    """Test coalescing, batching, signing and retries against a local endpoint."""
+
+    def test_events_are_coalesced_batched_and_signed(self, project, settings):
+        settings.WEBHOOK_BATCH_SIZE = 2
+        events = [
+            event('task.created', 1, {'title': 'A', 'status': 'TODO'}),
+            event('task.updated', 1, {'status': 'IN_PROGRESS'}),
+            event('task.updated', 2, {'title': 'B'}),
+            event('task.updated', 2, {'priority': 'HIGH'}, version='2024-01-02T00:00:00+00:00'),
+            event('comment.created', 5, {'content': 'Hi'}),
+            event('task.deleted', 3, {}),
+        ]
+
+        with StubEndpoint() as endpoint:
+            webhook = Webhook.objects.create(project=project, url=endpoint.url)
+            comments = Webhook.objects.create(project=project, url=endpoint.url, events=['comment.created'])
+            delivered = deliver_webhook_events(project.id, events)
+
+        assert delivered == 5
+        received = [orjson.loads(body) for _, body in endpoint.received]
+        bodies = [body for body in received if body['webhook'] == webhook.id]
+        assert [len(body['events']) for body in bodies] == [2, 2]
+        assert [
+            [e['type'] for e in body['events']] for body in received if body['webhook'] == comments.id
+        ] == [['comment.created']]
+        merged = bodies[0]['events']
+        assert merged[0]['type'] == 'task.created'
+        assert merged[0]['fields'] == {'title': 'A', 'status': 'IN_PROGRESS'}
+        assert merged[1]['fields'] == {'title': 'B', 'priority': 'HIGH'}
+        assert merged[1]['version'] == '2024-01-02T00:00:00+00:00'
+        assert all(body['project'] == project.id for body in bodies)
+        assert endpoint.connections < endpoint.requests
+
+        headers, body = next(
+            (headers, body) for headers, body in endpoint.received
+            if headers['X-Webhook-Id'] == str(webhook.id)
+        )
+        expected = hmac.new(
+            webhook.secret.encode(), headers['X-Webhook-Timestamp'].encode() + b'.' + body, hashlib.sha256
+        ).hexdigest()
+        assert headers['X-Webhook-Signature'] == f'sha256={expected}'
+
+    def test_failures_are_retried_then_dead_lettered(self, project, settings, monkeypatch):
+        settings.WEBHOOK_MAX_ATTEMPTS = 3
+        delays = []
+        monkeypatch.setattr(delivery, 'backoff', lambda attempt: delays.append(attempt) or 0)
+        events = [event('task.updated', 1, {'title': 'A'})]
+
+        with StubEndpoint(statuses=[503], status=500) as endpoint:
+            webhook = Webhook.objects.create(project=project, url=endpoint.url)
+            assert deliver_webhook_events(project.id, events) == 0
+
+        assert endpoint.requests == 3
+        assert delays == [1, 2]
+        letter = WebhookDeadLetter.objects.get(webhook=webhook)
+        assert letter.attempts == 3
+        assert letter.status_code == 500
+        assert letter.error == 'Internal Server Error'
+        assert letter.events == events
+
+    def test_time_limit_hands_remaining_events_to_retries(self, project, monkeypatch):
+        sent = []
+
+        def send(webhook, body):
+            sent.append(webhook.id)
+            if len(sent) == 1:
+                raise SoftTimeLimitExceeded()
+            return delivery.DeliveryResult(ok=True, status_code=204)
+
+        monkeypatch.setattr(delivery, 'send', send)
+        monkeypatch.setattr(delivery, 'backoff', lambda attempt: 0)
+        first = Webhook.objects.create(project=project, url='http://example.com/a')
+        second = Webhook.objects.create(project=project, url='http://example.com/b')
+
+        assert deliver_webhook_events(project.id, [event('task.updated', 1, {'title': 'A'})]) == 0
+
+        assert sorted(sent) == sorted([second.id, second.id, first.id])
+        assert not WebhookDeadLetter.objects.exists()
+
+    def test_rejected_delivery_is_not_retried(self, project, settings):
+        settings.WEBHOOK_BATCH_SIZE = 1
+        with StubEndpoint(statuses=[204], status=400) as endpoint:
+            webhook = Webhook.objects.create(project=project, url=endpoint.url)
+            delivered = deliver_webhook_events(project.id, [
+                event('task.updated', 1, {'title': 'A'}),
+                event('task.updated', 2, {'title': 'B'}),
+            ])
+
+        assert delivered == 1
+        assert endpoint.requests == 2
+        letter = WebhookDeadLetter.objects.get(webhook=webhook)
+        assert (letter.attempts, letter.status_code) == (1, 400)
+        assert [e['id'] for e in letter.events] == [2]
+
+    def test_backoff_doubles_up_to_the_cap(self, settings):
+        settings.WEBHOOK_RETRY_BASE_SECONDS = 10
+        settings.WEBHOOK_RETRY_MAX_SECONDS = 60
+
+        assert 5 <= delivery.backoff(1) <= 10
+        assert 20 <= delivery.backoff(3) <= 40
+        assert 30 <= delivery.backoff(10) <= 60
+
+
+@pytest.mark.django_db
+class TestWebhookAPI:
+    """Test webhook management endpoints."""
+
+    def test_project_admins_manage_webhooks(self, api_client, user, project):
+        api_client.force_authenticate(user=user)
+        response = api_client.post(reverse('webhook-list'), {
+            'project': project.id,
+            'url': 'https://example.com/hook',
+            'events': ['task.updated', 'task.created', 'task.updated'],
+        }, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['events'] == ['task.created', 'task.updated']
+        assert len(response.data['secret']) == 64
+        assert response.data['created_by'] == user.id
+
+    def test_members_cannot_see_or_create_webhooks(self, api_client, user, project):
+        member = User.objects.create_user(username='member', email='member@example.com', password='x')
+        ProjectMember.objects.create(project=project, user=member, role=ProjectMember.Role.MEMBER)
+        Webhook.objects.create(project=project, url='https://example.com/hook')
+        api_client.force_authenticate(user=member)
+
+        assert api_client.get(reverse('webhook-list')).data['results'] == []
+        response = api_client.post(reverse('webhook-list'), {
+            'project': project.id, 'url': 'https://example.com/other',
+        }, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_dead_letters_can_be_redelivered(self, api_client, user, project, local_endpoints):
+        events = [event('task.updated', 1, {'title': 'A'})]
+        with StubEndpoint() as endpoint:
+            webhook = Webhook.objects.create(project=project, url=endpoint.url)
+            WebhookDeadLetter.objects.create(webhook=webhook, events=events, attempts=8, status_code=500)
+            api_client.force_authenticate(user=user)
+
+            letters = api_client.get(reverse('webhook-dead-letters', args=[webhook.id]))
+            assert letters.data['results'][0]['events'] == events
+
+            response = api_client.post(reverse('webhook-redeliver', args=[webhook.id]), {}, format='json')
+
+        assert response.data == {'redelivered': 1}
+        assert orjson.loads(endpoint.received[0][1])['events'] == events
+        assert not WebhookDeadLetter.objects.exists()
+
+
+@pytest.mark.django_db
+class TestAddressGuard:
+    """Test webhooks cannot be pointed at internal addresses."""
+
+    @pytest.mark.parametrize('url', [
+        'https://127.0.0.1/hook',
+        'https://169.254.169.254/latest/meta-data/',
+        'https://10.0.0.1/hook',
+        'https://[::1]/hook',
+        'https://internal.example.com/hook',
+        'https://missing.example.com/hook',
+        'http://example.com/hook',
+    ])
+    def test_internal_and_plain_http_urls_are_rejected(self, api_client, user, project, settings, url):
+        settings.WEBHOOK_REQUIRE_HTTPS = True
+        api_client.force_authenticate(user=user)
+        response = api_client.post(reverse('webhook-list'), {
+            'project': project.id, 'url': url,
+        }, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'url' in response.data['field_errors']
+
+    def test_rebinding_after_the_check_is_refused(self, project, settings, monkeypatch, resolver):
+        settings.WEBHOOK_REQUIRE_HTTPS = False
+        monkeypatch.setattr(delivery, 'backoff', lambda attempt: 0)
+
+        with StubEndpoint() as endpoint:
+            port = endpoint.server.server_address[1]
+            checks = []
+
+            def rebinding(host, port):
+                if host != 'rebind.example.com':
+                    return resolver(host, port)
+                checks.append(host)
+                # Public for the first check, loopback from then on
+                return ['93.184.216.34'] if len(checks) == 1 else ['127.0.0.1']
+
+            monkeypatch.setattr(network, 'lookup', rebinding)
+            webhook = Webhook.objects.create(project=project, url=f'http://rebind.example.com:{port}/hook')
+            assert deliver_webhook_events(project.id, [event('task.updated', 1, {'title': 'A'})]) == 0
+
+        assert endpoint.requests == 0
+        letter = WebhookDeadLetter.objects.get(webhook=webhook)
+        assert letter.status_code is None
+        assert 'non-public' in letter.error
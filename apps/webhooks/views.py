@@ -0,0 +1,68 @@
+"""Views for Webhook API."""
+from django.db.models import Q
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from apps.projects.models import Project, ProjectMember
+from apps.projects.permissions import IsProjectAdmin
+from apps.utils.pagination import HybridPagination
+from .models import Webhook
+from .serializers import WebhookSerializer, WebhookDeadLetterSerializer
+from .tasks import retry_webhook_delivery
+
+
+class WebhookViewSet(viewsets.ModelViewSet):
+    """ViewSet for the webhooks of projects the user administers."""
+    serializer_class = WebhookSerializer
+    permission_classes = [IsProjectAdmin]
+    pagination_class = HybridPagination
+
+    def get_queryset(self):
+        queryset = Webhook.objects.select_related('project')
+
+        user = self.request.user
+        if not user.is_admin:
+            managed = Project.objects.filter(
+                Q(owner=user) | Q(members__user=user, members__role=ProjectMember.Role.ADMIN)
+            ).values('id')
+            queryset = queryset.filter(project_id__in=managed)
+
+        project_id = self.request.query_params.get('project')
+        if project_id:
+            queryset = queryset.filter(project_id=project_id)
+
+        return queryset
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+    @action(detail=True, methods=['get'], url_path='dead-letters')
+    def dead_letters(self, request, pk=None):
+        """List events the webhook did not accept after all attempts."""
+        webhook = self.get_object()
+        page = self.paginate_queryset(webhook.dead_letters.all())
+        serializer = WebhookDeadLetterSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['post'])
+    def redeliver(self, request, pk=None):
+        """Queue dead letters, all or those listed in ``ids``, for a fresh round of attempts."""
+        webhook = self.get_object()
+        letters = webhook.dead_letters.all()
+        ids = request.data.get('ids')
+        if ids is not None:
+            if not isinstance(ids, list) or not all(str(i).isdigit() for i in ids):
+                return Response(
+                    {'detail': 'ids must be a list of dead letter ids'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            letters = letters.filter(id__in=ids)
+
+        redelivered = 0
+        for letter in letters:
+            retry_webhook_delivery.delay(webhook.id, letter.events, 1)
+            letter.delete()
+            redelivered += 1
+
+        return Response({'redelivered': redelivered})
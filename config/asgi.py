@@ -0,0 +1,16 @@
+"""
+ASGI config for Task Management API.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+This is the default deployment: async views (cached reads, board snapshots,
+the change feed) run on the event loop and the sync DRF views each get a
+thread. Run with DB_CONN_MAX_AGE=0.
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+application = get_asgi_application()
@@ -2,6 +2,7 @@
 import os
 from celery import Celery
 from celery.schedules import crontab
+from kombu import Queue
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
@@ -9,18 +10,110 @@ app = Celery('config')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
-# Scheduled tasks
+# Queues by latency class, each consumed by its own workers so a lane of
+# long jobs cannot hold the processes another lane is waiting for:
+# interactive - short, user-visible work (notifications, webhook dispatch, SLA ticks)
+# webhooks    - first delivery attempts to third-party endpoints, whose
+#               response times this project does not control
+# bulk        - long fan-out batches, exports and retries to slow endpoints
+# scheduled   - periodic housekeeping started by Celery Beat
+INTERACTIVE = 'interactive'
+WEBHOOKS = 'webhooks'
+BULK = 'bulk'
+SCHEDULED = 'scheduled'
+
+app.conf.task_queues = [Queue(name) for name in (INTERACTIVE, WEBHOOKS, BULK, SCHEDULED)]
+# Unrouted tasks must not land on a lane that promises low latency
+app.conf.task_default_queue = BULK
+
+app.conf.task_routes = {
+    'apps.notifications.tasks.dispatch_notifications': {'queue': INTERACTIVE},
+    'apps.webhooks.tasks.dispatch_webhook_events': {'queue': INTERACTIVE},
+    'apps.webhooks.tasks.deliver_webhook_events': {'queue': WEBHOOKS},
+    'apps.tasks.tasks.process_sla_schedule': {'queue': INTERACTIVE},
+    'apps.webhooks.tasks.retry_webhook_delivery': {'queue': BULK},
+    'apps.tasks.tasks.send_daily_task_summary_batch': {'queue': BULK},
+    'apps.tasks.tasks.export_to_file': {'queue': BULK},
+    'apps.audit.tasks.write_audit_entries': {'queue': BULK},
+    'apps.tasks.tasks.send_daily_task_summary': {'queue': SCHEDULED},
+    'apps.tasks.tasks.check_sla_breaches': {'queue': SCHEDULED},
+    'apps.tasks.tasks.rebuild_sla_schedule': {'queue': SCHEDULED},
+    'apps.notifications.tasks.purge_notifications': {'queue': SCHEDULED},
+    'apps.tasks.tasks.purge_exports': {'queue': SCHEDULED},
+    'apps.audit.tasks.maintain_audit_partitions': {'queue': SCHEDULED},
+    'apps.analytics.tasks.snapshot_daily_status_counts': {'queue': SCHEDULED},
+}
+
+# Per-task rate limits (per worker) and time limits in seconds, overriding
+# CELERY_TASK_SOFT_TIME_LIMIT/CELERY_TASK_TIME_LIMIT
+app.conf.task_annotations = {
+    'apps.notifications.tasks.dispatch_notifications': {'soft_time_limit': 50, 'time_limit': 60},
+    'apps.webhooks.tasks.dispatch_webhook_events': {'soft_time_limit': 10, 'time_limit': 15},
+    'apps.webhooks.tasks.deliver_webhook_events': {'soft_time_limit': 60, 'time_limit': 75},
+    'apps.tasks.tasks.process_sla_schedule': {'soft_time_limit': 50, 'time_limit': 60},
+    # Each batch mails up to SUMMARY_BATCH_SIZE users; spreads the 9 AM burst for the SMTP relay
+    'apps.tasks.tasks.send_daily_task_summary_batch': {'rate_limit': '20/m'},
+    'apps.webhooks.tasks.retry_webhook_delivery': {'rate_limit': '120/m'},
+    'apps.tasks.tasks.export_to_file': {'rate_limit': '10/m', 'soft_time_limit': 1800, 'time_limit': 1860},
+}
+
+# Worker settings per queue, mirrored by the celery-* services in
+# docker-compose.yml. Short interactive tasks prefetch a few messages to save
+# broker round trips; bulk and scheduled workers reserve one at a time so a
+# long task never holds messages an idle process could run.
+WORKER_PROFILES = {
+    INTERACTIVE: {'concurrency': 4, 'prefetch_multiplier': 4},
+    # Mostly waiting on remote endpoints; one message each so a slow
+    # endpoint never holds deliveries another process could send
+    WEBHOOKS: {'concurrency': 4, 'prefetch_multiplier': 1},
+    BULK: {'concurrency': 2, 'prefetch_multiplier': 1},
+    SCHEDULED: {'concurrency': 1, 'prefetch_multiplier': 1},
+}
+
+# Scheduled tasks. Frequent ticks expire before the next one is due, so a
+# backed-up queue runs the latest tick instead of a pile of stale ones.
 app.conf.beat_schedule = {
+    'process-sla-schedule-every-minute': {
+        'task': 'apps.tasks.tasks.process_sla_schedule',
+        'schedule': crontab(),  # Every minute
+        'options': {'expires': 55},
+    },
     'check-sla-breaches-every-hour': {
         'task': 'apps.tasks.tasks.check_sla_breaches',
-        'schedule': crontab(minute=0),  # Every hour
+        'schedule': crontab(minute=0),  # Every hour, reconciles missed breaches
     },
     'send-daily-summary': {
         'task': 'apps.tasks.tasks.send_daily_task_summary',
         'schedule': crontab(hour=9, minute=0),  # 9 AM daily
     },
+    'dispatch-webhook-events': {
+        'task': 'apps.webhooks.tasks.dispatch_webhook_events',
+        'schedule': 1.0,  # Every second, delivers projects whose coalescing window passed
+        'options': {'expires': 5},
+    },
+    'dispatch-notifications-every-minute': {
+        'task': 'apps.notifications.tasks.dispatch_notifications',
+        'schedule': crontab(),  # Every minute, one digest per recipient
+        'options': {'expires': 55},
+    },
+    'purge-notifications': {
+        'task': 'apps.notifications.tasks.purge_notifications',
+        'schedule': crontab(hour=3, minute=0),  # 3 AM daily
+    },
+    'purge-exports': {
+        'task': 'apps.tasks.tasks.purge_exports',
+        'schedule': crontab(minute=45),  # Hourly
+    },
+    'snapshot-daily-status-counts': {
+        'task': 'apps.analytics.tasks.snapshot_daily_status_counts',
+        'schedule': crontab(hour=0, minute=15),  # Daily, after the UTC day closes
+    },
+    'maintain-audit-partitions': {
+        'task': 'apps.audit.tasks.maintain_audit_partitions',
+        'schedule': crontab(hour=2, minute=30),  # 2:30 AM daily
+    },
 }
 
 @app.task(bind=True)
 def debug_task(self):
-    print(f'Request: {self.request!r}')
\ No newline at end of file
+    print(f'Request: {self.request!r}')
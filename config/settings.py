@@ -35,9 +35,15 @@ INSTALLED_APPS = [
     'apps.projects',
     'apps.tasks',
     'apps.audit',
+    'apps.analytics',
+    'apps.feed',
+    'apps.webhooks',
+    'apps.notifications',
+    'apps.metrics',
 ]
 
 MIDDLEWARE = [
+    'apps.metrics.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -83,7 +89,10 @@ DATABASES = {
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
             'connect_timeout': 10,
         },
-        'CONN_MAX_AGE': 600,  # Connection pooling - keeps connections alive for 10 min
+        # Keeps connections alive between requests. Must be 0 under ASGI,
+        # where each request runs its queries on a thread of its own and a
+        # persistent connection would outlive it.
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
     }
 }
 # Password validation
@@ -119,6 +128,15 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'apps.utils.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'apps.utils.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': (
@@ -174,6 +192,108 @@ CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True  # ADD THIS
 CELERY_BROKER_CONNECTION_RETRY = True  # ADD THIS
 CELERY_BROKER_CONNECTION_MAX_RETRIES = 10  # ADD THIS
+# Queues, routes and per-task limits live in config/celery.py. Messages are
+# acknowledged after the task ran, so a task cut off by a worker crash runs
+# again; tasks must tolerate that. Workers reserve CELERY_WORKER_PREFETCH_MULTIPLIER
+# messages per process unless their queue profile overrides it.
+CELERY_TASK_ACKS_LATE = config('CELERY_TASK_ACKS_LATE', default=True, cast=bool)
+CELERY_WORKER_PREFETCH_MULTIPLIER = config('CELERY_WORKER_PREFETCH_MULTIPLIER', default=1, cast=int)
+CELERY_TASK_SOFT_TIME_LIMIT = config('CELERY_TASK_SOFT_TIME_LIMIT', default=300, cast=int)
+CELERY_TASK_TIME_LIMIT = config('CELERY_TASK_TIME_LIMIT', default=360, cast=int)
+# Unacknowledged Redis messages are redelivered after this many seconds; it
+# must exceed the longest task time limit and retry countdown
+# (WEBHOOK_RETRY_MAX_SECONDS), or those messages run twice.
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'visibility_timeout': config('CELERY_VISIBILITY_TIMEOUT', default=7200, cast=int),
+}
+
+# Audit Logging
+# Batches of at least AUDIT_LOG_ASYNC_THRESHOLD entries are written by a
+# Celery worker instead of inline when AUDIT_LOG_ASYNC is enabled.
+AUDIT_LOG_ASYNC = config('AUDIT_LOG_ASYNC', default=False, cast=bool)
+AUDIT_LOG_ASYNC_THRESHOLD = config('AUDIT_LOG_ASYNC_THRESHOLD', default=50, cast=int)
+# Months kept in audit_logs before being archived to AUDIT_LOG_ARCHIVE_DIR
+AUDIT_LOG_RETENTION_MONTHS = config('AUDIT_LOG_RETENTION_MONTHS', default=12, cast=int)
+AUDIT_LOG_ARCHIVE_DIR = config('AUDIT_LOG_ARCHIVE_DIR', default=str(BASE_DIR / 'archive' / 'audit_logs'))
+# Async batches still failing after AUDIT_LOG_WRITE_MAX_RETRIES retries are
+# saved as JSONL files in AUDIT_LOG_DEAD_LETTER_DIR for replay_audit_dead_letters
+AUDIT_LOG_WRITE_MAX_RETRIES = config('AUDIT_LOG_WRITE_MAX_RETRIES', default=8, cast=int)
+AUDIT_LOG_DEAD_LETTER_DIR = config(
+    'AUDIT_LOG_DEAD_LETTER_DIR', default=str(BASE_DIR / 'archive' / 'audit_dead_letters')
+)
+
+# Metrics
+# Per-worker snapshots are shared through METRICS_DIR; leave it empty to
+# report only the serving process.
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_DIR = config('METRICS_DIR', default='')
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+METRICS_SLOW_REQUEST_MS = config('METRICS_SLOW_REQUEST_MS', default=500, cast=int)
+
+# Response cache for GET list/detail endpoints (see apps.utils.response_cache)
+RESPONSE_CACHE_ENABLED = config('RESPONSE_CACHE_ENABLED', default=True, cast=bool)
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=60, cast=int)
+
+# Serialize Task/Comment/AuditLog lists through compiled plans (see apps.utils.fast_serializers)
+FAST_LIST_SERIALIZATION = config('FAST_LIST_SERIALIZATION', default=True, cast=bool)
+
+# CSV/JSONL exports (see apps.utils.export); larger exports are written to
+# EXPORT_DIR by a Celery job instead of streaming and purged after
+# EXPORT_RETENTION_HOURS
+EXPORT_DIR = config('EXPORT_DIR', default=str(BASE_DIR / 'exports'))
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+EXPORT_ASYNC_THRESHOLD = config('EXPORT_ASYNC_THRESHOLD', default=100000, cast=int)
+EXPORT_RETENTION_HOURS = config('EXPORT_RETENTION_HOURS', default=24, cast=int)
+
+# Longest date range, in days, of a project analytics query
+ANALYTICS_MAX_DAYS = config('ANALYTICS_MAX_DAYS', default=366, cast=int)
+
+# Change feed (see apps.feed): events are kept in a per-project stream of
+# about FEED_STREAM_MAXLEN entries for Last-Event-ID replay, expiring
+# FEED_STREAM_TTL seconds after the last change
+FEED_ENABLED = config('FEED_ENABLED', default=True, cast=bool)
+FEED_REDIS_URL = config('FEED_REDIS_URL', default=config('REDIS_URL'))
+FEED_STREAM_MAXLEN = config('FEED_STREAM_MAXLEN', default=1000, cast=int)
+FEED_STREAM_TTL = config('FEED_STREAM_TTL', default=60 * 60 * 24, cast=int)
+FEED_HEARTBEAT_SECONDS = config('FEED_HEARTBEAT_SECONDS', default=15, cast=int)
+FEED_MAX_CONNECTION_SECONDS = config('FEED_MAX_CONNECTION_SECONDS', default=300, cast=int)
+FEED_RETRY_MS = config('FEED_RETRY_MS', default=3000, cast=int)
+# Events buffered per client before a slow one is disconnected
+FEED_SUBSCRIBER_BUFFER = config('FEED_SUBSCRIBER_BUFFER', default=500, cast=int)
+
+# Webhooks (see apps.webhooks): a project's events are coalesced for
+# WEBHOOK_COALESCE_SECONDS after the first one, then delivered in batches of
+# WEBHOOK_BATCH_SIZE events. Failed batches are retried with exponential
+# backoff (WEBHOOK_RETRY_BASE_SECONDS doubling up to WEBHOOK_RETRY_MAX_SECONDS)
+# and dead-lettered after WEBHOOK_MAX_ATTEMPTS attempts.
+WEBHOOKS_ENABLED = config('WEBHOOKS_ENABLED', default=True, cast=bool)
+WEBHOOK_COALESCE_SECONDS = config('WEBHOOK_COALESCE_SECONDS', default=2, cast=float)
+WEBHOOK_BATCH_SIZE = config('WEBHOOK_BATCH_SIZE', default=100, cast=int)
+# Events handed to one delivery task; the rest wait for the next dispatch
+WEBHOOK_MAX_EVENTS_PER_DISPATCH = config('WEBHOOK_MAX_EVENTS_PER_DISPATCH', default=5000, cast=int)
+WEBHOOK_TIMEOUT_SECONDS = config('WEBHOOK_TIMEOUT_SECONDS', default=5, cast=float)
+WEBHOOK_MAX_ATTEMPTS = config('WEBHOOK_MAX_ATTEMPTS', default=8, cast=int)
+WEBHOOK_RETRY_BASE_SECONDS = config('WEBHOOK_RETRY_BASE_SECONDS', default=10, cast=int)
+WEBHOOK_RETRY_MAX_SECONDS = config('WEBHOOK_RETRY_MAX_SECONDS', default=3600, cast=int)
+# Keep-alive connections per endpoint host in each worker process
+WEBHOOK_POOL_SIZE = config('WEBHOOK_POOL_SIZE', default=10, cast=int)
+# Webhook URLs must use https and resolve to public addresses only; both
+# are relaxed for local development and tests against a local endpoint
+WEBHOOK_REQUIRE_HTTPS = config('WEBHOOK_REQUIRE_HTTPS', default=not DEBUG, cast=bool)
+WEBHOOK_ALLOW_PRIVATE_ADDRESSES = config('WEBHOOK_ALLOW_PRIVATE_ADDRESSES', default=False, cast=bool)
+
+# Notifications (see apps.notifications): assignment emails are written to an
+# outbox with the assignment and sent every minute as one digest per
+# recipient. A digest whose send failed is retried under the same idempotency
+# key once its claim is NOTIFICATION_CLAIM_TIMEOUT seconds old, and given up
+# after NOTIFICATION_MAX_ATTEMPTS attempts.
+# Recipients whose digests share one claim and one mail connection
+NOTIFICATION_BATCH_SIZE = config('NOTIFICATION_BATCH_SIZE', default=200, cast=int)
+NOTIFICATION_CLAIM_TIMEOUT = config('NOTIFICATION_CLAIM_TIMEOUT', default=300, cast=int)
+NOTIFICATION_MAX_ATTEMPTS = config('NOTIFICATION_MAX_ATTEMPTS', default=5, cast=int)
+# Tasks listed in a digest; the rest are summarised as a count
+NOTIFICATION_DIGEST_LIMIT = config('NOTIFICATION_DIGEST_LIMIT', default=20, cast=int)
+NOTIFICATION_RETENTION_DAYS = config('NOTIFICATION_RETENTION_DAYS', default=7, cast=int)
 
 # Email Configuration
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
@@ -6,9 +6,9 @@ from django.conf.urls.static import static
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
-from rest_framework.response import Response
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from apps.metrics.views import metrics_view
 
 # API Documentation Schema
 schema_view = get_schema_view(
@@ -24,12 +24,14 @@ schema_view = get_schema_view(
 )
 
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def health_check(request):
-    """Health check endpoint for monitoring."""
+def check_database():
     from django.db import connection
-    from django.core.cache import cache
+    connection.ensure_connection()
+
+
+async def health_check(request):
+    """Health check endpoint for monitoring."""
+    from apps.utils import async_cache
 
     health_status = {
         'status': 'healthy',
@@ -39,32 +41,35 @@ def health_check(request):
 
     # Check database
     try:
-        connection.ensure_connection()
+        await sync_to_async(check_database)()
     except Exception:
         health_status['database'] = 'disconnected'
         health_status['status'] = 'unhealthy'
 
     # Check cache
     try:
-        cache.set('health_check', 'ok', 10)
-        cache.get('health_check')
+        await async_cache.aset('health_check', 'ok', 10)
+        await async_cache.aget('health_check')
     except Exception:
         health_status['cache'] = 'disconnected'
         health_status['status'] = 'unhealthy'
 
     status_code = 200 if health_status['status'] == 'healthy' else 503
-    return Response(health_status, status=status_code)
+    return JsonResponse(health_status, status=status_code)
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/health/', health_check, name='health-check'),
+    path('api/metrics/', metrics_view, name='metrics'),
 
     # API v1 endpoints
     path('api/v1/auth/', include('apps.users.urls')),
     path('api/v1/projects/', include('apps.projects.urls')),
     path('api/v1/tasks/', include('apps.tasks.urls')),
     path('api/v1/audit/', include('apps.audit.urls')),
+    path('api/v1/webhooks/', include('apps.webhooks.urls')),
+    path('api/v1/', include('apps.feed.urls')),
 
     # API Documentation
     path('api/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
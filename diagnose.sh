@@ -130,12 +130,14 @@ else
     print_error "API container is not running"
 fi
 
-# Check Celery
-if docker-compose ps celery | grep -q "Up"; then
-    print_success "Celery worker is Up"
-else
-    print_error "Celery worker is not running"
-fi
+# Check Celery workers, one per queue
+for worker in celery-interactive celery-webhooks celery-bulk celery-scheduled; do
+    if docker-compose ps $worker | grep -q "Up"; then
+        print_success "Celery worker $worker is Up"
+    else
+        print_error "Celery worker $worker is not running"
+    fi
+done
 
 # 4. Check Network Connectivity
 print_header "4. Checking Network Connectivity"